@@ -0,0 +1,188 @@
+"""Headless batch generation of laudos from CSV/JSONL records.
+
+Usage (from ``src``)::
+
+    python -m app.batch TEMPLATE.docx registros.csv -o saida/ [-j 4]
+
+Each input record becomes one ``LaudoDataModel`` and one DOCX file. Records are
+read one at a time, so arbitrarily large inputs can be processed. This module
+must not import PySide6.
+
+A JSONL record may use the same shape as ``LaudoDataModel.get_all_data()``::
+
+    {"patient": {...}, "resp1": {...}, "resp2": {...}, "tests": {...},
+     "template_fields": {...}, "psychologist": {...}, "conclusion": "..."}
+
+Flat records (every CSV row, or JSONL objects without those keys) are routed by
+field name: ``patient_*``, ``resp1_*`` and ``resp2_*`` go to the matching slot,
+``nome_psicologo``/``crp_psicologo`` to the psychologist, ``conclusao_text`` to
+the conclusion, names listed in ``template_fields.json`` to the template fields
+and everything else to the test results. The optional ``output_name`` field
+overrides the output file name.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.models import LaudoDataModel
+from app.services import get_compiled_template, get_registry, iter_render, report_basename
+
+NESTED_KEYS = ("patient", "resp1", "resp2", "tests", "template_fields", "psychologist", "conclusion")
+PSYCHOLOGIST_KEYS = ("nome_psicologo", "crp_psicologo")
+OUTPUT_NAME_KEY = "output_name"
+
+
+def iter_records(path: str, input_format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream records from a CSV or JSONL file.
+
+    Args:
+        path: Input file path
+        input_format: ``"csv"`` or ``"jsonl"``. If None, inferred from the extension.
+    """
+    input_format = input_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, "r", encoding="utf-8-sig", newline="") as fp:
+        if input_format == "csv":
+            yield from csv.DictReader(fp)
+            return
+
+        for line_number, line in enumerate(fp, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{line_number}: JSON inválido ({exc.msg})") from exc
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}:{line_number}: cada linha deve ser um objeto JSON")
+            yield record
+
+
+def split_record(record: Dict[str, Any], template_field_names: Set[str]) -> Dict[str, Any]:
+    """Convert a flat or nested record into the ``get_all_data()`` shape."""
+    if any(isinstance(record.get(key), dict) for key in NESTED_KEYS):
+        return {key: record.get(key) or ({} if key != "conclusion" else "") for key in NESTED_KEYS}
+
+    slots: Dict[str, Any] = {key: {} for key in NESTED_KEYS}
+    slots["conclusion"] = ""
+    for key, value in record.items():
+        if key is None or key == OUTPUT_NAME_KEY:
+            continue
+        if key.startswith("patient_"):
+            slots["patient"][key] = value
+        elif key.startswith("resp1_"):
+            slots["resp1"][key] = value
+        elif key.startswith("resp2_"):
+            slots["resp2"][key] = value
+        elif key in PSYCHOLOGIST_KEYS:
+            slots["psychologist"][key] = value
+        elif key == "conclusao_text":
+            slots["conclusion"] = value or ""
+        elif key in template_field_names:
+            slots["template_fields"][key] = value
+        elif value is not None and value != "":
+            # empty CSV cells mean "test not administered"
+            slots["tests"][key] = value
+    return slots
+
+
+def build_data_model(record: Dict[str, Any], template_path: str, template_field_names: Set[str]) -> LaudoDataModel:
+    """Build a ``LaudoDataModel`` for one record (test results are classified here)."""
+    slots = split_record(record, template_field_names)
+
+    model = LaudoDataModel()
+    model.template_path = template_path
+    model.set_patient_data(slots["patient"])
+    model.set_resp1_data(slots["resp1"])
+    model.set_resp2_data(slots["resp2"])
+    model.set_test_results(slots["tests"])
+    model.set_template_field_values(slots["template_fields"])
+    model.set_psychologist_data(slots["psychologist"])
+    model.set_conclusion_text(slots["conclusion"])
+    return model
+
+
+def output_basename(model: LaudoDataModel, record: Dict[str, Any]) -> str:
+    """File name (without extension): ``output_name`` if given, else the one used by ``gerar_laudo``.
+
+    An ``output_name`` with no usable character (e.g. ``"@@@"``) is ignored.
+    """
+    explicit = str(record.get(OUTPUT_NAME_KEY) or "").strip()
+    if explicit:
+        basename = report_basename(explicit, prefix="")
+        if basename:
+            return basename
+    return report_basename(model.patient_data.get("patient_name", ""))
+
+
+def generate_reports(template_path: str, records_path: str, output_dir: str,
+                     input_format: Optional[str] = None,
+                     workers: Optional[int] = 1) -> Tuple[List[str], List[Tuple[int, str]]]:
+    """Generate one DOCX per record.
+
+    Data models are built and classified here, one record at a time; filling and
+    saving the DOCX files is delegated to ``iter_render`` (a process pool when
+    ``workers`` is not 1).
+
+    Returns:
+        Tuple of (written_paths, errors) where errors is a list of (record_number, message)
+    """
+    template_field_names = set(get_registry().template_fields_loader().get_all_fields())
+    # every record is rendered against the same template: format only its placeholders
+    placeholders = get_compiled_template(template_path).fields
+    errors: List[Tuple[int, str]] = []
+    record_numbers: List[int] = []
+
+    def jobs() -> Iterator[Tuple[str, Dict[str, str]]]:
+        for number, record in enumerate(iter_records(records_path, input_format), start=1):
+            try:
+                model = build_data_model(record, template_path, template_field_names)
+                job = (output_basename(model, record), model.get_field_mapping(fields=placeholders))
+            except Exception as exc:
+                errors.append((number, str(exc)))
+                continue
+            record_numbers.append(number)
+            yield job
+
+    written: List[str] = []
+    for result in iter_render(template_path, jobs(), output_dir, workers=workers):
+        if result.ok:
+            written.append(result.output_path)
+        else:
+            errors.append((record_numbers[result.index], result.error))
+
+    errors.sort()
+    return written, errors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.batch",
+        description="Gera um laudo DOCX para cada registro de um arquivo CSV ou JSONL.",
+    )
+    parser.add_argument("template", help="Template DOCX parametrizado")
+    parser.add_argument("records", help="Arquivo CSV ou JSONL com um paciente por registro")
+    parser.add_argument("-o", "--output-dir", default=".", help="Diretório de saída (padrão: diretório atual)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Formato da entrada (padrão: pela extensão)")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Processos em paralelo para gerar os DOCX (0 = um por núcleo; padrão: 1)")
+    args = parser.parse_args(argv)
+
+    try:
+        written, errors = generate_reports(args.template, args.records, args.output_dir, args.format,
+                                           workers=args.workers or None)
+    except (OSError, ValueError) as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return 2
+
+    for number, message in errors:
+        print(f"Registro {number}: erro ao gerar laudo: {message}", file=sys.stderr)
+    print(f"{len(written)} laudo(s) gerado(s) em {os.path.abspath(args.output_dir)}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,130 @@
-from docx import Document
-from typing import Dict, Optional, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Tuple
 
-from app.services.test_result_classifier import TestResultClassifier
+from app.services.data_registry import FrozenDict, get_registry
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+
+# Field name translation map: data_model_key -> [template_field_names]
+FIELD_TRANSLATIONS: Dict[str, Tuple[str, ...]] = {
+    # Patient fields
+    "patient_name": ("nome_paciente", "primeiro_nome_paciente"),
+    "patient_birth": ("data_nasc_paciente",),
+    "patient_crono_age": ("idd_paciente",),
+    "patient_school": ("escola_paciente",),
+    "patient_class": ("turma_paciente",),
+
+    # Respondent 1 fields
+    "resp1_name": ("resp1_nome",),
+    "resp1_career": ("resp1_profissao",),
+    "resp1_education": ("resp1_escolaridade",),
+    "resp1_age": ("resp1_idade",),
+
+    # Respondent 2 fields
+    "resp2_name": ("resp2_nome",),
+    "resp2_career": ("resp2_profissao",),
+    "resp2_education": ("resp2_escolaridade",),
+    "resp2_age": ("resp2_idade",),
+
+    # Psychologist fields
+    "nome_psicologo": ("psico_nome",),
+    "crp_psicologo": ("psico_crp",),
+}
+
+# Test result fields with optional aliases for template compatibility
+TEST_FIELD_TRANSLATIONS: Dict[str, Tuple[str, ...]] = {
+    "AG_BPA": ("AG_pontuacao",),
+}
+
+# Mapping slices in merge order (later slices win) and the attribute each is built from
+_SLOT_ATTRIBUTES = (
+    ("patient", "patient_data"),
+    ("resp1", "resp1_data"),
+    ("resp2", "resp2_data"),
+    ("tests", "test_results"),
+    ("conclusion", "conclusion_text"),
+    ("template_fields", "template_fields_data"),
+    ("psychologist", "psychologist_data"),
+)
+
+
+def _as_text(value: Any) -> str:
+    return str(value) if value is not None else ""
+
+
+def _translated_slice(values: Dict[str, Any]) -> Dict[str, str]:
+    """Standard names plus their template-specific names."""
+    mapping = {}
+    for key, value in values.items():
+        text = _as_text(value)
+        mapping[key] = text
+        for template_name in FIELD_TRANSLATIONS.get(key, ()):
+            mapping[template_name] = text
+    return mapping
+
+
+def _patient_slice(values: Dict[str, Any]) -> Dict[str, str]:
+    mapping = _translated_slice(values)
+    # Ensure primeiro nome (first name) placeholder maps to the first token of full name
+    # Templates use the alias `primeiro_nome_paciente` which should contain only the first name
+    if "patient_name" in mapping:
+        try:
+            first = mapping["patient_name"].strip().split()[0]
+        except Exception:
+            first = ""
+        mapping.setdefault("primeiro_nome_paciente", first)
+    return mapping
+
+
+def _tests_slice(values: Dict[str, Any]) -> Dict[str, str]:
+    mapping = {}
+    for key, value in values.items():
+        text = _as_text(value)
+        mapping[key] = text
+        for alias in TEST_FIELD_TRANSLATIONS.get(key, ()):
+            mapping.setdefault(alias, text)
+    return mapping
+
+
+_SLICE_BUILDERS: Dict[str, Callable[[Any], Dict[str, str]]] = {
+    "patient": _patient_slice,
+    "resp1": _translated_slice,
+    "resp2": _translated_slice,
+    "tests": _tests_slice,
+    "conclusion": lambda text: {"conclusao_text": text},
+    "template_fields": lambda values: {key: _as_text(value) for key, value in values.items()},
+    "psychologist": _translated_slice,
+}
+
+
+def _translation_slot(key: str) -> str:
+    """Slice that holds a standard key of ``FIELD_TRANSLATIONS``."""
+    for slot in ("patient", "resp1", "resp2"):
+        if key.startswith(slot + "_"):
+            return slot
+    return "psychologist"
+
+
+def _build_alias_index() -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Reverse index: template alias -> ((slot, source key), ...).
+
+    E.g. ``resp1_profissao`` -> ``(("resp1", "resp1_career"),)``.
+    """
+    index: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+    for key, aliases in FIELD_TRANSLATIONS.items():
+        for alias in aliases:
+            index[alias] = index.get(alias, ()) + ((_translation_slot(key), key),)
+    for key, aliases in TEST_FIELD_TRANSLATIONS.items():
+        for alias in aliases:
+            index[alias] = index.get(alias, ()) + (("tests", key),)
+    return index
+
+
+_ALIAS_INDEX = _build_alias_index()
+
+# Slices from highest to lowest precedence, for resolving single fields
+_LOOKUP_ORDER = tuple(reversed(_SLOT_ATTRIBUTES))
 
 
 class LaudoDataModel:
@@ -10,7 +133,7 @@ class LaudoDataModel:
     def __init__(self):
         # Template data
         self.template_path: Optional[str] = None
-        self.template_document: Optional[Document] = None
+        self.template_document: Optional["Document"] = None
         
         # Patient data
         self.patient_data: Dict[str, Any] = {
@@ -38,7 +161,10 @@ class LaudoDataModel:
         
         # Test results
         self.test_results: Dict[str, Any] = {}
-        self._test_classifier = TestResultClassifier()
+        # shared by every data model and resolved on first use (see ``_test_classifier``)
+        self._classifier = None
+        # re-classifies only the tests whose scores changed since the last edit
+        self._classification_session = None
         
         # Conclusion text
         self.conclusion_text: str = ""
@@ -51,8 +177,18 @@ class LaudoDataModel:
             "nome_psicologo": "",
             "crp_psicologo": ""
         }
+        
+        # Change counter per mapping slice, bumped by the set_* methods
+        self._versions: Dict[str, int] = {slot: 0 for slot, _ in _SLOT_ATTRIBUTES}
+        # slot -> (version, source object, built slice)
+        self._slices: Dict[str, Tuple[int, Any, Dict[str, str]]] = {}
+        self._mapping: Optional[Dict[str, str]] = None
     
-    def set_template(self, path: str, document: Document):
+    def _touch(self, slot: str):
+        """Mark the ``slot`` slice of the field mapping as changed."""
+        self._versions[slot] += 1
+    
+    def set_template(self, path: str, document: "Document"):
         """Set the template path and document."""
         self.template_path = path
         self.template_document = document
@@ -61,6 +197,7 @@ class LaudoDataModel:
         """Update patient data."""
         # Update provided fields first
         self.patient_data.update(data)
+        self._touch("patient")
 
         # Compute derived fields when possible
         # 1) First name (primeiro nome)
@@ -94,30 +231,52 @@ class LaudoDataModel:
     def set_resp1_data(self, data: Dict[str, Any]):
         """Update first respondent data."""
         self.resp1_data.update(data)
+        self._touch("resp1")
     
     def set_resp2_data(self, data: Dict[str, Any]):
         """Update second respondent data."""
         self.resp2_data.update(data)
+        self._touch("resp2")
     
+    @property
+    def _test_classifier(self):
+        """The process-wide classifier; the norm tables are loaded the first time it is needed."""
+        if self._classifier is None:
+            self._classifier = get_registry().classifier()
+        return self._classifier
+
+    @_test_classifier.setter
+    def _test_classifier(self, classifier):
+        self._classifier = classifier
+
     def set_test_results(self, results: Dict[str, Any]):
         """Update test results."""
         if not isinstance(results, dict):
             return
 
         try:
-            classified = self._test_classifier.classify_results(results)
+            session = self._classification_session
+            if session is None or session.classifier is not self._test_classifier:
+                session = self._classification_session = self._test_classifier.session()
+            # age selects the band of the age-normed tables
+            classified = session.classify_results(
+                results, age=self.patient_data.get("patient_crono_age")
+            )
         except Exception:
             classified = results
 
         self.test_results.update(classified)
+        self._touch("tests")
     
     def set_conclusion_text(self, text: str):
         """Set conclusion text."""
         self.conclusion_text = text
+        self._touch("conclusion")
     
     def set_template_field_values(self, values: Dict[str, Any]):
         """Update custom template field values."""
         self.template_fields_data.update(values)
+        self._touch("template_fields")
     
     def get_template_field_values(self) -> Dict[str, Any]:
         """Return stored template field values."""
@@ -126,6 +285,7 @@ class LaudoDataModel:
     def set_psychologist_data(self, data: Dict[str, Any]):
         """Update psychologist data."""
         self.psychologist_data.update(data)
+        self._touch("psychologist")
     
     def get_all_data(self) -> Dict[str, Any]:
         """Get all collected data as a dictionary."""
@@ -140,105 +300,73 @@ class LaudoDataModel:
             "template_fields": self.template_fields_data
         }
     
-    def get_field_mapping(self) -> Dict[str, str]:
+    def get_field_mapping(self, fields: Optional[Iterable[str]] = None) -> Dict[str, str]:
         """Get a flat dictionary mapping field names to values for template replacement.
         
         Returns a dictionary where keys are template field names (e.g., {nome_paciente})
         and values are the actual data to replace them with.
         Maps both standard field names and template-specific field names.
-        """
-        mapping = {}
-        
-        # Field name translation map: data_model_key -> [template_field_names]
-        field_translations = {
-            # Patient fields
-            "patient_name": ["nome_paciente", "primeiro_nome_paciente"],
-            "patient_birth": ["data_nasc_paciente"],
-            "patient_crono_age": ["idd_paciente"],
-            "patient_school": ["escola_paciente"],
-            "patient_class": ["turma_paciente"],
-            
-            # Respondent 1 fields
-            "resp1_name": ["resp1_nome"],
-            "resp1_career": ["resp1_profissao"],
-            "resp1_education": ["resp1_escolaridade"],
-            "resp1_age": ["resp1_idade"],
-            
-            # Respondent 2 fields
-            "resp2_name": ["resp2_nome"],
-            "resp2_career": ["resp2_profissao"],
-            "resp2_education": ["resp2_escolaridade"],
-            "resp2_age": ["resp2_idade"],
-            
-            # Psychologist fields
-            "nome_psicologo": ["psico_nome"],
-            "crp_psicologo": ["psico_crp"],
-        }
-        
-        # Add patient fields with both standard and template names
-        for key, value in self.patient_data.items():
-            # Add standard name
-            mapping[key] = str(value) if value is not None else ""
-            # Add template-specific names
-            if key in field_translations:
-                for template_name in field_translations[key]:
-                    mapping[template_name] = str(value) if value is not None else ""
-
-        # Ensure primeiro nome (first name) placeholder maps to the first token of full name
-        # Templates use the alias `primeiro_nome_paciente` which should contain only the first name
-        if "patient_name" in mapping:
-            try:
-                first = mapping["patient_name"].strip().split()[0]
-            except Exception:
-                first = ""
-            mapping.setdefault("primeiro_nome_paciente", first)
-        
-        # Add respondent 1 fields with both standard and template names
-        for key, value in self.resp1_data.items():
-            # Add standard name
-            mapping[key] = str(value) if value is not None else ""
-            # Add template-specific names
-            if key in field_translations:
-                for template_name in field_translations[key]:
-                    mapping[template_name] = str(value) if value is not None else ""
         
-        # Add respondent 2 fields with both standard and template names
-        for key, value in self.resp2_data.items():
-            # Add standard name
-            mapping[key] = str(value) if value is not None else ""
-            # Add template-specific names
-            if key in field_translations:
-                for template_name in field_translations[key]:
-                    mapping[template_name] = str(value) if value is not None else ""
+        The mapping is built per slice (patient, resp1, resp2, tests,
+        conclusion, template fields, psychologist) and cached: only slices
+        changed through the ``set_*`` methods since the last call are rebuilt,
+        and the same read-only mapping is returned while nothing changed.
+        Copy it with ``dict()`` to modify it.
         
-        # Test result fields with optional aliases for template compatibility
-        test_field_translations = {
-            "AG_BPA": ["AG_pontuacao"],
-        }
-
-        for key, value in self.test_results.items():
-            str_value = str(value) if value is not None else ""
-            mapping[key] = str_value
-            if key in test_field_translations:
-                for alias in test_field_translations[key]:
-                    mapping.setdefault(alias, str_value)
+        Args:
+            fields: Optional placeholder names (e.g. ``CompiledTemplate.fields``).
+                Only these are computed, each resolved directly to its source
+                slice and key; names without data are left out, as in the full
+                mapping.
+        """
+        if fields is not None:
+            return self._get_fields(fields)
         
-        # Conclusion field
-        mapping["conclusao_text"] = self.conclusion_text
-
-        # Custom template fields
-        for key, value in self.template_fields_data.items():
-            mapping[key] = str(value) if value is not None else ""
+        changed = self._mapping is None
+        for slot, attribute in _SLOT_ATTRIBUTES:
+            source = getattr(self, attribute)
+            if not self._slice_is_current(slot, source):
+                self._slices[slot] = (self._versions[slot], source, _SLICE_BUILDERS[slot](source))
+                changed = True
         
-        # Psychologist fields with both standard and template names
-        for key, value in self.psychologist_data.items():
-            # Add standard name
-            mapping[key] = str(value) if value is not None else ""
-            # Add template-specific names
-            if key in field_translations:
-                for template_name in field_translations[key]:
-                    mapping[template_name] = str(value) if value is not None else ""
+        if changed:
+            mapping = FrozenDict()
+            for slot, _ in _SLOT_ATTRIBUTES:
+                dict.update(mapping, self._slices[slot][2])
+            self._mapping = mapping
+        return self._mapping
+    
+    def _slice_is_current(self, slot: str, source: Any) -> bool:
+        cached = self._slices.get(slot)
+        # a reassigned attribute (``model.patient_data = {...}``) also invalidates its slice
+        return cached is not None and cached[0] == self._versions[slot] and cached[1] is source
+    
+    def _get_fields(self, fields: Iterable[str]) -> Dict[str, str]:
+        """The entries of the full mapping for ``fields`` only."""
+        mapping = FrozenDict()
+        if self._mapping is not None and all(
+            self._slice_is_current(slot, getattr(self, attribute)) for slot, attribute in _SLOT_ATTRIBUTES
+        ):
+            full = self._mapping
+            dict.update(mapping, ((name, full[name]) for name in fields if name in full))
+            return mapping
         
+        sources = [(slot, getattr(self, attribute)) for slot, attribute in _LOOKUP_ORDER]
+        for name in fields:
+            for slot, source in sources:
+                if slot == "conclusion":
+                    if name == "conclusao_text":
+                        dict.__setitem__(mapping, name, source)
+                        break
+                    continue
+                if name in source:
+                    dict.__setitem__(mapping, name, _as_text(source[name]))
+                    break
+                key = next((key for alias_slot, key in _ALIAS_INDEX.get(name, ())
+                            if alias_slot == slot and key in source), None)
+                if key is not None:
+                    dict.__setitem__(mapping, name, _as_text(source[key]))
+                    break
         return mapping
     
     def to_dict(self) -> Dict[str, Any]:
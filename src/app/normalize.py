@@ -0,0 +1,37 @@
+"""Save a normalized copy of a template (runs split by Word merged back together).
+
+Usage (from ``src``)::
+
+    python -m app.normalize TEMPLATE.docx [-o SAIDA.docx]
+
+The copy is written next to the template as ``TEMPLATE.normalized.docx`` unless
+``-o`` is given. This module must not import PySide6.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from app.services import normalize_template
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.normalize",
+        description="Une runs com a mesma formatação para que cada campo fique em um único run.",
+    )
+    parser.add_argument("template", help="Template DOCX parametrizado")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: TEMPLATE.normalized.docx)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = normalize_template(args.template, args.output)
+    except (OSError, ValueError) as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return 1
+    print(f"{report.output_path}: {report.runs_removed} runs e {report.markers_removed} marcadores removidos "
+          f"({report.bytes_before} -> {report.bytes_after} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
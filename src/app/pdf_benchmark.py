@@ -0,0 +1,75 @@
+"""Compare cold (one ``soffice`` per document) and warm-pool PDF conversion.
+
+Usage (from ``src``)::
+
+    python -m app.pdf_benchmark LAUDO.docx [-n 10] [-j 2] [--soffice CAMINHO]
+
+The document is converted ``-n`` times, one at a time, with each converter.
+The pool's ``-j`` office processes are started (and warmed with one
+conversion each) before its timings begin; that start-up time is reported
+separately. PDFs are written to a temporary directory. This module must not import PySide6.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from app.services import ConverterPool, PdfConversionError, convert_cold
+
+
+def _timed(count: int, convert: Callable[[int], None]) -> List[float]:
+    timings = []
+    for index in range(count):
+        start = time.perf_counter()
+        convert(index)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _summary(label: str, total: float, timings: List[float]) -> str:
+    return (f"{label:<10} total {total:8.2f}s  por documento: média {statistics.mean(timings):6.2f}s  "
+            f"mediana {statistics.median(timings):6.2f}s  máx {max(timings):6.2f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.pdf_benchmark",
+        description="Compara a conversão DOCX -> PDF com um LibreOffice novo por documento e com o pool aquecido.",
+    )
+    parser.add_argument("docx", help="Documento DOCX de exemplo")
+    parser.add_argument("-n", "--count", type=int, default=10, help="Conversões por modo (padrão: 10)")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="Processos do pool (padrão: 2)")
+    parser.add_argument("--soffice", help="Executável do LibreOffice (padrão: soffice no PATH)")
+    args = parser.parse_args(argv)
+    if args.count < 1 or args.workers < 1:
+        parser.error("-n e -j devem ser pelo menos 1")
+
+    with tempfile.TemporaryDirectory(prefix="psyr-pdf-benchmark-") as outdir:
+        try:
+            start = time.perf_counter()
+            cold = _timed(args.count, lambda index: convert_cold(
+                args.docx, f"{outdir}/cold-{index}.pdf", soffice=args.soffice))
+            cold_total = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ConverterPool(size=args.workers, soffice=args.soffice) as pool:
+                # the offices start with the pool; wait for them before timing
+                for future in [pool.submit(args.docx, f"{outdir}/warmup-{index}.pdf") for index in range(args.workers)]:
+                    future.result()
+                startup = time.perf_counter() - start
+                warm = _timed(args.count, lambda index: pool.convert(args.docx, f"{outdir}/pool-{index}.pdf"))
+                warm_total = sum(warm)
+        except (ImportError, OSError, PdfConversionError) as exc:
+            print(f"Erro: {exc}", file=sys.stderr)
+            return 1
+
+    print(_summary("frio", cold_total, cold))
+    print(_summary("pool", warm_total, warm) + f"  (+ {startup:.2f}s para iniciar {args.workers} processos)")
+    print(f"aceleração por documento: {statistics.mean(cold) / statistics.mean(warm):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Generate a laudo on a ``QThreadPool`` thread, with stage progress and cancellation."""
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from app.services import RenderPlan, TemplateProcessor, get_compiled_template
+from app.services.data_registry import freeze
+
+STAGE_LOAD = "load"
+STAGE_REPLACE = "replace"
+STAGE_SAVE = "save"
+STAGE_PDF = "pdf"
+
+# Text shown to the user for each stage
+STAGE_LABELS = {
+    STAGE_LOAD: "Carregando template",
+    STAGE_REPLACE: "Preenchendo campos",
+    STAGE_SAVE: "Salvando DOCX",
+    STAGE_PDF: "Convertendo para PDF",
+}
+
+
+class ReportCancelled(Exception):
+    """Raised inside the worker when :meth:`ReportWorker.cancel` was called."""
+
+
+class ReportWorkerSignals(QObject):
+    """Signals of a :class:`ReportWorker` (``QRunnable`` cannot declare signals itself).
+
+    ``stage_started`` carries (stage, stage number starting at 1, number of
+    stages); ``finished`` carries ``{"docx": path, "pdf": path or None}``.
+    """
+
+    stage_started = Signal(str, int, int)
+    finished = Signal(dict)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class ReportWorker(QRunnable):
+    """Fill the template, save the DOCX and optionally convert it to PDF off the GUI thread.
+
+    The worker only sees an immutable snapshot of the field mapping, so the
+    screens can keep editing the data model while a report renders.
+    Cancellation is checked between stages.
+
+    ``plan`` is a :class:`RenderPlan` already built for this mapping on a
+    ``CompiledTemplate.new_document()`` copy (e.g. by ``gerar_laudo``, which
+    uses it for its warnings); its patches are applied as they are. Without
+    it, the compiled template's patches are applied directly.
+    """
+
+    def __init__(self, template_path: str, field_mapping: Mapping[str, Any], docx_path: str,
+                 pdf: bool = False, processor: Optional[TemplateProcessor] = None,
+                 plan: Optional[RenderPlan] = None):
+        super().__init__()
+        self.template_path = template_path
+        self.field_mapping = freeze(dict(field_mapping))
+        self.docx_path = docx_path
+        self.pdf = pdf
+        self.processor = processor or TemplateProcessor()
+        self.plan = plan
+        self.signals = ReportWorkerSignals()
+        self._cancel_requested = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def stages(self) -> tuple:
+        return (STAGE_LOAD, STAGE_REPLACE, STAGE_SAVE) + ((STAGE_PDF,) if self.pdf else ())
+
+    def cancel(self) -> None:
+        """Stop before the next stage starts (the current stage runs to completion)."""
+        self._cancel_requested.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the worker has finished, failed or been cancelled."""
+        return self._done.wait(timeout)
+
+    def run(self) -> None:
+        try:
+            result = self._generate()
+        except ReportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as exc:
+            self.signals.failed.emit(str(exc))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self._done.set()
+
+    def _start(self, stage: str) -> None:
+        if self._cancel_requested.is_set():
+            raise ReportCancelled()
+        stages = self.stages
+        self.signals.stage_started.emit(stage, stages.index(stage) + 1, len(stages))
+
+    def _generate(self) -> Dict[str, Optional[str]]:
+        processor = self.processor
+
+        self._start(STAGE_LOAD)
+        compiled = get_compiled_template(self.template_path)
+        document = self.plan.document if self.plan is not None else compiled.new_document()
+
+        self._start(STAGE_REPLACE)
+        processor.set_document(document)
+        if self.plan is not None:
+            processor.replace_fields(self.field_mapping, document, plan=self.plan)
+        else:
+            processor.replace_fields(self.field_mapping, document, compiled=compiled)
+
+        self._start(STAGE_SAVE)
+        processor.save_document(document, self.docx_path, compiled=compiled)
+
+        pdf_path = None
+        if self.pdf:
+            self._start(STAGE_PDF)
+            pdf_path = processor.convert_to_pdf(self.docx_path)
+        return {"docx": self.docx_path, "pdf": pdf_path}
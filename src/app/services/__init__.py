@@ -1,6 +1,58 @@
-from .template_processor import TemplateProcessor
-from .field_validator import FieldValidator
-from .template_fields_loader import TemplateFieldsLoader
+"""Services shared by the views and the command-line tools.
 
-__all__ = ['TemplateProcessor', 'FieldValidator', 'TemplateFieldsLoader']
+The names below are imported from their module on first access (PEP 562),
+so importing a light service such as ``data_registry`` does not load
+python-docx and lxml; the GUI only pays for them when a template is opened.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
+if TYPE_CHECKING:
+    # for type checkers, and so PyInstaller's import scan still bundles every module
+    from .template_processor import TemplateProcessor
+    from .field_validator import FieldValidator
+    from .template_fields_loader import TemplateFieldsLoader
+    from .compiled_template import CompiledTemplate, CompiledTemplateCache, get_compiled_template
+    from .report_renderer import RenderResult, render_many, iter_render, report_basename
+    from .data_registry import DataRegistry, get_registry
+    from .render_plan import RenderPlan
+    from .template_normalizer import NormalizationReport, normalize_template
+    from .pdf_converter import ConverterPool, PdfConversionError, convert_cold, get_converter_pool
+
+# exported name -> module defining it
+_EXPORTS = {
+    'TemplateProcessor': 'template_processor',
+    'FieldValidator': 'field_validator',
+    'TemplateFieldsLoader': 'template_fields_loader',
+    'CompiledTemplate': 'compiled_template',
+    'CompiledTemplateCache': 'compiled_template',
+    'get_compiled_template': 'compiled_template',
+    'RenderResult': 'report_renderer',
+    'render_many': 'report_renderer',
+    'iter_render': 'report_renderer',
+    'report_basename': 'report_renderer',
+    'DataRegistry': 'data_registry',
+    'get_registry': 'data_registry',
+    'RenderPlan': 'render_plan',
+    'NormalizationReport': 'template_normalizer',
+    'normalize_template': 'template_normalizer',
+    'ConverterPool': 'pdf_converter',
+    'PdfConversionError': 'pdf_converter',
+    'convert_cold': 'pdf_converter',
+    'get_converter_pool': 'pdf_converter',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,233 @@
+"""Parse a DOCX template once and fill it many times."""
+import copy
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from docx import Document
+from docx.document import Document as DocumentType
+
+from . import placeholder_engine
+from .package_writer import PackageBaseline, Target
+from .placeholder_engine import Span
+from .template_normalizer import NormalizationReport, normalize_document
+
+
+class PlaceholderSite:
+    """Position of the placeholders of one paragraph inside a template part."""
+
+    __slots__ = ("partname", "path", "run_texts", "spans")
+
+    def __init__(self, partname: str, path: Tuple[int, ...], run_texts: Tuple[str, ...], spans: Tuple[Span, ...]):
+        self.partname = partname
+        # child indices from the part root element down to the ``w:p`` element
+        self.path = path
+        self.run_texts = run_texts
+        self.spans = spans
+
+    def plan(self, field_mapping: Dict[str, Any]) -> Dict[int, str]:
+        """Return the new text of each touched run for ``field_mapping``."""
+        values = [placeholder_engine.replacement_value(field_mapping, name) for name, _, _ in self.spans]
+        return placeholder_engine.plan_run_texts(self.run_texts, self.spans, values)
+
+
+class CompiledTemplate:
+    """A DOCX template parsed once, with its placeholder positions recorded.
+
+    The parsed document is kept as a private master copy that is never handed
+    out. Each fill deep-copies it and patches only the recorded runs, so no zip
+    reading or XML parsing happens after compilation.
+    """
+
+    def __init__(self, path: str, blob: Optional[bytes] = None, normalize: bool = False):
+        """Compile the template at ``path``.
+
+        Args:
+            path: Template path. Used only as a label when ``blob`` is given.
+            blob: Optional DOCX bytes already read (e.g. sent to a worker process).
+            normalize: Merge runs split by Word before recording placeholder
+                positions (see :mod:`template_normalizer`), so most
+                placeholders are patched in a single run.
+        """
+        self.path = os.path.abspath(path)
+        if blob is None:
+            self.key = self.cache_key(self.path, os.stat(self.path))
+            with open(self.path, "rb") as fp:
+                blob = fp.read()
+        else:
+            self.key = (self.path, None, len(blob))
+
+        self._master = Document(BytesIO(blob))
+        self.normalized = normalize
+        self.normalization: Optional[NormalizationReport] = None
+        if normalize:
+            self.normalization = normalize_document(self._master)
+            # passthrough saves copy entries from ``blob``, so it must match the master
+            buffer = BytesIO()
+            self._master.save(buffer)
+            self.normalization.bytes_before = len(blob)
+            blob = buffer.getvalue()
+            self.normalization.bytes_after = len(blob)
+
+        # pristine serialized copy of the template package
+        self.blob: bytes = blob
+        self.sites: List[PlaceholderSite] = self._record_sites(self._master)
+        self.fields: Set[str] = {name for site in self.sites for name, _, _ in site.spans}
+        self._baseline: Optional[PackageBaseline] = None
+
+    @staticmethod
+    def cache_key(path: str, stat: os.stat_result) -> Tuple[str, Optional[int], int]:
+        """Key that changes whenever the template file is edited."""
+        return path, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _record_sites(document: DocumentType) -> List[PlaceholderSite]:
+        # scanning first: raw parts holding placeholders are parsed on the way
+        paragraphs = list(placeholder_engine.iter_document_paragraphs(document))
+        partnames = {
+            part._element: str(part.partname)
+            for part in document.part.package.iter_parts()
+            if hasattr(part, "_element")
+        }
+
+        sites: List[PlaceholderSite] = []
+        for p in paragraphs:
+            _, texts, full_text = placeholder_engine.read_paragraph(p)
+            spans = placeholder_engine.find_spans(full_text)
+            if not spans:
+                continue
+
+            path: List[int] = []
+            element = p
+            parent = element.getparent()
+            while parent is not None:
+                path.append(parent.index(element))
+                element, parent = parent, parent.getparent()
+            path.reverse()
+
+            sites.append(PlaceholderSite(partnames[element], tuple(path), tuple(texts), tuple(spans)))
+        return sites
+
+    def new_document(self) -> DocumentType:
+        """Return an independent, unfilled copy of the template."""
+        # lxml ignores the deepcopy memo, so each part tree is copied once up front
+        # and every element is registered; wrappers holding any element of a part
+        # (the document, its body, the part itself) then share the same copy.
+        memo: Dict[int, Any] = {}
+        originals: List[Any] = []
+        for part in self._master.part.package.iter_parts():
+            root = getattr(part, "_element", None)
+            if root is None:
+                continue
+            elements = list(root.iter())
+            originals.extend(elements)
+            for original, clone in zip(elements, copy.deepcopy(root).iter()):
+                memo[id(original)] = clone
+        document = copy.deepcopy(self._master, memo)
+        # ids are only meaningful while the originals are alive
+        del originals
+        return document
+
+    def locate(self, document: DocumentType) -> Iterator[Tuple[PlaceholderSite, Any]]:
+        """Yield each site with its ``w:p`` element in a copy returned by :meth:`new_document`."""
+        roots = {
+            str(part.partname): part._element
+            for part in document.part.package.iter_parts()
+            if hasattr(part, "_element")
+        }
+        for site in self.sites:
+            p = roots[site.partname]
+            for index in site.path:
+                p = p[index]
+            yield site, p
+
+    def apply(self, field_mapping: Dict[str, Any], document: DocumentType) -> int:
+        """Apply the precomputed patches to a copy returned by :meth:`new_document`.
+
+        Returns:
+            Number of placeholders replaced
+        """
+        count = 0
+        for site, p in self.locate(document):
+            runs = placeholder_engine.paragraph_runs(p)
+            for index, new_text in site.plan(field_mapping).items():
+                runs[index].text = new_text
+            count += len(site.spans)
+        return count
+
+    def fill(self, field_mapping: Dict[str, Any]) -> DocumentType:
+        """Return a new document with every placeholder replaced."""
+        document = self.new_document()
+        self.apply(field_mapping, document)
+        return document
+
+    @property
+    def baseline(self) -> PackageBaseline:
+        """Zip entries of the pristine template, built on first save."""
+        if self._baseline is None:
+            self._baseline = PackageBaseline(self.blob, self._master)
+        return self._baseline
+
+    def save(self, document: DocumentType, target: Target) -> Dict[str, int]:
+        """Save a copy returned by :meth:`new_document`, reusing the template's compressed entries.
+
+        Only the parts that changed are serialized into the output zip; media
+        and every other untouched entry are copied byte for byte.
+
+        Args:
+            document: Filled copy of this template
+            target: Output path, open file descriptor or binary file object
+
+        Returns:
+            Counts of ``copied`` and ``written`` zip entries
+        """
+        return self.baseline.save(document, target)
+
+
+class CompiledTemplateCache:
+    """Thread-safe LRU cache of :class:`CompiledTemplate` keyed by path, mtime and size."""
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, normalize: bool = False) -> CompiledTemplate:
+        """Return the compiled template for ``path``, recompiling it if the file changed.
+
+        A template compiled with a different ``normalize`` setting is replaced.
+        """
+        path = os.path.abspath(path)
+        key = CompiledTemplate.cache_key(path, os.stat(path))
+
+        with self._lock:
+            compiled = self._entries.get(path)
+            if compiled is not None and compiled.key == key and compiled.normalized == normalize:
+                self._entries.move_to_end(path)
+                return compiled
+
+        compiled = CompiledTemplate(path, normalize=normalize)
+        with self._lock:
+            self._entries[path] = compiled
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop one template (or every template when ``path`` is None)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+_default_cache = CompiledTemplateCache()
+
+
+def get_compiled_template(path: str, normalize: bool = False) -> CompiledTemplate:
+    """Return the process-wide compiled template for ``path``."""
+    return _default_cache.get(path, normalize)
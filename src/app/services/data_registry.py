@@ -0,0 +1,117 @@
+"""Process-wide registry of the configuration data loaded from ``src/app/data``."""
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import test_tables_loader
+from .frozen import FrozenDict, FrozenList, freeze  # noqa: F401 (re-exported)
+from .template_fields_loader import TemplateFieldsLoader
+from .test_result_classifier import TestResultClassifier
+from .test_tables_loader import TestTablesLoader
+
+TEST_TABLES = "test_tables"
+TEMPLATE_FIELDS = "template_fields"
+SOURCES = (TEST_TABLES, TEMPLATE_FIELDS)
+
+
+class DataRegistry:
+    """Load each data source once per process and share it between callers.
+
+    Loaders handed out by the registry hold read-only (:func:`freeze`) data, so
+    they can be shared by every screen and ``LaudoDataModel``. Call
+    :meth:`reload` or :meth:`invalidate` after editing the files; listeners
+    added with :meth:`add_listener` are told which source changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[Tuple[str, str], Any] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    # Shared objects -------------------------------------------------------------
+    def tables_loader(self, data_dir: Path | str | None = None) -> TestTablesLoader:
+        """Shared ``TestTablesLoader`` with its tables already loaded."""
+        def build() -> TestTablesLoader:
+            loader = TestTablesLoader(data_dir)
+            loader.load_all()  # already read-only
+            return loader
+        return self._get(TEST_TABLES, self._tables_path(data_dir), build)
+
+    def template_fields_loader(self, config_path: Path | str | None = None) -> TemplateFieldsLoader:
+        """Shared ``TemplateFieldsLoader`` with its configuration already loaded."""
+        def build() -> TemplateFieldsLoader:
+            loader = TemplateFieldsLoader(config_path)
+            loader._cache = freeze(loader.load_config())
+            return loader
+        return self._get(TEMPLATE_FIELDS, str(TemplateFieldsLoader(config_path).config_path.resolve()), build)
+
+    def classifier(self, data_dir: Path | str | None = None) -> TestResultClassifier:
+        """Shared ``TestResultClassifier`` built on :meth:`tables_loader`."""
+        return self._get(
+            TEST_TABLES,
+            f"classifier:{self._tables_path(data_dir)}",
+            lambda: TestResultClassifier(self.tables_loader(data_dir)),
+        )
+
+    # Invalidation ---------------------------------------------------------------
+    def invalidate(self, source: Optional[str] = None) -> None:
+        """Forget a source (or every source); it is loaded again on next use."""
+        sources = self._check_sources(source)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in sources]:
+                del self._entries[key]
+            if TEST_TABLES in sources:
+                test_tables_loader.clear_shared_cache()
+            listeners = list(self._listeners)
+        for name in sources:
+            for listener in listeners:
+                listener(name)
+
+    def reload(self, source: Optional[str] = None) -> None:
+        """Re-read a source (or every source) from disk now."""
+        sources = self._check_sources(source)
+        self.invalidate(source)
+        if TEST_TABLES in sources:
+            self.classifier()
+        if TEMPLATE_FIELDS in sources:
+            self.template_fields_loader()
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Call ``callback(source)`` whenever a source is invalidated or reloaded."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # Internals ------------------------------------------------------------------
+    def _get(self, source: str, path: str, build: Callable[[], Any]) -> Any:
+        key = (source, path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = build()
+                self._entries[key] = entry
+            return entry
+
+    @staticmethod
+    def _tables_path(data_dir: Path | str | None) -> str:
+        return str(TestTablesLoader(data_dir).data_dir.resolve())
+
+    @staticmethod
+    def _check_sources(source: Optional[str]) -> Tuple[str, ...]:
+        if source is None:
+            return SOURCES
+        if source not in SOURCES:
+            raise ValueError(f"Unknown data source '{source}'. Expected one of: {', '.join(SOURCES)}")
+        return (source,)
+
+
+_default_registry = DataRegistry()
+
+
+def get_registry() -> DataRegistry:
+    """Return the process-wide :class:`DataRegistry`."""
+    return _default_registry
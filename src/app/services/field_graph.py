@@ -0,0 +1,201 @@
+"""Dependency graph of the derived and classified test fields declared in the tables.
+
+Each ``*_table.jsonc`` file may list its fields under ``"campos"``. Every entry
+is one node of the graph::
+
+    "campos": [
+      // QIT_WISC = média dos índices quando não informado
+      { "tipo": "media", "entradas": ["ICV_WISC", "IOP_WISC", "IMO_WISC", "IVP_WISC"],
+        "saida": "QIT_WISC", "gravar": true },
+      // classifica QIT_WISC em QIT_out
+      { "entrada": "QIT_WISC", "saidas": ["QIT_out"], "regras": "classificacoes_pp" }
+    ]
+
+Node types (``tipo``):
+
+* ``"classificacao"`` (default): classifies ``entrada`` with the table rules
+  and stores the text in every field of ``saidas``. Optional keys: ``regras``
+  (rule list, default ``classificacoes``), ``texto`` (rule key holding the
+  text), ``pos_processamento`` (see ``test_result_classifier.POSTPROCESSORS``),
+  ``texto_analise`` (descriptive text stored in ``saida``, filled from the
+  first ``opcoes_texto_analise`` text of ``opcao`` (default: ``saida``) with
+  the classification and ``complemento``; ``"com_classificacao": true``
+  starts it with the classification) and ``pontuacao`` (fields that receive
+  the rounded score when the classification succeeds).
+* ``"media"``: when ``saida`` has no numeric value, it becomes the mean of
+  the numeric ``entradas``.
+* ``"primeiro"``: when ``saida`` is empty, it takes the first non-empty value
+  of ``entradas`` (aliases, e.g. fields misspelled in older templates).
+
+A derived value (``media``/``primeiro``) is seen by the nodes that read
+``saida``; with ``"gravar": true`` it is also stored in the results (rounded,
+for ``media``) unless the field is already present.
+"""
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CLASSIFY = "classificacao"
+MEAN = "media"
+FIRST = "primeiro"
+KINDS = (CLASSIFY, MEAN, FIRST)
+
+
+class FieldNode:
+    """One entry of a ``campos`` list, compiled."""
+
+    __slots__ = (
+        "table", "label", "kind", "inputs", "output", "outputs", "store", "rules", "text_key",
+        "postprocess", "analysis_output", "analysis_option", "analysis_complement", "analysis_lead",
+        "score_fields", "reads",
+    )
+
+    def __init__(self, table: str, spec: Dict[str, Any], label: str = ""):
+        """Compile ``spec``.
+
+        Raises:
+            ValueError: If the entry is malformed (message prefixed with ``label``)
+        """
+        self.table = table
+        self.label = label = label or table
+
+        def fail(message: str) -> ValueError:
+            return ValueError(f"{label}: {message}")
+
+        def field_list(key: str) -> Tuple[str, ...]:
+            value = spec.get(key, [])
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise fail(f"'{key}' deve ser uma lista de nomes de campo")
+            return tuple(value)
+
+        def optional_name(key: str) -> Optional[str]:
+            value = spec.get(key)
+            if value is not None and not isinstance(value, str):
+                raise fail(f"'{key}' deve ser um texto")
+            return value
+
+        if not isinstance(spec, dict):
+            raise fail("esperado um objeto")
+        self.kind = spec.get("tipo", CLASSIFY)
+        if self.kind not in KINDS:
+            raise fail(f"tipo desconhecido {self.kind!r} (use {', '.join(KINDS)})")
+
+        self.output: Optional[str] = None
+        self.outputs: Tuple[str, ...] = ()
+        self.store = bool(spec.get("gravar", False))
+        self.rules = self.text_key = self.postprocess = None
+        self.analysis_output = self.analysis_option = self.analysis_complement = None
+        self.analysis_lead = False
+        self.score_fields: Tuple[str, ...] = ()
+
+        if self.kind == CLASSIFY:
+            entrada = spec.get("entrada")
+            if not isinstance(entrada, str):
+                raise fail("'entrada' deve ser um nome de campo")
+            self.inputs: Tuple[str, ...] = (entrada,)
+            self.outputs = field_list("saidas")
+            self.rules = optional_name("regras")
+            self.text_key = optional_name("texto")
+            self.postprocess = optional_name("pos_processamento")
+            self.score_fields = field_list("pontuacao")
+            analysis = spec.get("texto_analise")
+            if analysis is not None:
+                if not isinstance(analysis, dict) or not isinstance(analysis.get("saida"), str) \
+                        or not isinstance(analysis.get("opcao", ""), str) \
+                        or not isinstance(analysis.get("complemento", ""), str):
+                    raise fail("'texto_analise' deve ter 'saida' e, opcionalmente, 'opcao' e 'complemento' em texto")
+                self.analysis_output = analysis["saida"]
+                self.analysis_option = analysis.get("opcao", self.analysis_output)
+                self.analysis_complement = analysis.get("complemento")
+                self.analysis_lead = bool(analysis.get("com_classificacao", False))
+            self.reads = self.inputs
+        else:
+            self.inputs = field_list("entradas")
+            self.output = spec.get("saida")
+            if not isinstance(self.output, str):
+                raise fail("'saida' deve ser um nome de campo")
+            if not self.inputs:
+                raise fail("'entradas' não pode ser vazia")
+            # the node only fills ``saida`` when it is empty, so it reads it too
+            self.reads = (self.output,) + tuple(field for field in self.inputs if field != self.output)
+
+    @property
+    def derives(self) -> Optional[str]:
+        """Field whose value this node provides to the nodes after it."""
+        return self.output
+
+    def __repr__(self) -> str:
+        return f"FieldNode({self.label!r}, {self.kind!r})"
+
+
+class FieldGraph:
+    """Nodes in topological order, indexed by the fields they read.
+
+    Args:
+        nodes: Nodes in declaration order (the order kept between independent nodes)
+
+    Nodes that are part of a cycle are left out and listed in :attr:`issues`.
+    """
+
+    def __init__(self, nodes: Iterable[FieldNode]):
+        declared = list(nodes)
+        self.issues: List[str] = []
+
+        providers: Dict[str, List[int]] = {}
+        for position, node in enumerate(declared):
+            if node.derives is not None:
+                providers.setdefault(node.derives, []).append(position)
+
+        # edge provider -> reader for every derived field a node reads
+        readers: List[List[int]] = [[] for _ in declared]
+        pending = [0] * len(declared)
+        for position, node in enumerate(declared):
+            for field in set(node.reads):
+                for provider in providers.get(field, ()):
+                    if provider != position:
+                        readers[provider].append(position)
+                        pending[position] += 1
+
+        ready = [position for position, count in enumerate(pending) if count == 0]
+        heapq.heapify(ready)
+        order: List[int] = []
+        while ready:
+            position = heapq.heappop(ready)
+            order.append(position)
+            for reader in readers[position]:
+                pending[reader] -= 1
+                if pending[reader] == 0:
+                    heapq.heappush(ready, reader)
+
+        cyclic = sorted(set(range(len(declared))) - set(order))
+        if cyclic:
+            self.issues.append("campos em ciclo ignorados: " + ", ".join(declared[p].label for p in cyclic))
+
+        rank = {old: new for new, old in enumerate(order)}
+        self.nodes: List[FieldNode] = [declared[position] for position in order]
+        self.dependents: List[Tuple[int, ...]] = [
+            tuple(sorted(rank[reader] for reader in readers[position] if reader in rank)) for position in order
+        ]
+        self.dispatch: Dict[str, Tuple[int, ...]] = {}
+        for position, node in enumerate(self.nodes):
+            for field in dict.fromkeys(node.reads):
+                self.dispatch[field] = self.dispatch.get(field, ()) + (position,)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def active(self, fields: Iterable[str]) -> List[int]:
+        """Positions, in evaluation order, of the nodes reading any of ``fields``
+        and of every node downstream of them."""
+        dispatch = self.dispatch
+        queue = list({position for field in fields for position in dispatch.get(field, ())})
+        heapq.heapify(queue)
+        seen = set(queue)
+        result: List[int] = []
+        while queue:
+            position = heapq.heappop(queue)
+            result.append(position)
+            for dependent in self.dependents[position]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    heapq.heappush(queue, dependent)
+        return result
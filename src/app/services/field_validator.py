@@ -1,5 +1,5 @@
 import re
-from typing import List, Tuple, Set
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 class FieldValidator:
@@ -61,48 +61,86 @@ class FieldValidator:
         'generic_lowercase': re.compile(r'^[a-z][a-z0-9_]+$'),
     }
     
+    # Names made only of letters, digits and underscores
+    _ALLOWED_CHARACTERS = re.compile(r'^[a-zA-Z0-9_]+$')
+    # Accepted when no category matches
+    _FALLBACK = 'format'
+    
+    # Every category in one alternation: the first alternative that matches
+    # the whole name wins, as when trying ``PATTERNS`` in order
+    _COMBINED = re.compile(
+        r'(?=[a-zA-Z0-9_]+$)(?:'
+        + '|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in PATTERNS.items())
+        + rf'|(?P<{_FALLBACK}>^[a-zA-Z][a-zA-Z0-9_]*$))'
+    )
+    
+    # field name -> (is_valid, reason)
+    _results: Dict[str, Tuple[bool, str]] = {}
+    
+    @classmethod
+    def get_field_category(cls, field_name: str) -> Optional[str]:
+        """Return the ``PATTERNS`` category of a field name.
+        
+        Returns:
+            The category, ``"format"`` for a valid name outside every category,
+            or None for an invalid name
+        """
+        match = cls._COMBINED.match(field_name) if field_name else None
+        return match.lastgroup if match else None
+    
     @classmethod
     def validate_field_name(cls, field_name: str) -> Tuple[bool, str]:
         """Validate a single field name against naming convention.
         
+        Results are memoized per name.
+        
         Args:
             field_name: The field name to validate (without braces)
             
         Returns:
             Tuple of (is_valid, reason)
         """
-        # Basic validation: field must be alphanumeric with underscores, not empty
-        if not field_name or not re.match(r'^[a-zA-Z0-9_]+$', field_name):
-            return False, f"Field '{field_name}' contains invalid characters"
-        
-        # Check against all patterns
-        for pattern_name, pattern in cls.PATTERNS.items():
-            if pattern.match(field_name):
-                return True, f"Valid {pattern_name} field"
-        
-        # If no specific pattern matches but it's a valid format, accept it
-        # This allows for flexibility with template fields
-        if re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', field_name):
-            return True, "Valid field name format"
-        
-        # If no pattern matches, it's invalid
-        return False, f"Field '{field_name}' does not follow naming convention"
+        try:
+            return cls._results[field_name]
+        except KeyError:
+            pass
+        
+        category = cls.get_field_category(field_name)
+        if category == cls._FALLBACK:
+            # valid format outside every category: accepted for flexibility with template fields
+            result = (True, "Valid field name format")
+        elif category is not None:
+            result = (True, f"Valid {category} field")
+        elif not field_name or not cls._ALLOWED_CHARACTERS.match(field_name):
+            result = (False, f"Field '{field_name}' contains invalid characters")
+        else:
+            result = (False, f"Field '{field_name}' does not follow naming convention")
+        
+        cls._results[field_name] = result
+        return result
     
     @classmethod
-    def validate_fields(cls, field_names: List[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
-        """Validate a list of field names.
+    def validate_fields(cls, field_names: Iterable[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Validate field names, each name once.
         
         Args:
-            field_names: List of field names to validate (without braces)
+            field_names: Field names to validate (without braces). A set is
+                validated in sorted order; otherwise the first occurrence of
+                each name sets its position.
             
         Returns:
             Tuple of (valid_fields, invalid_fields_with_reasons)
             invalid_fields_with_reasons is a list of (field_name, reason) tuples
         """
+        if isinstance(field_names, (set, frozenset)):
+            names: Iterable[str] = sorted(field_names)
+        else:
+            names = dict.fromkeys(field_names)
+        
         valid_fields = []
         invalid_fields = []
         
-        for field_name in field_names:
+        for field_name in names:
             is_valid, reason = cls.validate_field_name(field_name)
             if is_valid:
                 valid_fields.append(field_name)
@@ -0,0 +1,128 @@
+"""Sorted interval index for ``faixa_min``/``faixa_max`` classification rules."""
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+class IntervalIndex:
+    """Precompiled lookup over a list of closed ``[faixa_min, faixa_max]`` rules.
+
+    The distinct rule endpoints split the number line into points and the open
+    gaps between them. Each point and gap is assigned, at compile time, the
+    first rule in list order that covers it, so a lookup is one clamp plus one
+    ``bisect``. Results are the same as scanning the rules in order.
+    """
+
+    def __init__(self, rules: Iterable[Any], label: str = ""):
+        self.label = label
+        # Human-readable problems found while compiling (malformed or inverted rules)
+        self.issues: List[str] = []
+
+        intervals = []
+        for position, rule in enumerate(rules):
+            try:
+                lower = float(rule.get("faixa_min"))
+                upper = float(rule.get("faixa_max"))
+            except (AttributeError, TypeError, ValueError):
+                self.issues.append(f"{label} regra {position}: faixa_min/faixa_max inválidos ({rule!r})")
+                continue
+            if lower > upper:
+                self.issues.append(f"{label} regra {position}: faixa_min {lower:g} maior que faixa_max {upper:g}")
+            intervals.append((lower, upper, rule))
+
+        # Clamp bounds include every parseable rule, like the original linear scan
+        self.lower: Optional[float] = min((item[0] for item in intervals), default=None)
+        self.upper: Optional[float] = max((item[1] for item in intervals), default=None)
+
+        valid = [item for item in intervals if item[0] <= item[1]]
+        self.points: List[float] = sorted({bound for lower, upper, _ in valid for bound in (lower, upper)})
+        # point_rules[i] covers points[i]; gap_rules[i] covers the open gap (points[i], points[i + 1])
+        self.point_rules: List[Optional[Dict[str, Any]]] = [None] * len(self.points)
+        self.gap_rules: List[Optional[Dict[str, Any]]] = [None] * max(len(self.points) - 1, 0)
+
+        # Paint rules from last to first so earlier rules win where they overlap
+        for lower, upper, rule in reversed(valid):
+            first = bisect_left(self.points, lower)
+            last = bisect_right(self.points, upper) - 1
+            for index in range(first, last + 1):
+                self.point_rules[index] = rule
+            for index in range(first, last):
+                self.gap_rules[index] = rule
+
+    @property
+    def piece_rules(self) -> List[Optional[Dict[str, Any]]]:
+        """Rule of every piece, interleaved: point ``i`` is piece ``2*i``, gap ``i`` is ``2*i + 1``."""
+        pieces: List[Optional[Dict[str, Any]]] = []
+        for index, rule in enumerate(self.point_rules):
+            pieces.append(rule)
+            if index < len(self.gap_rules):
+                pieces.append(self.gap_rules[index])
+        return pieces
+
+    def __bool__(self) -> bool:
+        return bool(self.points)
+
+    def clamp(self, value: float) -> float:
+        """Clamp ``value`` into the table range (no-op for an empty index)."""
+        if self.lower is None:
+            return value
+        return max(self.lower, min(self.upper, value))
+
+    def lookup(self, value: float) -> Optional[Dict[str, Any]]:
+        """Return the rule covering ``value`` after clamping, or None."""
+        value = self.clamp(value)
+        points = self.points
+        index = bisect_left(points, value)
+        if index < len(points) and points[index] == value:
+            return self.point_rules[index]
+        if 0 < index < len(points):
+            return self.gap_rules[index - 1]
+        return None
+
+    def lookup_many(self, values: Sequence[float], labels: Optional[Sequence[Any]] = None) -> List[Any]:
+        """Classify a column of numbers at once.
+
+        Uses one ``numpy.searchsorted`` call when NumPy is installed and falls
+        back to ``bisect`` otherwise.
+
+        Args:
+            values: Numbers to classify (already parsed, no None)
+            labels: Optional value per piece (same order as :attr:`piece_rules`)
+                returned instead of the rules themselves
+
+        Returns:
+            The rule (or label) for each value, None where no rule applies
+        """
+        labels = list(self.piece_rules if labels is None else labels)
+        if self.lower is None or not labels:
+            return [None] * len(values)
+
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        if np is None:
+            pieces = (self._piece_of(self.clamp(value)) for value in values)
+            return [None if piece is None else labels[piece] for piece in pieces]
+
+        points = np.asarray(self.points, dtype=float)
+        raw = np.asarray(values, dtype=float)
+        # same clamping as ``max(lower, min(upper, value))``, where NaN ends up at the upper bound
+        clamped = np.where(np.isnan(raw), self.upper, np.clip(raw, self.lower, self.upper))
+        positions = np.searchsorted(points, clamped, side="left")
+        exact = (positions < len(points)) & (points[np.minimum(positions, len(points) - 1)] == clamped)
+        inside = (positions > 0) & (positions < len(points))
+        pieces = np.where(exact, 2 * positions, np.where(inside, 2 * positions - 1, len(labels)))
+        table = np.empty(len(labels) + 1, dtype=object)
+        table[:-1] = labels
+        table[-1] = None
+        return table[pieces].tolist()
+
+    def _piece_of(self, value: float) -> Optional[int]:
+        points = self.points
+        index = bisect_left(points, value)
+        if index < len(points) and points[index] == value:
+            return 2 * index
+        if 0 < index < len(points):
+            return 2 * index - 1
+        return None
@@ -0,0 +1,81 @@
+"""Reader for JSON with comments (JSONC), as used by the ``*_table.jsonc`` files."""
+import json
+import re
+from typing import Any, List, Optional
+
+# Possessive quantifiers: no backtracking, so a comment can never be cut short
+# or stretched over the next one, and broken input fails in linear time
+_BLOCK = r'/\*[^*]*+\*++(?:[^/*][^*]*+\*++)*+/'
+_BLANKS = r'(?:\s|//[^\n]*+|' + _BLOCK + r')*+'
+# One pass over the text. Strings are consumed whole inside "plain" runs, so
+# "//" inside a value is kept; only comments and trailing commas are tokens.
+_TOKEN = re.compile(
+    r'(?P<plain>(?:[^"/,]++|"[^"\\]*+(?:\\.[^"\\]*+)*+"|,(?!' + _BLANKS + r'[\]}]))++)'
+    r'|(?P<line>//[^\n]*+)'
+    r'|(?P<block>' + _BLOCK + r')'
+    r'|(?P<unclosed>/\*)'
+    r'|(?P<comma>,)'
+    r'|(?P<other>.)',
+    re.DOTALL,
+)
+_NOT_NEWLINE = re.compile(r"[^\n]")
+
+
+class JSONCError(ValueError):
+    """Syntax error in a JSONC document, with its position in the original text."""
+
+    def __init__(self, message: str, source: Optional[str], line: int, column: int):
+        self.message = message
+        self.source = source
+        self.line = line
+        self.column = column
+        location = f"{source}:{line}:{column}" if source else f"linha {line}, coluna {column}"
+        super().__init__(f"{location}: {message}")
+
+
+def _position(text: str, offset: int) -> tuple:
+    line = text.count("\n", 0, offset) + 1
+    return line, offset - (text.rfind("\n", 0, offset) + 1) + 1
+
+
+def strip(text: str, source: Optional[str] = None) -> str:
+    """Return ``text`` as plain JSON: comments and trailing commas become spaces.
+
+    Line breaks are kept, so positions in the result match the original text.
+
+    Raises:
+        JSONCError: If a ``/*`` comment is never closed
+    """
+    chunks: List[str] = []
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == "plain" or kind == "other":
+            chunks.append(match.group())
+        elif kind == "line":
+            chunks.append(" " * (match.end() - match.start()))
+        elif kind == "block":
+            chunks.append(_NOT_NEWLINE.sub(" ", match.group()))
+        elif kind == "comma":
+            # trailing comma: only blanks/comments before the closing bracket
+            chunks.append(" ")
+        else:
+            line, column = _position(text, match.start())
+            raise JSONCError("comentário /* não foi fechado", source, line, column)
+    return "".join(chunks)
+
+
+def loads(text: str, source: Optional[str] = None) -> Any:
+    """Parse a JSONC document.
+
+    Args:
+        text: Document text
+        source: Optional file name used in error messages
+
+    Raises:
+        JSONCError: With the line and column of the error in ``text``
+    """
+    cleaned = strip(text, source)
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError as exc:
+        raise JSONCError(exc.msg, source, exc.lineno, exc.colno) from exc
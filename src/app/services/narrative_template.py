@@ -0,0 +1,110 @@
+"""Slot-based templates for the ``opcoes_texto_analise`` texts of the tables.
+
+Option texts may hold the slots ``[CLASSIFICAÇÃO AQUI]`` and
+``[COMPLEMENTO AQUI]``. A filled text is tidied: no space before "," or ".",
+whitespace runs collapsed, ends stripped. Compiling splits a text at its slots
+and tidies the literal segments once, so filling it is a single join. A value
+that is not tidy itself (or is empty, starts with "," or "." or holds a slot)
+falls back to filling and tidying the whole text, which gives the same result.
+"""
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+CLASSIFICATION = "classificacao"
+COMPLEMENT = "complemento"
+
+# Slot marker -> value name, in the order the markers are replaced
+SLOTS = {
+    "[CLASSIFICAÇÃO AQUI]": CLASSIFICATION,
+    "[COMPLEMENTO AQUI]": COMPLEMENT,
+}
+_SLOT_PATTERN = re.compile("|".join(re.escape(marker) for marker in SLOTS))
+
+
+def tidy(text: str) -> str:
+    """Drop the space before "," and ".", collapse whitespace and strip."""
+    return " ".join(text.replace(" ,", ",").replace(" .", ".").split())
+
+
+def _tidy_segment(text: str, first: bool, last: bool) -> str:
+    """``tidy`` for a literal between slots: keeps one space at an inner edge."""
+    body = tidy(text)
+    text = text.replace(" ,", ",").replace(" .", ".")
+    if not body:
+        return " " if text and not (first or last) else ""
+    lead = " " if not first and text[0].isspace() else ""
+    trail = " " if not last and text[-1].isspace() else ""
+    return lead + body + trail
+
+
+def _joins_cleanly(value: Any) -> bool:
+    return (isinstance(value, str) and value != "" and value[0] not in ",."
+            and value == tidy(value) and _SLOT_PATTERN.search(value) is None)
+
+
+class NarrativeTemplate:
+    """One option text, split at its slots.
+
+    Args:
+        source: Option text as written in the table
+    """
+
+    __slots__ = ("source", "pieces", "slots")
+
+    def __init__(self, source: str):
+        self.source = source
+        literals: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(source):
+            literals.append(source[position:match.start()])
+            slots.append((2 * len(slots) + 1, SLOTS[match.group()]))
+            position = match.end()
+        literals.append(source[position:])
+
+        last = len(literals) - 1
+        pieces: List[Optional[str]] = []
+        for index, literal in enumerate(literals):
+            if index:
+                pieces.append(None)
+            pieces.append(_tidy_segment(literal, index == 0, index == last))
+        self.pieces: Tuple[Optional[str], ...] = tuple(pieces)
+        self.slots: Tuple[Tuple[int, str], ...] = tuple(slots)
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Fill the slots with ``values`` (name -> text) and tidy the result."""
+        if not self.slots:
+            return self.pieces[0]
+        pieces = list(self.pieces)
+        for position, name in self.slots:
+            value = values.get(name)
+            if not _joins_cleanly(value):
+                return self._render_whole(values)
+            pieces[position] = value
+        return "".join(pieces)
+
+    def _render_whole(self, values: Mapping[str, str]) -> str:
+        text = self.source
+        for marker, name in SLOTS.items():
+            if name in values and marker in text:
+                text = text.replace(marker, values[name])
+        return tidy(text)
+
+    def __repr__(self) -> str:
+        return f"NarrativeTemplate({self.source!r})"
+
+
+def compile_options(options: Any) -> Dict[str, Tuple[Optional[NarrativeTemplate], ...]]:
+    """Compile an ``opcoes_texto_analise`` object.
+
+    Returns:
+        Option key -> one template per option text (None where the option is
+        not a text); options that are not lists are left out
+    """
+    if not isinstance(options, dict):
+        return {}
+    return {
+        key: tuple(NarrativeTemplate(text) if isinstance(text, str) else None for text in texts)
+        for key, texts in options.items()
+        if isinstance(texts, list)
+    }
@@ -0,0 +1,101 @@
+"""Age-banded norm tables: (age band, raw score) -> standard score or percentile."""
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Optional, Union
+
+Number = Union[int, float]
+
+
+class NormTable:
+    """One subtest's norms, compiled from a ``normas`` entry of a ``*_table.jsonc`` file.
+
+    Expected entry (``faixas_idade`` are the first age, in years, of each band;
+    each row of ``pontos_brutos`` holds the lowest raw score of every step of
+    that band, ascending, and ``valores`` the result for each step)::
+
+        "DIGS": {
+          "entrada": "DIGS_WISC_bruto",
+          "saida": "DIGS_WISC",
+          "faixas_idade": [6, 7, 8],
+          "idade_max": 9,
+          "pontos_brutos": [[0, 3, 5], [0, 4, 6], [0, 4, 7]],
+          "valores": [[1, 2, 3], [1, 2, 3], [1, 2, 3]]
+        }
+
+    Bands and steps are stored in flat ``array('d')`` buffers with per-band
+    offsets; a lookup is one ``bisect`` on the age axis and one on the raw axis.
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any], label: str = ""):
+        """Compile ``spec``.
+
+        Raises:
+            ValueError: If the entry is malformed (message prefixed with ``label``)
+        """
+        self.name = name
+        label = label or name
+
+        def fail(message: str) -> ValueError:
+            return ValueError(f"{label}: {message}")
+
+        if not isinstance(spec, dict):
+            raise fail("esperado um objeto")
+        self.input_field = spec.get("entrada")
+        self.output_field = spec.get("saida")
+        if not isinstance(self.input_field, str) or not isinstance(self.output_field, str):
+            raise fail("'entrada' e 'saida' devem ser nomes de campo")
+
+        ages = spec.get("faixas_idade")
+        raw_rows = spec.get("pontos_brutos")
+        value_rows = spec.get("valores")
+        if not isinstance(ages, list) or not ages:
+            raise fail("'faixas_idade' deve ser uma lista não vazia")
+        if not isinstance(raw_rows, list) or not isinstance(value_rows, list) \
+                or not len(ages) == len(raw_rows) == len(value_rows):
+            raise fail("'pontos_brutos' e 'valores' precisam de uma linha por faixa etária")
+
+        try:
+            self.age_bounds = array("d", ages)
+            max_age = spec.get("idade_max")
+            self.max_age: Optional[float] = None if max_age is None else float(max_age)
+        except (TypeError, ValueError):
+            raise fail("idades devem ser números") from None
+        if any(a >= b for a, b in zip(self.age_bounds, self.age_bounds[1:])):
+            raise fail("'faixas_idade' deve estar em ordem crescente")
+        if self.max_age is not None and self.max_age <= self.age_bounds[-1]:
+            raise fail("'idade_max' deve ser maior que a última faixa")
+
+        self.raw_bounds = array("d")
+        self.values = array("d")
+        self.offsets = array("l", [0])
+        for band, (raws, values) in enumerate(zip(raw_rows, value_rows)):
+            if not isinstance(raws, list) or not isinstance(values, list) or len(raws) != len(values) or not raws:
+                raise fail(f"faixa {band}: 'pontos_brutos' e 'valores' devem ter o mesmo tamanho")
+            try:
+                start = len(self.raw_bounds)
+                self.raw_bounds.extend(float(raw) for raw in raws)
+                self.values.extend(float(value) for value in values)
+            except (TypeError, ValueError):
+                raise fail(f"faixa {band}: escores devem ser números") from None
+            band_raws = self.raw_bounds[start:]
+            if any(a >= b for a, b in zip(band_raws, band_raws[1:])):
+                raise fail(f"faixa {band}: 'pontos_brutos' deve estar em ordem crescente")
+            self.offsets.append(len(self.raw_bounds))
+
+    def lookup(self, age: float, raw: float) -> Optional[Number]:
+        """Return the normed value, or None when ``age`` or ``raw`` is out of the table."""
+        if age != age or raw != raw:  # NaN
+            return None
+        if self.max_age is not None and age >= self.max_age:
+            return None
+        band = bisect_right(self.age_bounds, age) - 1
+        if band < 0:
+            return None
+
+        start, end = self.offsets[band], self.offsets[band + 1]
+        step = bisect_right(self.raw_bounds, raw, start, end) - 1
+        if step < start:
+            return None
+
+        value = self.values[step]
+        return int(value) if value.is_integer() else value
@@ -0,0 +1,189 @@
+"""Save a filled document by copying the untouched entries of its template package.
+
+``Document.save`` serializes every part and recompresses every zip entry,
+including the images in ``word/media``. :class:`PackageBaseline` remembers what
+python-docx would write for the pristine template; when a filled copy is saved,
+entries whose content did not change are copied from the template zip as
+already-compressed bytes and only the changed XML parts are deflated again.
+"""
+import os
+import struct
+import time
+import zipfile
+import zlib
+from io import BytesIO
+from typing import IO, Any, Dict, List, Tuple, Union
+
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+
+# A path, an open file descriptor or a binary file object
+Target = Union[str, "os.PathLike[str]", int, IO[bytes]]
+
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_ZIP32_LIMIT = 0xFFFFFFFF
+_UTF8_FLAG = 0x800
+_VERSION = 20
+
+
+def package_entries(document) -> List[Tuple[str, bytes]]:
+    """Return the zip entries python-docx would write for ``document``, in order."""
+    package = document.part.package
+    parts = list(package.iter_parts())
+    for part in parts:
+        part.before_marshal()
+
+    entries = [
+        (CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob),
+        (PACKAGE_URI.rels_uri.membername, package.rels.xml),
+    ]
+    for part in parts:
+        entries.append((part.partname.membername, part.blob))
+        if len(part.rels):
+            entries.append((part.partname.rels_uri.membername, part.rels.xml))
+    return entries
+
+
+class _Entry:
+    """One member of the output zip, either copied raw or freshly deflated."""
+
+    __slots__ = ("name", "method", "flags", "dos_time", "dos_date", "crc", "data", "size", "external_attr")
+
+    def __init__(self, name: bytes, method: int, flags: int, dos_time: int, dos_date: int,
+                 crc: int, data: bytes, size: int, external_attr: int):
+        self.name = name
+        self.method = method
+        self.flags = flags
+        self.dos_time = dos_time
+        self.dos_date = dos_date
+        self.crc = crc
+        self.data = data
+        self.size = size
+        self.external_attr = external_attr
+
+
+class PackageBaseline:
+    """A template package and the entries python-docx writes for it unchanged.
+
+    Args:
+        blob: Bytes of the template DOCX
+        document: The template parsed from ``blob`` and never modified
+            (``CompiledTemplate``'s master copy)
+    """
+
+    def __init__(self, blob: bytes, document):
+        self.blob = blob
+        with zipfile.ZipFile(BytesIO(blob)) as source:
+            self._infos: Dict[str, zipfile.ZipInfo] = {info.filename: info for info in source.infolist()}
+        self._pristine: Dict[str, bytes] = dict(package_entries(document))
+
+    def save(self, document, target: Target) -> Dict[str, int]:
+        """Write ``document`` to ``target``, copying every unchanged entry raw.
+
+        ``document`` must be a copy of the baseline's template (e.g. from
+        ``CompiledTemplate.new_document``). Falls back to ``document.save``
+        when the output would need ZIP64.
+
+        Returns:
+            Counts of ``copied`` and ``written`` entries
+        """
+        entries: List[_Entry] = []
+        copied = 0
+        for name, data in package_entries(document):
+            pristine = self._pristine.get(name)
+            info = self._infos.get(name)
+            if info is not None and pristine is not None and (pristine is data or pristine == data):
+                entries.append(self._raw_entry(info))
+                copied += 1
+            else:
+                entries.append(self._deflated_entry(name, data))
+
+        if sum(len(entry.data) + 30 + len(entry.name) for entry in entries) >= _ZIP32_LIMIT:
+            _with_file(target, document.save)
+        else:
+            _with_file(target, lambda fp: self._write(fp, entries))
+        return {"copied": copied, "written": len(entries) - copied}
+
+    # Internals ------------------------------------------------------------------
+    def _raw_entry(self, info: zipfile.ZipInfo) -> _Entry:
+        offset = info.header_offset
+        header = _LOCAL_HEADER.unpack_from(self.blob, offset)
+        start = offset + _LOCAL_HEADER.size + header[9] + header[10]
+        dos_date = (info.date_time[0] - 1980) << 9 | info.date_time[1] << 5 | info.date_time[2]
+        dos_time = info.date_time[3] << 11 | info.date_time[4] << 5 | info.date_time[5] // 2
+        return _Entry(
+            info.filename.encode("utf-8"),
+            info.compress_type,
+            # sizes go in the local header, so no data descriptor follows the copy
+            (info.flag_bits & ~0x8) | (_UTF8_FLAG if not info.filename.isascii() else 0),
+            dos_time,
+            dos_date,
+            info.CRC,
+            self.blob[start:start + info.compress_size],
+            info.file_size,
+            info.external_attr,
+        )
+
+    @staticmethod
+    def _deflated_entry(name: str, data: bytes) -> _Entry:
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        year, month, day, hour, minute, second = time.localtime()[:6]
+        return _Entry(
+            name.encode("utf-8"),
+            zipfile.ZIP_DEFLATED,
+            _UTF8_FLAG if not name.isascii() else 0,
+            hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day,
+            zlib.crc32(data),
+            compressed,
+            len(data),
+            0o600 << 16,
+        )
+
+    @staticmethod
+    def _write(fp: IO[bytes], entries: List[_Entry]) -> None:
+        try:
+            position = fp.tell()
+        except (AttributeError, OSError):
+            position = 0
+
+        offsets = []
+        for entry in entries:
+            offsets.append(position)
+            fp.write(_LOCAL_HEADER.pack(
+                b"PK\x03\x04", _VERSION, entry.flags, entry.method, entry.dos_time, entry.dos_date,
+                entry.crc, len(entry.data), entry.size, len(entry.name), 0,
+            ))
+            fp.write(entry.name)
+            fp.write(entry.data)
+            position += _LOCAL_HEADER.size + len(entry.name) + len(entry.data)
+
+        directory_offset = position
+        for entry, offset in zip(entries, offsets):
+            fp.write(_CENTRAL_HEADER.pack(
+                b"PK\x01\x02", _VERSION, _VERSION, entry.flags, entry.method, entry.dos_time, entry.dos_date,
+                entry.crc, len(entry.data), entry.size, len(entry.name), 0, 0, 0, 0,
+                entry.external_attr, offset,
+            ))
+            fp.write(entry.name)
+            position += _CENTRAL_HEADER.size + len(entry.name)
+
+        fp.write(_END_RECORD.pack(
+            b"PK\x05\x06", 0, 0, len(entries), len(entries), position - directory_offset, directory_offset, 0,
+        ))
+
+
+def _with_file(target: Target, write: Any) -> None:
+    """Call ``write(fp)`` with a binary file for a path, a file descriptor or a file object."""
+    if isinstance(target, int):
+        # the caller keeps ownership of the descriptor
+        with open(target, "wb", closefd=False) as fp:
+            write(fp)
+    elif isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as fp:
+            write(fp)
+    else:
+        write(target)
@@ -0,0 +1,389 @@
+"""DOCX -> PDF conversion with a local LibreOffice (``soffice --headless``).
+
+Two converters are available:
+
+* :func:`convert_cold` starts a new ``soffice --convert-to pdf`` for every
+  document. It needs nothing but LibreOffice, but pays the multi-second
+  office start-up on each call.
+* :class:`ConverterPool` keeps ``size`` office processes running, each with
+  its own user profile, and sends them jobs over UNO. Jobs are queued, have a
+  timeout each, and an office that crashes or hangs is restarted. It needs the
+  ``uno`` module that ships with LibreOffice (``python3-uno`` on
+  Debian/Ubuntu).
+
+``TemplateProcessor.convert_to_pdf(..., backend=...)`` selects between these
+and ``docx2pdf`` (which drives Microsoft Word on Windows/macOS).
+``python -m app.pdf_benchmark`` compares the two LibreOffice converters.
+"""
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional
+
+BACKEND_DOCX2PDF = "docx2pdf"
+BACKEND_LIBREOFFICE = "libreoffice"
+BACKEND_LIBREOFFICE_POOL = "libreoffice-pool"
+BACKENDS = (BACKEND_DOCX2PDF, BACKEND_LIBREOFFICE, BACKEND_LIBREOFFICE_POOL)
+
+SOFFICE_NAMES = ("soffice", "libreoffice")
+# Seconds a single conversion may take before the office is killed
+DEFAULT_TIMEOUT = 120.0
+# Seconds a new office process may take to accept UNO connections
+DEFAULT_START_TIMEOUT = 60.0
+
+
+class PdfConversionError(RuntimeError):
+    """A document could not be converted to PDF."""
+
+
+class PdfConversionTimeout(PdfConversionError, TimeoutError):
+    """A conversion took longer than its timeout; the office was restarted."""
+
+
+def uno_available() -> bool:
+    """True if LibreOffice's ``uno`` module can be imported.
+
+    It comes with the system LibreOffice, so it is usually missing from a
+    virtualenv and from the PyInstaller build.
+    """
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_backend() -> str:
+    """``docx2pdf`` where Microsoft Word can exist; elsewhere the warm LibreOffice
+    pool, or one ``soffice`` per document when ``uno`` is not importable."""
+    if sys.platform in ("win32", "darwin"):
+        return BACKEND_DOCX2PDF
+    return BACKEND_LIBREOFFICE_POOL if uno_available() else BACKEND_LIBREOFFICE
+
+
+def find_soffice(soffice: Optional[str] = None) -> str:
+    """Return the LibreOffice executable to run.
+
+    Args:
+        soffice: Explicit path or command name. If None, ``soffice`` and
+            ``libreoffice`` are looked up on ``PATH``.
+
+    Raises:
+        PdfConversionError: If no executable is found
+    """
+    for name in ((soffice,) if soffice else SOFFICE_NAMES):
+        found = shutil.which(name)
+        if found:
+            return found
+    raise PdfConversionError(
+        "LibreOffice não encontrado. Instale o LibreOffice ou informe o caminho do executável 'soffice'."
+    )
+
+
+def default_pdf_path(docx_path: str) -> str:
+    return os.path.splitext(docx_path)[0] + ".pdf"
+
+
+def _profile_args(profile_dir: str) -> List[str]:
+    # a private profile lets several offices run side by side without sharing locks
+    return [
+        f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+        "--headless",
+        "--invisible",
+        "--nologo",
+        "--nodefault",
+        "--norestore",
+        "--nolockcheck",
+    ]
+
+
+def convert_cold(docx_path: str, pdf_path: Optional[str] = None, soffice: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT) -> str:
+    """Convert one document with a fresh ``soffice --convert-to pdf`` process.
+
+    Returns:
+        The path where the PDF was saved
+    """
+    executable = find_soffice(soffice)
+    pdf_path = os.path.abspath(pdf_path or default_pdf_path(docx_path))
+    os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="psyr-soffice-") as workdir:
+        outdir = os.path.join(workdir, "out")
+        command = [executable, *_profile_args(os.path.join(workdir, "profile")),
+                   "--convert-to", "pdf", "--outdir", outdir, os.path.abspath(docx_path)]
+        try:
+            completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+        except subprocess.TimeoutExpired as exc:
+            raise PdfConversionTimeout(f"A conversão de {docx_path} excedeu {timeout:g}s") from exc
+
+        produced = os.path.join(outdir, os.path.splitext(os.path.basename(docx_path))[0] + ".pdf")
+        if completed.returncode != 0 or not os.path.exists(produced):
+            detail = completed.stderr.decode(errors="replace").strip()
+            raise PdfConversionError(f"Falha ao converter {docx_path} para PDF: {detail or completed.returncode}")
+        shutil.move(produced, pdf_path)
+    return pdf_path
+
+
+class OfficeProcess:
+    """One headless LibreOffice with a private profile, driven over a UNO pipe."""
+
+    def __init__(self, soffice: Optional[str] = None, start_timeout: float = DEFAULT_START_TIMEOUT):
+        self.soffice = find_soffice(soffice)
+        self.start_timeout = start_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.profile_dir: Optional[str] = None
+        self._desktop = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        try:
+            import uno
+        except ImportError:
+            raise ImportError(
+                "The LibreOffice 'uno' module is required for the converter pool. "
+                "Install it with your LibreOffice package (e.g. apt install python3-uno)"
+            )
+
+        pipe = f"psyr-{uuid.uuid4().hex}"
+        self.profile_dir = tempfile.mkdtemp(prefix="psyr-soffice-")
+        self.process = subprocess.Popen(
+            [self.soffice, *_profile_args(self.profile_dir), f"--accept=pipe,name={pipe};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            try:
+                context = resolver.resolve(f"uno:pipe,name={pipe};urp;StarOffice.ComponentContext")
+                break
+            except Exception:
+                # NoConnectException until the office has opened the pipe
+                if not self.alive or time.monotonic() > deadline:
+                    self.stop()
+                    raise PdfConversionError("O LibreOffice não pôde ser iniciado")
+                time.sleep(0.1)
+        self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+    def convert(self, docx_path: str, pdf_path: str) -> None:
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def properties(**values):
+            return tuple(PropertyValue(Name=name, Value=value) for name, value in values.items())
+
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(docx_path)), "_blank", 0,
+            properties(Hidden=True, ReadOnly=True),
+        )
+        if document is None:
+            raise PdfConversionError(f"O LibreOffice não conseguiu abrir {docx_path}")
+        try:
+            document.storeToURL(uno.systemPathToFileUrl(pdf_path), properties(FilterName="writer_pdf_Export"))
+        finally:
+            document.close(True)
+
+    def kill(self) -> None:
+        if self.alive:
+            self.process.kill()
+
+    def stop(self) -> None:
+        if self._desktop is not None and self.alive:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass  # the bridge dies with the office
+        self._desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+
+class _OfficeDied(Exception):
+    """The office process exited in the middle of a job."""
+
+
+class _Job:
+    __slots__ = ("docx_path", "pdf_path", "timeout", "future")
+
+    def __init__(self, docx_path: str, pdf_path: str, timeout: float):
+        self.docx_path = docx_path
+        self.pdf_path = pdf_path
+        self.timeout = timeout
+        self.future: Future = Future()
+
+
+class ConverterPool:
+    """A queue of DOCX -> PDF jobs served by warm LibreOffice processes.
+
+    Each of the ``size`` worker threads owns one :class:`OfficeProcess`,
+    started when the pool is created. A job that exceeds its timeout kills
+    its office and fails with :class:`PdfConversionTimeout`; an office that
+    dies during a job is restarted and the job is tried once more.
+
+    Args:
+        size: Number of office processes
+        soffice: LibreOffice executable (see :func:`find_soffice`)
+        timeout: Default per-job timeout in seconds
+        start_timeout: Seconds an office may take to start
+    """
+
+    office_class = OfficeProcess
+
+    def __init__(self, size: int = 2, soffice: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT,
+                 start_timeout: float = DEFAULT_START_TIMEOUT):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.soffice = soffice
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.restarts = 0
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._serve, name=f"soffice-pool-{slot}", daemon=True) for slot in range(size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, docx_path: str, pdf_path: Optional[str] = None, timeout: Optional[float] = None) -> Future:
+        """Queue a conversion; the future resolves to the PDF path."""
+        pdf_path = os.path.abspath(pdf_path or default_pdf_path(docx_path))
+        job = _Job(os.path.abspath(docx_path), pdf_path, self.timeout if timeout is None else timeout)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ConverterPool is closed")
+            self._jobs.put(job)
+        return job.future
+
+    def convert(self, docx_path: str, pdf_path: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """Convert and wait for the result.
+
+        Returns:
+            The path where the PDF was saved
+        """
+        return self.submit(docx_path, pdf_path, timeout).result()
+
+    def close(self) -> None:
+        """Finish the queued jobs and stop every office process."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._threads:
+                self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "ConverterPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Internals ------------------------------------------------------------------
+    def _new_office(self) -> OfficeProcess:
+        office = self.office_class(self.soffice, self.start_timeout)
+        office.start()
+        return office
+
+    def _serve(self) -> None:
+        office: Optional[OfficeProcess] = None
+        try:
+            office = self._new_office()
+        except Exception:
+            pass  # reported by the first job this thread takes
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                if office is None or not office.alive:
+                    office = self._replace(office)
+                try:
+                    result = self._run(office, job)
+                except _OfficeDied:
+                    # the office crashed under this job: restart it and try once more
+                    office = self._replace(office)
+                    try:
+                        result = self._run(office, job)
+                    except _OfficeDied:
+                        raise PdfConversionError(f"O LibreOffice falhou ao converter {job.docx_path}")
+            except Exception as exc:
+                job.future.set_exception(exc)
+            else:
+                job.future.set_result(result)
+
+        if office is not None:
+            office.stop()
+
+    def _replace(self, office: Optional[OfficeProcess]) -> OfficeProcess:
+        """Stop ``office`` (if any) and start a new one."""
+        if office is not None:
+            office.stop()
+            with self._lock:
+                self.restarts += 1
+        return self._new_office()
+
+    def _run(self, office: OfficeProcess, job: _Job) -> str:
+        os.makedirs(os.path.dirname(job.pdf_path), exist_ok=True)
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            office.kill()
+
+        watchdog = threading.Timer(job.timeout, expire)
+        watchdog.start()
+        try:
+            office.convert(job.docx_path, job.pdf_path)
+        except Exception as exc:
+            if timed_out.is_set():
+                # the office was killed; the next job starts a new one
+                raise PdfConversionTimeout(f"A conversão de {job.docx_path} excedeu {job.timeout:g}s") from exc
+            if not office.alive:
+                raise _OfficeDied() from exc
+            raise
+        finally:
+            watchdog.cancel()
+        return job.pdf_path
+
+
+_default_pool: Optional[ConverterPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_converter_pool() -> ConverterPool:
+    """Return the process-wide :class:`ConverterPool`, starting it on first use."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConverterPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,297 @@
+"""Single-pass placeholder scanning and run patching for DOCX paragraphs.
+
+The legacy replacement path in :class:`TemplateProcessor` re-reads every run of a
+paragraph for each placeholder it finds. The helpers here read each run's text
+once, locate every ``{campo}`` in one scan of the paragraph text and compute the
+final text of every affected run in a single merge over a run-offset index.
+Runs are rewritten through python-docx's ``CT_R.text`` setter, so the resulting
+XML is the same as the one produced by the legacy engine.
+
+The part scanner at the end walks every story part of the package (body,
+headers and footers of any type, footnotes, endnotes, comments) instead of the
+python-docx ``Document`` API, so text boxes and content controls are covered too.
+"""
+import re
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from docx.opc.constants import CONTENT_TYPE as CT
+from docx.opc.part import Part, XmlPart
+from docx.oxml.ns import nsmap, qn
+from docx.oxml.parser import element_class_lookup, parse_xml
+from docx.oxml.simpletypes import ST_Merge
+from lxml import etree
+
+FIELD_PATTERN = re.compile(r'\{([a-zA-Z0-9_]+)\}')
+
+_W_P = qn("w:p")
+_W_R = qn("w:r")
+_W_HYPERLINK = qn("w:hyperlink")
+_W_SDT = qn("w:sdt")
+_W_SDT_CONTENT = qn("w:sdtContent")
+_W_TC = qn("w:tc")
+_VMERGE_PATH = ".//" + qn("w:vMerge")
+
+# Parts that hold document text and may contain placeholders
+STORY_CONTENT_TYPES = frozenset({
+    CT.WML_DOCUMENT_MAIN,
+    CT.WML_HEADER,
+    CT.WML_FOOTER,
+    CT.WML_FOOTNOTES,
+    CT.WML_ENDNOTES,
+    CT.WML_COMMENTS,
+})
+# Bytes fed to the parser at a time by ``stream_fields``
+STREAM_CHUNK_SIZE = 64 * 1024
+# Cheap test, evaluated in libxml2, for parts without any placeholder
+_HAS_BRACE = etree.XPath("boolean(.//w:t[contains(., '{')])", namespaces={"w": nsmap["w"]})
+
+# (field_name, start, end) offsets into the paragraph text
+Span = Tuple[str, int, int]
+
+
+def replacement_value(field_mapping: Dict[str, Any], field_name: str) -> str:
+    """Return the text that replaces ``{field_name}`` (empty when missing or falsy)."""
+    value = field_mapping.get(field_name)
+    return str(value) if value else ""
+
+
+def _iter_runs(parent) -> Iterator[Any]:
+    """Yield the ``w:r`` children of ``parent``, entering hyperlinks and inline content controls."""
+    for child in parent.iterchildren(_W_R, _W_HYPERLINK, _W_SDT):
+        if child.tag == _W_R:
+            yield child
+        elif child.tag == _W_HYPERLINK:
+            yield from _iter_runs(child)
+        else:
+            content = child.find(_W_SDT_CONTENT)
+            if content is not None:
+                yield from _iter_runs(content)
+
+
+def paragraph_runs(p) -> List[Any]:
+    """Return the runs of a ``w:p`` element that :func:`read_paragraph` indexes."""
+    return list(_iter_runs(p))
+
+
+def read_paragraph(p) -> Tuple[List[Any], List[str], str]:
+    """Read a ``w:p`` element once.
+
+    Returns:
+        Tuple of (``w:r`` elements, their texts, paragraph text). Runs are the
+        direct ones plus those of hyperlinks and inline content controls
+        (``w:sdt``), so the paragraph text is exactly the run texts joined
+        and placeholder offsets map onto the runs.
+    """
+    runs = paragraph_runs(p)
+    texts = [run.text for run in runs]
+    return runs, texts, "".join(texts)
+
+
+def find_spans(text: str) -> List[Span]:
+    """Return every placeholder in ``text`` as ``(field_name, start, end)``."""
+    if "{" not in text:
+        return []
+    return [(m.group(1), m.start(), m.end()) for m in FIELD_PATTERN.finditer(text)]
+
+
+def plan_run_texts(texts: Sequence[str], spans: Sequence[Span], values: Sequence[str]) -> Dict[int, str]:
+    """Compute the new text of every run touched by ``spans``.
+
+    Offsets are mapped onto the runs of :func:`read_paragraph`, as the
+    legacy engine does: the first run of a span receives the text before the span
+    plus the replacement, runs fully inside the span are emptied and the last
+    run keeps only the text after the span.
+
+    Args:
+        texts: Text of each run, in document order.
+        spans: Placeholder spans sorted by start offset, not overlapping.
+        values: Replacement text for each span.
+
+    Returns:
+        Mapping of run index to its final text. Runs not in the mapping are untouched.
+    """
+    starts: List[int] = []
+    ends: List[int] = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text)
+        ends.append(offset)
+
+    pieces: Dict[int, List[str]] = {}
+    emitted: Dict[int, int] = {}
+    first = 0
+    for (_, start, end), value in zip(spans, values):
+        # first run whose end lies after the span start (ends are non-decreasing)
+        first = bisect_right(ends, start, first)
+        last = bisect_right(starts, end - 1) - 1
+        if first >= len(texts) or last < first:
+            continue
+
+        text = texts[first]
+        rel_start = max(0, start - starts[first])
+        buffer = pieces.setdefault(first, [])
+        buffer.append(text[emitted.get(first, 0):rel_start])
+        buffer.append(value)
+        if first == last:
+            emitted[first] = min(len(text), end - starts[first])
+            continue
+
+        emitted[first] = len(text)
+        for index in range(first + 1, last):
+            pieces[index] = []
+            emitted[index] = len(texts[index])
+        pieces[last] = []
+        emitted[last] = min(len(texts[last]), end - starts[last])
+
+    return {
+        index: "".join(buffer) + texts[index][emitted[index]:]
+        for index, buffer in pieces.items()
+    }
+
+
+def patch_paragraph(p, field_mapping: Dict[str, Any]) -> int:
+    """Replace every placeholder of a ``w:p`` element in one pass.
+
+    Returns:
+        Number of placeholders replaced
+    """
+    runs, texts, full_text = read_paragraph(p)
+    spans = find_spans(full_text)
+    if not spans:
+        return 0
+
+    values = [replacement_value(field_mapping, name) for name, _, _ in spans]
+    for index, new_text in plan_run_texts(texts, spans, values).items():
+        runs[index].text = new_text
+    return len(spans)
+
+
+def _in_merged_continuation(p) -> bool:
+    """True for paragraphs of the continuation cells of a vertical merge."""
+    for tc in p.iterancestors(_W_TC):
+        if tc.vMerge == ST_Merge.CONTINUE:
+            return True
+    return False
+
+
+def iter_block_paragraphs(element) -> Iterator[Any]:
+    """Yield every ``w:p`` element under ``element``, in document order.
+
+    ``element`` is a part root (``w:document``, ``w:hdr``, ``w:footnotes``...),
+    a ``w:tbl`` or a ``w:tc``. Paragraphs at any depth are included: nested
+    tables, text boxes (``w:txbxContent``) and block content controls. Each
+    ``w:tc`` is read once however many grid columns it spans, and the
+    continuation cells of a vertical merge are skipped, as ``_Row.cells`` does.
+    """
+    if element.find(_VMERGE_PATH) is None:
+        yield from element.iter(_W_P)
+        return
+    for p in element.iter(_W_P):
+        if not _in_merged_continuation(p):
+            yield p
+
+
+# Part scanning ---------------------------------------------------------------------
+
+def iter_story_parts(document) -> Iterator[Part]:
+    """Yield every part of the package that holds document text, once each.
+
+    Covers the main document, all headers and footers (default, first-page and
+    even-page), footnotes, endnotes and comments. Linked sections share their
+    header/footer part, so it is yielded a single time.
+    """
+    for part in document.part.package.iter_parts():
+        if part.content_type in STORY_CONTENT_TYPES:
+            yield part
+
+
+def story_root(part: Part) -> Optional[Any]:
+    """Return the root element of a story part, or None if it holds no ``{``.
+
+    python-docx loads footnotes and endnotes as raw blobs. Those are checked
+    for a ``{`` byte before being parsed; when they may hold a placeholder
+    they become an ``XmlPart`` in place, so edits to the returned element are
+    saved with the document.
+    """
+    if isinstance(part, XmlPart):
+        root = part.element
+        return root if _HAS_BRACE(root) else None
+    blob = part.blob
+    if b"{" not in blob:
+        return None
+    element = parse_xml(blob)
+    # same attributes as XmlPart.__init__; the blob is serialized from the element from now on
+    part.__class__ = XmlPart
+    part._element = element
+    del part._blob
+    return element
+
+
+def iter_document_paragraphs(document) -> Iterator[Any]:
+    """Yield each ``w:p`` element of the document that may hold a placeholder, once.
+
+    Every story part is scanned (see :func:`iter_story_parts`) with
+    :func:`iter_block_paragraphs`; parts without a ``{`` are skipped.
+    """
+    for part in iter_story_parts(document):
+        root = story_root(part)
+        if root is not None:
+            yield from iter_block_paragraphs(root)
+
+
+def stream_fields(blob: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Set[str]:
+    """Return the placeholder names of a story part's XML without keeping its tree.
+
+    The XML is fed to the parser ``chunk_size`` bytes at a time and the
+    paragraphs parsed so far are read and cleared after each chunk, so only
+    the open elements and emptied paragraph shells stay in memory.
+    """
+    parser = etree.XMLPullParser(events=("end",), tag=_W_P, remove_blank_text=True, resolve_entities=False)
+    parser.set_element_class_lookup(element_class_lookup)
+
+    fields: Set[str] = set()
+
+    def drain() -> None:
+        for _, p in parser.read_events():
+            if not _in_merged_continuation(p):
+                fields.update(name for name, _, _ in find_spans(read_paragraph(p)[2]))
+            # nested paragraphs (text boxes) end first, so clearing never loses text
+            p.clear(keep_tail=True)
+
+    view = memoryview(blob)
+    for start in range(0, len(view), chunk_size):
+        parser.feed(view[start:start + chunk_size].tobytes())
+        drain()
+    parser.close()
+    drain()
+    return fields
+
+
+def extract_document_fields(document) -> Set[str]:
+    """Return every placeholder name in the document's story parts.
+
+    Raw parts are streamed with :func:`stream_fields` and left unparsed.
+    """
+    fields: Set[str] = set()
+    for part in iter_story_parts(document):
+        if not isinstance(part, XmlPart):
+            if b"{" in part.blob:
+                fields |= stream_fields(part.blob)
+            continue
+        root = story_root(part)
+        if root is None:
+            continue
+        for p in iter_block_paragraphs(root):
+            fields.update(name for name, _, _ in find_spans(read_paragraph(p)[2]))
+    return fields
+
+
+def replace_in_document(document, field_mapping: Dict[str, Any]) -> int:
+    """Replace placeholders across the document with the single-pass engine.
+
+    Returns:
+        Number of placeholders replaced
+    """
+    return sum(patch_paragraph(p, field_mapping) for p in iter_document_paragraphs(document))
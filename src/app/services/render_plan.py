@@ -0,0 +1,58 @@
+"""Result of scanning a template once: fields, validation and the run patches to apply."""
+from typing import Any, List, Set, Tuple
+
+
+class RenderPlan:
+    """Everything needed to check and fill one document, from a single traversal.
+
+    Built by :meth:`TemplateProcessor.render_plan`. ``patches`` holds
+    ``(w:r element, new text)`` pairs for ``document``; :meth:`apply` writes
+    them without walking the document again.
+    """
+
+    __slots__ = (
+        "document",
+        "fields",
+        "valid_fields",
+        "invalid_fields",
+        "missing_fields",
+        "empty_fields",
+        "patches",
+        "replacement_count",
+    )
+
+    def __init__(
+        self,
+        document: Any,
+        fields: Set[str],
+        valid_fields: List[str],
+        invalid_fields: List[Tuple[str, str]],
+        missing_fields: List[str],
+        empty_fields: List[str],
+        patches: List[Tuple[Any, str]],
+        replacement_count: int,
+    ):
+        self.document = document
+        self.fields = fields
+        self.valid_fields = valid_fields
+        self.invalid_fields = invalid_fields
+        self.missing_fields = missing_fields
+        self.empty_fields = empty_fields
+        self.patches = patches
+        self.replacement_count = replacement_count
+
+    def apply(self) -> int:
+        """Write the planned run texts into ``document``.
+
+        Returns:
+            Number of placeholders replaced
+        """
+        for run, text in self.patches:
+            run.text = text
+        return self.replacement_count
+
+    def __repr__(self) -> str:
+        return (
+            f"RenderPlan(fields={len(self.fields)}, invalid={len(self.invalid_fields)}, "
+            f"missing={len(self.missing_fields)}, empty={len(self.empty_fields)}, patches={len(self.patches)})"
+        )
@@ -0,0 +1,183 @@
+"""Render many field mappings against one template, optionally in a process pool."""
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .compiled_template import CompiledTemplate, get_compiled_template
+from .template_processor import TemplateProcessor
+
+# A record is a field mapping, or a (basename, field mapping) pair
+Record = Union[Dict[str, Any], Tuple[str, Dict[str, Any]]]
+ProgressCallback = Callable[[int, Optional[int], "RenderResult"], None]
+
+
+def report_basename(patient_name: Optional[str], prefix: str = "laudo_") -> str:
+    """Return the output file name (without extension) for a patient's laudo."""
+    patient_name = (patient_name or "").strip()
+    if not patient_name:
+        return "laudo"
+    safe_name = "".join(c for c in patient_name if c.isalnum() or c in (' ', '-', '_')).strip()
+    return f"{prefix}{safe_name.replace(' ', '_')}"
+
+
+class RenderResult:
+    """Outcome of rendering one record: the output path or an error message."""
+
+    __slots__ = ("index", "output_path", "error")
+
+    def __init__(self, index: int, output_path: Optional[str], error: Optional[str] = None):
+        self.index = index
+        self.output_path = output_path
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return f"RenderResult(index={self.index!r}, output_path={self.output_path!r}, error={self.error!r})"
+
+
+# Per-process state set by the pool initializer
+_worker_template: Optional[CompiledTemplate] = None
+
+
+def _init_worker(template_path: str, blob: bytes) -> None:
+    global _worker_template
+    _worker_template = CompiledTemplate(template_path, blob=blob)
+
+
+def _render_one(index: int, output_path: str, field_mapping: Dict[str, Any],
+                compiled: Optional[CompiledTemplate] = None) -> RenderResult:
+    compiled = compiled or _worker_template
+    try:
+        document = compiled.new_document()
+        compiled.apply(field_mapping, document)
+        TemplateProcessor().save_document(document, output_path, compiled=compiled)
+    except Exception as exc:
+        return RenderResult(index, None, f"{type(exc).__name__}: {exc}")
+    return RenderResult(index, output_path)
+
+
+def _iter_jobs(records: Iterable[Record], out_dir: str) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """Assign each record a unique output path (``laudo_X``, ``laudo_X_2``, ...).
+
+    A suffixed name is never one already given to another record (``Ana``,
+    ``Ana``, ``Ana 2`` get ``laudo_Ana``, ``laudo_Ana_2``, ``laudo_Ana_2_2``).
+    Names are compared case-insensitively, as on Windows and macOS file systems.
+    """
+    taken: Set[str] = set()
+    next_suffix: Dict[str, int] = {}
+    for index, record in enumerate(records):
+        if isinstance(record, tuple):
+            basename, field_mapping = record
+        else:
+            field_mapping = record
+            basename = report_basename(field_mapping.get("patient_name"))
+        key = basename.casefold()
+        suffix = next_suffix.get(key, 1)
+        name = basename if suffix == 1 else f"{basename}_{suffix}"
+        while name.casefold() in taken:
+            suffix += 1
+            name = f"{basename}_{suffix}"
+        next_suffix[key] = suffix + 1
+        taken.add(name.casefold())
+        yield index, os.path.join(out_dir, f"{name}.docx"), field_mapping
+
+
+def iter_render(
+    template_path: str,
+    records: Iterable[Record],
+    out_dir: str,
+    *,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+) -> Iterator[RenderResult]:
+    """Render records lazily, yielding a :class:`RenderResult` per record.
+
+    Records are consumed as work is submitted, with at most ``2 * workers``
+    jobs in flight, so large or streamed inputs are never fully materialized.
+
+    Args:
+        template_path: Path to the DOCX template
+        records: Field mappings (``LaudoDataModel.get_field_mapping()`` style),
+            or (basename, mapping) pairs to choose the output file name
+        out_dir: Directory where the DOCX files are written
+        workers: Number of worker processes. None uses ``os.cpu_count()``;
+            1 renders in the calling process.
+        ordered: Yield results in input order (True) or as soon as they finish (False)
+    """
+    compiled = get_compiled_template(template_path)
+    jobs = _iter_jobs(records, out_dir)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for index, output_path, field_mapping in jobs:
+            yield _render_one(index, output_path, field_mapping, compiled)
+        return
+
+    # Workers receive the template bytes once and compile them locally
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(compiled.path, compiled.blob),
+    ) as executor:
+        window = 2 * workers
+        # ordered mode waits on the oldest job; unordered mode on whichever finishes first
+        pending: Deque[Future] = deque()
+        running: Set[Future] = set()
+
+        def fill_window() -> None:
+            while len(pending) + len(running) < window:
+                job = next(jobs, None)
+                if job is None:
+                    return
+                future = executor.submit(_render_one, *job)
+                if ordered:
+                    pending.append(future)
+                else:
+                    running.add(future)
+
+        fill_window()
+        while pending or running:
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                running.difference_update(finished)
+                for future in finished:
+                    yield future.result()
+            fill_window()
+
+
+def render_many(
+    template_path: str,
+    records: Iterable[Record],
+    out_dir: str,
+    *,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    progress: Optional[ProgressCallback] = None,
+) -> List[RenderResult]:
+    """Render many field mappings against one template.
+
+    Args:
+        template_path: Path to the DOCX template
+        records: Field mappings, or (basename, mapping) pairs
+        out_dir: Directory where the DOCX files are written
+        workers: Number of worker processes (None = ``os.cpu_count()``, 1 = in-process)
+        ordered: Return results in input order, or in completion order
+        progress: Optional callback ``progress(done, total, result)`` called after
+            each record; ``total`` is None when ``records`` has no length.
+
+    Returns:
+        One :class:`RenderResult` per record
+    """
+    total = len(records) if hasattr(records, "__len__") else None
+    results: List[RenderResult] = []
+    for result in iter_render(template_path, records, out_dir, workers=workers, ordered=ordered):
+        results.append(result)
+        if progress is not None:
+            progress(len(results), total, result)
+    return results
@@ -0,0 +1,317 @@
+"""Startup profile: import times, screen construction, loader parses and first paint.
+
+``python main.py --profile-startup[=ARQUIVO.json]`` calls :func:`start` before
+anything else is imported. Until :func:`finish`, every module import is timed
+(like ``-X importtime``, which frozen builds cannot use) and the code wrapped
+in :func:`span` is recorded. Without an active profile, :func:`span` and
+:func:`mark` do nothing. The report is a JSON-compatible dict;
+:func:`format_report` renders it as a table. This module must not import PySide6.
+"""
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+FLAG = "--profile-startup"
+
+# Imports of this package are reported per subpackage (app.services, app.views, ...)
+_APP_PACKAGE = "app"
+_SLOWEST_MODULES = 15
+# Rows of the package table in :func:`format_report` (the JSON lists every package)
+_TABLE_PACKAGES = 20
+
+
+class _TimedLoader:
+    """Wraps a module's loader only to time its ``create_module`` and ``exec_module``."""
+
+    def __init__(self, loader: Any, timer: "_ImportTimer"):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        self.timer.enter(spec.name)
+        create = getattr(self.loader, "create_module", None)
+        try:
+            return create(spec) if create is not None else None
+        except BaseException:
+            self.timer.leave(spec.name)
+            raise
+
+    def exec_module(self, module) -> None:
+        # hand the module its real loader before any of its code runs
+        module.__loader__ = module.__spec__.loader = self.loader
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.leave(module.__spec__.name)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+
+class _ImportTimer:
+    """``sys.meta_path`` finder recording the self and cumulative time of each import."""
+
+    def __init__(self):
+        self.modules: List[Tuple[str, float, float]] = []
+        self._local = threading.local()
+
+    def find_spec(self, fullname: str, path: Any = None, target: Any = None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            spec = find_spec(fullname, path, target) if find_spec is not None else None
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self, name: str) -> None:
+        # [name, start, time spent importing children]
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def leave(self, name: str) -> None:
+        stack = self._stack()
+        if not stack or stack[-1][0] != name:
+            return
+        _, start, children = stack.pop()
+        total = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += total
+        self.modules.append((name, total - children, total))
+
+
+class StartupProfile:
+    """What happened between :func:`start` and :func:`finish`."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.started_at = datetime.now()
+        # CPU used before main.py ran: interpreter (and frozen bootloader) start-up
+        self.cpu_before = time.process_time()
+        self.preloaded_modules = len(sys.modules)
+        self.imports = _ImportTimer()
+        self.spans: List[Dict[str, Any]] = []
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def report(self) -> Dict[str, Any]:
+        import app
+
+        packages: Dict[str, List[float]] = {}
+        for name, self_time, _ in self.imports.modules:
+            entry = packages.setdefault(package_of(name), [0.0, 0])
+            entry[0] += self_time
+            entry[1] += 1
+        slowest = sorted(self.imports.modules, key=lambda module: module[1], reverse=True)[:_SLOWEST_MODULES]
+        with self._lock:
+            spans = list(self.spans)
+
+        return {
+            "version": getattr(app, "__version__", None),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "cpu_before_profile_s": round(self.cpu_before, 4),
+            "preloaded_modules": self.preloaded_modules,
+            "total_s": round(self.elapsed(), 4),
+            "marks": {name: round(value, 4) for name, value in self.marks.items()},
+            "imports": {
+                "count": len(self.imports.modules),
+                "self_s": round(sum(module[1] for module in self.imports.modules), 4),
+                "packages": [
+                    {"package": package, "self_s": round(total, 4), "modules": count}
+                    for package, (total, count) in sorted(packages.items(), key=lambda item: item[1][0], reverse=True)
+                ],
+                "slowest_modules": [
+                    {"module": name, "self_s": round(self_time, 4), "cumulative_s": round(total, 4)}
+                    for name, self_time, total in slowest
+                ],
+            },
+            "screens": [_span_entry(entry) for entry in spans if entry["kind"] == "screen"],
+            "loaders": [_span_entry(entry) for entry in spans if entry["kind"] == "loader"],
+        }
+
+
+def _span_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    result = {"name": entry["name"], "start_s": round(entry["start"], 4), "duration_s": round(entry["duration"], 4)}
+    result.update(entry["details"])
+    return result
+
+
+def package_of(module: str) -> str:
+    """Package an import is reported under: the top-level package (two levels for ``app``)."""
+    parts = module.split(".")
+    if parts[0] == _APP_PACKAGE and len(parts) > 2:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+_active: Optional[StartupProfile] = None
+
+
+def start() -> StartupProfile:
+    """Start profiling this process (idempotent)."""
+    global _active
+    if _active is None:
+        _active = StartupProfile()
+        sys.meta_path.insert(0, _active.imports)
+    return _active
+
+
+def active() -> Optional[StartupProfile]:
+    return _active
+
+
+def finish() -> Optional[Dict[str, Any]]:
+    """Stop profiling and return the report (None if no profile was started)."""
+    global _active
+    profile, _active = _active, None
+    if profile is None:
+        return None
+    try:
+        sys.meta_path.remove(profile.imports)
+    except ValueError:
+        pass
+    return profile.report()
+
+
+def mark(name: str) -> None:
+    """Record when ``name`` happened (first time only), in seconds since :func:`start`."""
+    profile = _active
+    if profile is not None and name not in profile.marks:
+        profile.marks[name] = profile.elapsed()
+
+
+class _Span:
+    __slots__ = ("profile", "kind", "name", "details", "start")
+
+    def __init__(self, profile: StartupProfile, kind: str, name: str):
+        self.profile = profile
+        self.kind = kind
+        self.name = name
+        self.details: Dict[str, Any] = {}
+
+    def __enter__(self) -> Dict[str, Any]:
+        self.start = self.profile.elapsed()
+        return self.details
+
+    def __exit__(self, *exc_info) -> None:
+        entry = {"kind": self.kind, "name": self.name, "start": self.start,
+                 "duration": self.profile.elapsed() - self.start, "details": self.details}
+        with self.profile._lock:
+            self.profile.spans.append(entry)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(kind: str, name: str):
+    """Context manager timing a block as ``kind`` (``"screen"``, ``"loader"``).
+
+    It yields a dict whose items are added to the report entry.
+    """
+    profile = _active
+    return _NO_SPAN if profile is None else _Span(profile, kind, name)
+
+
+def split_argv(argv: List[str]) -> Tuple[Optional[str], List[str]]:
+    """Take ``--profile-startup[=ARQUIVO]`` out of ``argv``.
+
+    Returns:
+        (report path, "" for the default path or None without the flag; the other arguments)
+    """
+    path: Optional[str] = None
+    remaining = []
+    for arg in argv:
+        flag, _, value = arg.partition("=")
+        if flag == FLAG:
+            path = value
+        else:
+            remaining.append(arg)
+    return path, remaining
+
+
+def default_report_path() -> Path:
+    """``startup-profile-<data e hora>.json`` in the user cache dir."""
+    from .test_tables_loader import default_cache_dir
+
+    return default_cache_dir() / f"startup-profile-{datetime.now():%Y%m%d-%H%M%S}.json"
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Readable summary of a :meth:`StartupProfile.report`."""
+    def ms(seconds: Optional[float]) -> str:
+        return "-" if seconds is None else f"{seconds * 1000:9.1f} ms"
+
+    imports = report["imports"]
+    first_paint = report["marks"].get("first_paint")
+    lines = [
+        f"PsiqueLaudo {report['version']} - Python {report['python']} ({report['platform']}"
+        f"{', executável' if report['frozen'] else ''}) - {report['started_at']}",
+        f"CPU antes do main.py      {ms(report['cpu_before_profile_s'])}",
+        f"Primeira pintura          {ms(first_paint)}",
+        f"Total medido              {ms(report['total_s'])}",
+        "",
+        f"Importações: {imports['count']} módulos, {ms(imports['self_s']).strip()}",
+        f"  {'pacote':<32} {'tempo':>12} {'módulos':>8}",
+    ]
+    packages = imports["packages"]
+    lines += [f"  {entry['package']:<32} {ms(entry['self_s'])} {entry['modules']:>8}"
+              for entry in packages[:_TABLE_PACKAGES]]
+    if len(packages) > _TABLE_PACKAGES:
+        rest = packages[_TABLE_PACKAGES:]
+        lines.append(f"  {f'(mais {len(rest)} pacotes)':<32} {ms(sum(entry['self_s'] for entry in rest))} "
+                     f"{sum(entry['modules'] for entry in rest):>8}")
+    lines += ["", "Módulos mais lentos (próprio / acumulado)"]
+    lines += [f"  {entry['module']:<40} {ms(entry['self_s'])} {ms(entry['cumulative_s'])}"
+              for entry in imports["slowest_modules"]]
+    for title, key in (("Telas", "screens"), ("Carregadores", "loaders")):
+        lines += ["", f"{title} (início / duração)"]
+        entries = report[key] or [{"name": "(nenhum)", "start_s": None, "duration_s": None}]
+        for entry in entries:
+            extra = ", ".join(f"{k}={v}" for k, v in entry.items() if k not in ("name", "start_s", "duration_s"))
+            lines.append(f"  {entry['name']:<32} {ms(entry['start_s'])} {ms(entry['duration_s'])}"
+                         + (f"  ({extra})" if extra else ""))
+    return "\n".join(lines)
+
+
+def write_report(report: Dict[str, Any], path: Optional[str] = None) -> Path:
+    """Write ``report`` as JSON to ``path`` (default: :func:`default_report_path`) and
+    :func:`format_report` next to it (``.txt``).
+
+    Returns:
+        The JSON path
+    """
+    target = Path(path) if path else default_report_path()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    target.with_suffix(".txt").write_text(format_report(report) + "\n", encoding="utf-8")
+    return target
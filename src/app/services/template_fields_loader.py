@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Any
 
+from . import startup_profile
+
 
 class TemplateFieldsLoader:
     """Loads the configuration that describes non-test template placeholders."""
@@ -14,7 +16,8 @@ class TemplateFieldsLoader:
     def load_config(self) -> Dict[str, Any]:
         """Load JSON configuration that describes the editable fields."""
         if self._cache is None:
-            with self.config_path.open("r", encoding="utf-8") as fp:
+            with startup_profile.span("loader", "TemplateFieldsLoader"), \
+                    self.config_path.open("r", encoding="utf-8") as fp:
                 self._cache = json.load(fp)
         return self._cache
 
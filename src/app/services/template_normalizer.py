@@ -0,0 +1,164 @@
+"""Merge the runs Word splits templates into, so each placeholder sits in one run.
+
+Word breaks text into runs on every edit, spell-check mark and layout pass, so
+``{campo}`` often ends up as ``{``, ``campo`` and ``}`` with the same
+formatting. Normalizing a template once merges adjacent runs whose ``w:rPr``
+is identical and drops ``w:proofErr`` and ``w:lastRenderedPageBreak`` markers;
+fills then almost always patch a single run. ``python -m app.normalize``
+saves a normalized copy of a template from the command line.
+"""
+import os
+from io import BytesIO
+from typing import Any, List, Optional
+
+from docx import Document
+from docx.opc.part import XmlPart
+from docx.oxml.ns import qn
+from lxml import etree
+
+from . import placeholder_engine
+
+_W_R = qn("w:r")
+_W_RPR = qn("w:rPr")
+_W_T = qn("w:t")
+_W_PROOF_ERR = qn("w:proofErr")
+_W_LAST_PAGE_BREAK = qn("w:lastRenderedPageBreak")
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Elements whose ``w:r`` children can be merged
+_RUN_PARENTS = (qn("w:p"), qn("w:hyperlink"), qn("w:sdtContent"), qn("w:smartTag"))
+# Run content that can be moved into the previous run without changing the text
+_MERGEABLE_CONTENT = frozenset({_W_T, qn("w:tab"), qn("w:br"), qn("w:cr")})
+
+
+class NormalizationReport:
+    """What :func:`normalize_document` / :func:`normalize_template` removed."""
+
+    __slots__ = ("runs_removed", "markers_removed", "bytes_before", "bytes_after", "output_path")
+
+    def __init__(self, runs_removed: int = 0, markers_removed: int = 0, bytes_before: Optional[int] = None,
+                 bytes_after: Optional[int] = None, output_path: Optional[str] = None):
+        self.runs_removed = runs_removed
+        self.markers_removed = markers_removed
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+        self.output_path = output_path
+
+    @property
+    def bytes_removed(self) -> Optional[int]:
+        if self.bytes_before is None or self.bytes_after is None:
+            return None
+        return self.bytes_before - self.bytes_after
+
+    def __repr__(self) -> str:
+        return (
+            f"NormalizationReport(runs_removed={self.runs_removed}, markers_removed={self.markers_removed}, "
+            f"bytes_removed={self.bytes_removed!r}, output_path={self.output_path!r})"
+        )
+
+
+def _merge_key(run) -> Optional[bytes]:
+    """Canonical ``w:rPr`` of a run whose content can be merged, or None."""
+    properties = None
+    for child in run:
+        if child.tag == _W_RPR:
+            properties = child
+        elif child.tag not in _MERGEABLE_CONTENT:
+            return None
+    return b"" if properties is None else etree.tostring(properties, method="c14n")
+
+
+def _join_texts(run) -> None:
+    """Collapse consecutive ``w:t`` children of ``run`` into one."""
+    previous = None
+    for child in list(run):
+        if child.tag != _W_T:
+            previous = None
+            continue
+        if previous is None:
+            previous = child
+            continue
+        previous.text = (previous.text or "") + (child.text or "")
+        run.remove(child)
+    for child in run.iterchildren(_W_T):
+        text = child.text or ""
+        if text != text.strip():
+            child.set(_XML_SPACE, "preserve")
+
+
+def _normalize_runs(parent, report: NormalizationReport) -> None:
+    previous = previous_key = None
+    merged: List[Any] = []
+    for child in list(parent):
+        if child.tag == _W_PROOF_ERR:
+            parent.remove(child)
+            report.markers_removed += 1
+            continue
+        if child.tag != _W_R:
+            previous = previous_key = None
+            continue
+
+        for marker in child.findall(_W_LAST_PAGE_BREAK):
+            child.remove(marker)
+            report.markers_removed += 1
+
+        key = _merge_key(child)
+        if key is not None and key == previous_key:
+            for content in list(child):
+                if content.tag != _W_RPR:
+                    previous.append(content)
+            parent.remove(child)
+            report.runs_removed += 1
+            if not merged or merged[-1] is not previous:
+                merged.append(previous)
+            continue
+        previous, previous_key = (child, key) if key is not None else (None, None)
+
+    for run in merged:
+        _join_texts(run)
+
+
+def normalize_document(document) -> NormalizationReport:
+    """Normalize every story part of ``document`` in place.
+
+    Returns:
+        A report with the number of runs and markers removed
+    """
+    report = NormalizationReport()
+    for part in placeholder_engine.iter_story_parts(document):
+        # raw parts (notes) are only parsed when they may hold a placeholder
+        root = part.element if isinstance(part, XmlPart) else placeholder_engine.story_root(part)
+        if root is None:
+            continue
+        for parent in list(root.iter(*_RUN_PARENTS)):
+            _normalize_runs(parent, report)
+    return report
+
+
+def normalized_path(path: str) -> str:
+    """Default output path: ``laudo.docx`` -> ``laudo.normalized.docx``."""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.normalized{extension or '.docx'}"
+
+
+def normalize_template(path: str, output_path: Optional[str] = None) -> NormalizationReport:
+    """Save a normalized copy of the template at ``path``.
+
+    Args:
+        path: Template DOCX
+        output_path: Where to save the copy (default: :func:`normalized_path`)
+
+    Returns:
+        A report including the size of both files
+    """
+    with open(path, "rb") as fp:
+        blob = fp.read()
+    document = Document(BytesIO(blob))
+    report = normalize_document(document)
+
+    output_path = output_path or normalized_path(path)
+    document.save(output_path)
+    report.bytes_before = len(blob)
+    report.bytes_after = os.path.getsize(output_path)
+    report.output_path = output_path
+    return report
@@ -1,6 +1,5 @@
-import re
 import os
-from typing import List, Set, Dict, Optional
+from typing import Iterator, List, Set, Dict, Optional
 from docx import Document
 from docx.document import Document as DocumentType
 from docx.oxml.text.paragraph import CT_P
@@ -10,16 +9,33 @@ from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 
 from .field_validator import FieldValidator
+from . import placeholder_engine
+from . import pdf_converter
+from .compiled_template import CompiledTemplate
+from .package_writer import Target
+from .render_plan import RenderPlan
 
 
 class TemplateProcessor:
     """Processes DOCX templates for field extraction and replacement."""
     
-    FIELD_PATTERN = re.compile(r'\{([a-zA-Z0-9_]+)\}')
+    FIELD_PATTERN = placeholder_engine.FIELD_PATTERN
+
+    # Replacement engines selectable through ``engine``
+    ENGINE_LEGACY = "legacy"
+    ENGINE_SINGLE_PASS = "single_pass"
+    ENGINES = (ENGINE_LEGACY, ENGINE_SINGLE_PASS)
     
-    def __init__(self, document: Optional[Document] = None):
-        """Initialize with an optional document."""
+    def __init__(self, document: Optional[Document] = None, engine: str = ENGINE_LEGACY):
+        """Initialize with an optional document and the replacement engine to use."""
         self.document = document
+        self.engine = self._check_engine(engine)
+
+    @classmethod
+    def _check_engine(cls, engine: str) -> str:
+        if engine not in cls.ENGINES:
+            raise ValueError(f"Unknown replacement engine '{engine}'. Expected one of: {', '.join(cls.ENGINES)}")
+        return engine
     
     def set_document(self, document: Document):
         """Set the document to process."""
@@ -28,7 +44,8 @@ class TemplateProcessor:
     def extract_fields(self, document: Optional[Document] = None) -> Set[str]:
         """Extract all field names from a DOCX document.
         
-        Searches through paragraphs, tables, headers, and footers.
+        Searches every story part: body (tables, text boxes and content controls
+        included), all headers and footers, footnotes, endnotes and comments.
         
         Args:
             document: Optional document to process. If None, uses self.document.
@@ -40,42 +57,23 @@ class TemplateProcessor:
         if doc is None:
             return set()
         
-        fields = set()
-        
-        # Extract from main document paragraphs
-        for paragraph in doc.paragraphs:
-            fields.update(self._extract_from_paragraph(paragraph))
-        
-        # Extract from tables
-        for table in doc.tables:
-            fields.update(self._extract_from_table(table))
-        
-        # Extract from headers
-        for section in doc.sections:
-            header = section.header
-            for paragraph in header.paragraphs:
-                fields.update(self._extract_from_paragraph(paragraph))
-            
-            # Extract from header tables
-            for table in header.tables:
-                fields.update(self._extract_from_table(table))
-        
-        # Extract from footers
-        for section in doc.sections:
-            footer = section.footer
-            for paragraph in footer.paragraphs:
-                fields.update(self._extract_from_paragraph(paragraph))
-            
-            # Extract from footer tables
-            for table in footer.tables:
-                fields.update(self._extract_from_table(table))
+        return placeholder_engine.extract_document_fields(doc)
+    
+    @staticmethod
+    def _iter_paragraphs(doc: Document) -> Iterator[Paragraph]:
+        """Yield every paragraph of every story part that may hold a placeholder, once.
         
-        return fields
+        Linked headers/footers share one part and merged cells one ``w:tc``
+        element; both are visited a single time.
+        """
+        for p in placeholder_engine.iter_document_paragraphs(doc):
+            yield Paragraph(p, doc)
     
     def _extract_from_paragraph(self, paragraph: Paragraph) -> Set[str]:
         """Extract field names from a paragraph."""
         fields = set()
-        text = paragraph.text
+        # same text as the engines: includes hyperlinks and inline content controls
+        _, _, text = placeholder_engine.read_paragraph(paragraph._p)
         
         # Find all field patterns in the paragraph text
         matches = self.FIELD_PATTERN.findall(text)
@@ -87,25 +85,26 @@ class TemplateProcessor:
         """Extract field names from a table."""
         fields = set()
         
-        for row in table.rows:
-            for cell in row.cells:
-                # Extract from paragraphs in each cell
-                for paragraph in cell.paragraphs:
-                    fields.update(self._extract_from_paragraph(paragraph))
+        # Each cell once, including nested tables
+        for p in placeholder_engine.iter_block_paragraphs(table._tbl):
+            fields.update(self._extract_from_paragraph(Paragraph(p, table)))
         
         return fields
     
-    def validate_fields(self, document: Optional[Document] = None) -> tuple:
+    def validate_fields(self, document: Optional[Document] = None, fields: Optional[Set[str]] = None) -> tuple:
         """Validate all fields in the document against naming convention.
         
         Args:
             document: Optional document to process. If None, uses self.document.
+            fields: Optional field names already extracted (e.g. ``CompiledTemplate.fields``).
+                If given, the document is not traversed again.
             
         Returns:
             Tuple of (valid_fields, invalid_fields_with_reasons)
         """
-        fields = self.extract_fields(document)
-        return FieldValidator.validate_fields(list(fields))
+        if fields is None:
+            fields = self.extract_fields(document)
+        return FieldValidator.validate_fields(fields)
     
     def check_required_fields(self, field_names: Set[str], available_data: Dict[str, str]) -> tuple:
         """Check if all required fields have data.
@@ -128,7 +127,60 @@ class TemplateProcessor:
         
         return missing_fields, empty_fields
     
-    def replace_fields(self, field_mapping: Dict[str, str], document: Optional[Document] = None) -> Document:
+    def render_plan(self, document: Optional[Document], field_mapping: Dict[str, str],
+                    compiled: Optional[CompiledTemplate] = None) -> RenderPlan:
+        """Scan the document once and return everything needed to fill it.
+
+        The plan holds the field set, the validation result, the missing and
+        empty fields for ``field_mapping`` and the run patches, so callers do
+        not need ``extract_fields``, ``validate_fields``,
+        ``check_required_fields`` and ``replace_fields`` to each walk the tree.
+        Patches follow the single-pass engine.
+
+        Args:
+            document: Document to fill. If None, uses self.document.
+            field_mapping: Dictionary mapping field names to replacement values
+            compiled: Optional compiled template ``document`` was copied from;
+                its recorded placeholder positions replace the traversal.
+
+        Returns:
+            A :class:`RenderPlan`; apply it with ``replace_fields(..., plan=plan)``
+        """
+        doc = document or self.document
+        if doc is None:
+            raise ValueError("No document provided for render plan")
+
+        fields: Set[str] = set()
+        patches = []
+        replacement_count = 0
+
+        def add(runs, texts, spans) -> None:
+            nonlocal replacement_count
+            names = [name for name, _, _ in spans]
+            fields.update(names)
+            values = [placeholder_engine.replacement_value(field_mapping, name) for name in names]
+            for index, new_text in placeholder_engine.plan_run_texts(texts, spans, values).items():
+                patches.append((runs[index], new_text))
+            replacement_count += len(spans)
+
+        if compiled is not None:
+            for site, p in compiled.locate(doc):
+                add(placeholder_engine.paragraph_runs(p), site.run_texts, site.spans)
+        else:
+            for p in placeholder_engine.iter_document_paragraphs(doc):
+                runs, texts, full_text = placeholder_engine.read_paragraph(p)
+                spans = placeholder_engine.find_spans(full_text)
+                if spans:
+                    add(runs, texts, spans)
+
+        valid_fields, invalid_fields = FieldValidator.validate_fields(fields)
+        missing_fields, empty_fields = self.check_required_fields(sorted(fields), field_mapping)
+        return RenderPlan(doc, fields, valid_fields, invalid_fields, missing_fields, empty_fields,
+                          patches, replacement_count)
+
+    def replace_fields(self, field_mapping: Dict[str, str], document: Optional[Document] = None,
+                       engine: Optional[str] = None, compiled: Optional[CompiledTemplate] = None,
+                       plan: Optional[RenderPlan] = None) -> Document:
         """Replace all field placeholders in the document with actual values.
         
         Preserves formatting by handling fields that may be split across multiple runs.
@@ -136,6 +188,13 @@ class TemplateProcessor:
         Args:
             field_mapping: Dictionary mapping field names (without braces) to replacement values
             document: Optional document to process. If None, uses self.document.
+            engine: Optional engine override (``"legacy"`` or ``"single_pass"``).
+                If None, uses self.engine. Both engines produce the same XML.
+            compiled: Optional compiled template the document was copied from
+                (via ``CompiledTemplate.new_document``). Its precomputed patches
+                are applied instead of traversing the document.
+            plan: Optional plan from :meth:`render_plan` for this document and
+                mapping; its patches are applied directly.
             
         Returns:
             The document with fields replaced (modifies in place)
@@ -143,47 +202,30 @@ class TemplateProcessor:
         doc = document or self.document
         if doc is None:
             raise ValueError("No document provided for field replacement")
+
+        if plan is not None:
+            if plan.document is not doc:
+                raise ValueError("Render plan was built for a different document")
+            replacement_count = plan.apply()
+            print(f"Replaced {replacement_count} field occurrences in document")
+            return doc
+
+        if compiled is not None:
+            replacement_count = compiled.apply(field_mapping, doc)
+            print(f"Replaced {replacement_count} field occurrences in document")
+            return doc
+
+        engine = self._check_engine(engine) if engine else self.engine
+        if engine == self.ENGINE_SINGLE_PASS:
+            replacement_count = placeholder_engine.replace_in_document(doc, field_mapping)
+            print(f"Replaced {replacement_count} field occurrences in document")
+            return doc
         
         replacement_count = 0
         
-        # Replace in main document paragraphs
-        for paragraph in doc.paragraphs:
-            count = self._replace_in_paragraph(paragraph, field_mapping)
-            replacement_count += count
-        
-        # Replace in tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        count = self._replace_in_paragraph(paragraph, field_mapping)
-                        replacement_count += count
-        
-        # Replace in headers
-        for section in doc.sections:
-            header = section.header
-            for paragraph in header.paragraphs:
-                count = self._replace_in_paragraph(paragraph, field_mapping)
-                replacement_count += count
-            for table in header.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            count = self._replace_in_paragraph(paragraph, field_mapping)
-                            replacement_count += count
-        
-        # Replace in footers
-        for section in doc.sections:
-            footer = section.footer
-            for paragraph in footer.paragraphs:
-                count = self._replace_in_paragraph(paragraph, field_mapping)
-                replacement_count += count
-            for table in footer.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            count = self._replace_in_paragraph(paragraph, field_mapping)
-                            replacement_count += count
+        # Every story part (body, headers/footers, notes, comments), once
+        for paragraph in self._iter_paragraphs(doc):
+            replacement_count += self._replace_in_paragraph(paragraph, field_mapping)
         
         print(f"Replaced {replacement_count} field occurrences in document")
         return doc
@@ -194,8 +236,9 @@ class TemplateProcessor:
         Returns:
             Number of fields replaced
         """
-        # Get full paragraph text to find field positions
-        full_text = paragraph.text
+        # Get full paragraph text to find field positions; the runs of
+        # hyperlinks and inline content controls count, as in the single-pass engine
+        _, _, full_text = placeholder_engine.read_paragraph(paragraph._p)
         
         # Find all field matches with their positions
         matches = list(self.FIELD_PATTERN.finditer(full_text))
@@ -229,7 +272,7 @@ class TemplateProcessor:
         runs_data = []
         current_pos = 0
         
-        for run in paragraph.runs:
+        for run in placeholder_engine.paragraph_runs(paragraph._p):
             run_text = run.text
             run_start = current_pos
             run_end = current_pos + len(run_text)
@@ -278,38 +321,65 @@ class TemplateProcessor:
             Number of fields replaced
         """
         count = 0
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    count += self._replace_in_paragraph(paragraph, field_mapping)
+        for p in placeholder_engine.iter_block_paragraphs(table._tbl):
+            count += self._replace_in_paragraph(Paragraph(p, table), field_mapping)
         return count
     
-    def save_document(self, document: Document, output_path: str) -> str:
+    def save_document(self, document: Document, output_path: Target,
+                      compiled: Optional[CompiledTemplate] = None) -> Target:
         """Save the document to a file.
         
         Args:
             document: The document to save
-            output_path: Full path including filename and .docx extension
+            output_path: Full path including filename and .docx extension, or an
+                open file descriptor or binary file object (e.g. ``BytesIO``)
+            compiled: Optional compiled template the document was copied from.
+                Only the changed XML parts are then written; media and other
+                untouched entries are copied from the template still compressed.
             
         Returns:
-            The path where the document was saved
+            The path (or file) where the document was saved
         """
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
-        
-        document.save(output_path)
+        if isinstance(output_path, (str, os.PathLike)):
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        
+        if compiled is not None:
+            compiled.save(document, output_path)
+        elif isinstance(output_path, int):
+            with open(output_path, "wb", closefd=False) as fp:
+                document.save(fp)
+        else:
+            document.save(output_path)
         return output_path
     
-    def convert_to_pdf(self, docx_path: str, pdf_path: Optional[str] = None) -> str:
+    def convert_to_pdf(self, docx_path: str, pdf_path: Optional[str] = None,
+                       backend: Optional[str] = None) -> str:
         """Convert a DOCX file to PDF.
         
         Args:
             docx_path: Path to the DOCX file
             pdf_path: Optional path for PDF output. If None, uses same name with .pdf extension
+            backend: ``"docx2pdf"`` (Microsoft Word), ``"libreoffice"`` (one
+                ``soffice`` process per call) or ``"libreoffice-pool"`` (warm
+                processes, see :mod:`pdf_converter`). If None, uses
+                :func:`pdf_converter.default_backend`.
             
         Returns:
             The path where the PDF was saved
         """
+        backend = backend or pdf_converter.default_backend()
+        if backend not in pdf_converter.BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        
+        if pdf_path is None:
+            pdf_path = pdf_converter.default_pdf_path(docx_path)
+        
+        if backend == pdf_converter.BACKEND_LIBREOFFICE:
+            return pdf_converter.convert_cold(docx_path, pdf_path)
+        if backend == pdf_converter.BACKEND_LIBREOFFICE_POOL:
+            return pdf_converter.get_converter_pool().convert(docx_path, pdf_path)
+        
         try:
             from docx2pdf import convert
         except ImportError:
@@ -318,9 +388,6 @@ class TemplateProcessor:
                 "Install it with: pip install docx2pdf"
             )
         
-        if pdf_path is None:
-            pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
-        
         # Ensure directory exists
         os.makedirs(os.path.dirname(pdf_path) if os.path.dirname(pdf_path) else '.', exist_ok=True)
         
@@ -1,249 +1,444 @@
 """Classification helpers for psychological test results."""
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Iterable, Callable, List
-
+import warnings
+from typing import Any, Dict, Optional, Iterable, Callable, List, Mapping, Sequence, Tuple
+
+from . import field_graph
+from .field_graph import FieldGraph, FieldNode
+from .interval_index import IntervalIndex
+from .narrative_template import CLASSIFICATION, COMPLEMENT, NarrativeTemplate, compile_options
+from .norm_table import NormTable
 from .test_tables_loader import TestTablesLoader
 
+# Rule lists compiled into an IntervalIndex for each table
+RULE_KEYS = ("classificacoes", "classificacoes_pp")
 
-class TestResultClassifier:
-    """Apply interval-based classifications to raw test scores.
+# Fills ``[COMPLEMENTO AQUI]`` when the field declares no ``complemento``
+DEFAULT_COMPLEMENT = "resultados compatíveis com a pontuação obtida"
 
-    The classifier reads JSON tables from ``src/app/data`` via ``TestTablesLoader``
-    and exposes a single method, :meth:`classify_results`, that augments a raw
-    result mapping with human-readable interpretation strings expected by the
-    DOCX templates (e.g. ``QIT_out``).
-    """
+# Marks a key that is absent from a record (as opposed to present with None)
+_MISSING = object()
 
-    def __init__(self, loader: Optional[TestTablesLoader] = None):
-        self._loader = loader or TestTablesLoader()
-        self._tables = self._loader.load_all()
-
-    # Public API -----------------------------------------------------------------
-    def classify_results(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """Return ``results`` plus any derived classification fields."""
-        if not isinstance(results, dict) or not results:
-            return results
+# How a node's result is written to the results (see ``_apply_writes``)
+_IF_EMPTY = "if_empty"
+_IF_ABSENT = "if_absent"
 
-        augmented = dict(results)
+# Writes produced by one node: (mode, field, value or column)
+Writes = List[Tuple[str, str, Any]]
 
-        self._apply_wisc(augmented, results)
-        self._apply_ravlt(augmented, results)
-        self._apply_bpa(augmented, results)
-        self._apply_fdt(augmented, results)
-        self._apply_srs(augmented, results)
-        self._apply_etdah(augmented, results)
-        self._apply_cars(augmented, results)
-        self._apply_neupsilin(augmented, results)
 
-        return augmented
+class _ColumnBatch:
+    """Source and target columns shared by the columnar helpers."""
 
-    # Helpers --------------------------------------------------------------------
-    def _apply_wisc(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "wisc"
-        if table_key not in self._tables:
-            return
-
-        prefixes = ("QIT", "ICV", "IOP", "IMO", "IVP")
-        scores: Dict[str, Optional[float]] = {
-            prefix: self._to_number(source.get(f"{prefix}_WISC"))
-            for prefix in prefixes
-        }
-
-        if scores.get("QIT") is None:
-            components = [scores[p] for p in ("ICV", "IOP", "IMO", "IVP") if scores.get(p) is not None]
-            if components:
-                scores["QIT"] = sum(components) / len(components)
-                if "QIT_WISC" not in target:
-                    target["QIT_WISC"] = int(round(scores["QIT"]))
-
-        for prefix in prefixes:
-            score = scores.get(prefix)
-            if score is None:
-                continue
-
-            classification = self._classify_value(
-                table_key,
-                score,
-                classification_key="classificacoes_pp",
-                postprocess=self._strip_pontuacao_prefix,
-            )
-            if classification is None:
-                continue
-
-            self._store_if_empty(target, f"{prefix}_out", classification)
-
-            descriptive = self._build_wisc_text(prefix, classification)
-            if descriptive:
-                field_name = "QIT_conclusao" if prefix == "QIT" else f"{prefix}_text_out"
-                self._store_if_empty(target, field_name, descriptive)
-
-        subtests = {
-            "DIGS_WISC": "DIGS_out",
-            "SNL_WISC": "SNL_out",
-            "ARIT_WISC": "ARIT_out",
-            "SEME_WISC": "SEME_out",
-            "RV_WISC": "RV_out",
-            "RNV_WISC": "RNV_out",
-            "CUBE_WISC": "CUBE_out",
-            "VP_WISC": "VP_out",
-        }
-
-        for raw_field, out_field in subtests.items():
-            raw_score = self._to_number(source.get(raw_field))
-            if raw_score is None:
-                continue
+    def __init__(self, source: Dict[str, List[Any]], size: int):
+        self.source = source
+        self.size = size
+        # columns are copied the first time they are written
+        self.target: Dict[str, List[Any]] = dict(source)
+        self.written: Dict[str, None] = {}
 
-            classification = self._classify_value(
-                table_key,
-                raw_score,
-                classification_key="classificacoes_pp",
-                postprocess=self._strip_pontuacao_prefix,
-            )
+    def raw(self, key: str) -> List[Any]:
+        """Column ``key`` as ``source.get(key)`` would see it (None where absent)."""
+        column = self.source.get(key)
+        if column is None:
+            return [None] * self.size
+        return [None if value is _MISSING else value for value in column]
 
-            if classification is None:
-                continue
+    def numbers(self, key: str) -> List[Optional[float]]:
+        return [TestResultClassifier._to_number(value) for value in self.raw(key)]
 
-            self._store_if_empty(target, out_field, classification)
+    def _writable(self, key: str) -> List[Any]:
+        if key not in self.written:
+            column = self.target.get(key)
+            self.target[key] = list(column) if column is not None else [_MISSING] * self.size
+            self.written[key] = None
+        return self.target[key]
 
-    def _apply_ravlt(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "ravlt"
-        if table_key not in self._tables:
+    def store_if_empty(self, key: str, values: Sequence[Any]) -> None:
+        """Columnar ``_store_if_empty``; None in ``values`` means "nothing to store"."""
+        if all(value is None for value in values):
             return
-
-        prefixes = ("IP", "IR", "VE", "ETM", "ALT")
-        for prefix in prefixes:
-            percentile = self._to_number(source.get(f"{prefix}_RAVLT"))
-            if percentile is None:
-                continue
-            classification = self._classify_value(table_key, percentile)
-            if classification is None:
+        column = self._writable(key)
+        for index, value in enumerate(values):
+            if value is None:
                 continue
-            self._store_if_empty(target, f"{prefix}_out", classification)
+            current = column[index]
+            if current is _MISSING or current is None or (isinstance(current, str) and current.strip() == ""):
+                column[index] = value
 
-    def _apply_bpa(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "bpa"
-        if table_key not in self._tables:
+    def set_if_absent(self, key: str, values: Sequence[Any]) -> None:
+        """Columnar ``if key not in target: target[key] = value``."""
+        if all(value is None for value in values):
             return
+        column = self._writable(key)
+        for index, value in enumerate(values):
+            if value is not None and column[index] is _MISSING:
+                column[index] = value
 
-        mapping = {
-            "AG_BPA": "AG_conclusao",
-            "AA_BPA": "AA_out",
-            "AC_BPA": "AC_out",
-            "AD_BPA": "AD_out",
-        }
-
-        values = dict(source)
-        raw_general = self._to_number(values.get("AG_BPA"))
-        generated_general = False
-        if raw_general is None:
-            components = [
-                self._to_number(values.get(key))
-                for key in ("AC_BPA", "AD_BPA", "AA_BPA")
-            ]
-            components = [value for value in components if value is not None]
-            if components:
-                raw_general = sum(components) / len(components)
-                values["AG_BPA"] = raw_general
-                generated_general = True
-
-        for raw_field, result_field in mapping.items():
-            raw_value = values.get(raw_field)
-            percentile = self._to_number(raw_value)
-            if percentile is None:
-                continue
-            classification = self._classify_value(table_key, percentile)
-            if classification is None:
-                continue
-            self._store_if_empty(target, result_field, classification)
-            if raw_field == "AG_BPA":
-                self._store_if_empty(target, "AG_out", classification)
-                if generated_general and "AG_BPA" not in target:
-                    target["AG_BPA"] = int(round(percentile))
-                if raw_value is not None and "AG_pontuacao" not in target:
-                    formatted = int(round(percentile)) if isinstance(percentile, float) else raw_value
-                    target["AG_pontuacao"] = formatted
-
-    def _apply_fdt(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "fdt"
-        if table_key not in self._tables:
-            return
 
-        mapping = {
-            "CI_FDT": "CI_out",
-            "FC_FDT": "FC_out",
-        }
-
-        for raw_field, result_field in mapping.items():
-            percentile = self._to_number(source.get(raw_field))
-            if percentile is None:
-                continue
-            classification = self._classify_value(table_key, percentile)
-            if classification is None:
-                continue
-            self._store_if_empty(target, result_field, classification)
+class TestResultClassifier:
+    """Apply interval-based classifications to raw test scores.
 
-    def _apply_srs(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "srs"
-        if table_key not in self._tables:
-            return
+    The classifier reads JSON tables from ``src/app/data`` via ``TestTablesLoader``
+    and exposes a single method, :meth:`classify_results`, that augments a raw
+    result mapping with human-readable interpretation strings expected by the
+    DOCX templates (e.g. ``QIT_out``).
 
-        raw_score = self._to_number(source.get("SRS_ESCORE_TOTAL"))
-        if raw_score is None:
-            return
+    What is derived and classified is declared in the ``campos`` list of each
+    table (see :mod:`field_graph`); the graph is sorted and indexed once here,
+    and only the nodes reading a field present in the results are evaluated.
+    :meth:`session` returns a :class:`ClassificationSession` that also skips
+    the nodes whose inputs did not change since its previous call.
+    """
 
-        classification = self._classify_value(table_key, raw_score)
-        if classification is None:
-            return
+    def __init__(self, loader: Optional[TestTablesLoader] = None):
+        self._loader = loader or TestTablesLoader()
+        self._tables = self._loader.load_all()
+        self._indexes = self._compile_tables(self._tables)
+        self._norms = self._compile_norms(self._tables)
+        self._graph = self._compile_graph(self._tables)
+        self._norm_dispatch = self._compile_norm_dispatch(self._norms)
+        self._piece_texts_cache: Dict[Tuple[int, Optional[str], Any], List[Optional[str]]] = {}
+        self._narratives = {
+            table_key: compile_options(table.get("opcoes_texto_analise"))
+            for table_key, table in self._tables.items()
+            if isinstance(table, dict)
+        }
+        self._analysis_text_cache: Dict[Tuple[Any, ...], Optional[str]] = {}
 
-        for field_name in ("SRS_ESCORE_T_FAIXA", "SRS_NIVEL"):
-            self._store_if_empty(target, field_name, classification)
+    # Public API -----------------------------------------------------------------
+    def classify_results(self, results: Dict[str, Any], age: Any = None) -> Dict[str, Any]:
+        """Return ``results`` plus any derived classification fields.
+
+        Args:
+            results: Raw test results
+            age: Patient age in years, used by the ``normas`` tables to convert
+                raw scores. Defaults to ``results["patient_crono_age"]``.
+        """
+        return self._classify(results, age)
+
+    def session(self) -> "ClassificationSession":
+        """Return a :class:`ClassificationSession` for one evaluation."""
+        return ClassificationSession(self)
+
+    def analysis_text(self, table_key: str, option_key: str, classification: Optional[str] = None,
+                      complement: Optional[str] = None, lead: bool = False, option: int = 0) -> Optional[str]:
+        """Fill one ``opcoes_texto_analise`` text of a table.
+
+        Args:
+            table_key: Table name (e.g. ``"wisc"``, ``"htp"``)
+            option_key: Key in ``opcoes_texto_analise`` (e.g. ``"ICV_text_out"``)
+            classification: Text for ``[CLASSIFICAÇÃO AQUI]``
+            complement: Text for ``[COMPLEMENTO AQUI]`` (default: ``DEFAULT_COMPLEMENT``)
+            lead: Start the text with ``"<classification>. "``
+            option: Which of the option texts to use
+
+        Returns:
+            The text, or None when the option does not exist or is empty.
+            Results are memoized: there are few options and classifications.
+        """
+        key = (table_key, option_key, classification, complement, lead, option)
+        try:
+            return self._analysis_text_cache[key]
+        except KeyError:
+            pass
+
+        templates = self._narratives.get(table_key, {}).get(option_key, ())
+        template: Optional[NarrativeTemplate] = templates[option] if 0 <= option < len(templates) else None
+        text = None
+        if template is not None:
+            values = {COMPLEMENT: complement or DEFAULT_COMPLEMENT}
+            if classification is not None:
+                values[CLASSIFICATION] = classification
+            text = template.render(values)
+            if lead and classification is not None:
+                text = f"{classification}. {text}" if text else classification
+            text = text or None
+        self._analysis_text_cache[key] = text
+        return text
+
+    def classify_many(self, records: Iterable[Dict[str, Any]],
+                      ages: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """Classify many result mappings at once.
+
+        Returns the same as ``[self.classify_results(r, age) for r, age in zip(records, ages)]``,
+        but each score field is classified for every record in one vectorized lookup.
+        """
+        records = list(records)
+        if ages is not None and len(ages) != len(records):
+            raise ValueError("ages must have one entry per record")
+        rows = [index for index, record in enumerate(records) if isinstance(record, dict) and record]
+
+        keys: Dict[str, None] = {}
+        for index in rows:
+            keys.update(dict.fromkeys(records[index]))
+        columns = {key: [records[index].get(key, _MISSING) for index in rows] for key in keys}
+
+        batch = self._classify_columns(columns, len(rows), None if ages is None else [ages[index] for index in rows])
+
+        results = list(records)
+        for position, index in enumerate(rows):
+            row = dict(records[index])
+            for key in batch.written:
+                value = batch.target[key][position]
+                if value is not _MISSING:
+                    row[key] = value
+            results[index] = row
+        return results
+
+    def classify_frame(self, columns: Mapping[str, Sequence[Any]],
+                       ages: Optional[Sequence[Any]] = None) -> Dict[str, List[Any]]:
+        """Classify columnar results, e.g. ``{"QIT_WISC": [...], "AC_BPA": [...]}``.
+
+        Row ``i`` of the output matches ``classify_results`` applied to row ``i``
+        of ``columns``. NumPy arrays and pandas Series are accepted (they are
+        converted with ``tolist()``).
+
+        Args:
+            columns: Mapping of field name to a sequence of raw values; every
+                column must have the same length
+            ages: Optional patient age per row (defaults to the
+                ``patient_crono_age`` column, if any)
+
+        Returns:
+            The input columns plus the derived ones (``*_out``, ``QIT_WISC``, ...)
+            as lists, with None where a derived field does not apply
+        """
+        data = {
+            key: list(column.tolist() if hasattr(column, "tolist") else column)
+            for key, column in columns.items()
+        }
+        if ages is not None:
+            ages = list(ages.tolist() if hasattr(ages, "tolist") else ages)
+        lengths = {len(column) for column in data.values()}
+        if len(lengths) > 1 or (ages is not None and lengths and len(ages) not in lengths):
+            raise ValueError("All columns must have the same length")
 
-    def _apply_etdah(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "etdah"
-        if table_key not in self._tables:
-            return
+        batch = self._classify_columns(data, lengths.pop() if lengths else 0, ages)
+        for key in batch.written:
+            batch.target[key] = [None if value is _MISSING else value for value in batch.target[key]]
+        return batch.target
 
-        prefixes = ("F1", "F2", "F3", "F4", "TOTAL")
-        for prefix in prefixes:
-            raw_value = source.get(f"{prefix}_ETDAH")
-            if raw_value is None and prefix == "TOTAL":
-                # alguns templates usam ETADH por engano
-                raw_value = source.get("TOTAL_ETADH")
-            percentile = self._to_number(raw_value)
-            if percentile is None:
+    # Helpers --------------------------------------------------------------------
+    def _norms_for(self, fields: Iterable[str]) -> List[NormTable]:
+        """Norm tables whose raw score field is among ``fields``, in table order."""
+        if not self._norms:
+            return []
+        dispatch = self._norm_dispatch
+        positions = {position for field in fields for position in dispatch.get(field, ())}
+        return [self._norms[position] for position in sorted(positions)]
+
+    def _apply_norms(self, target: Dict[str, Any], source: Dict[str, Any], age: Any) -> bool:
+        """Convert raw scores with the age-banded ``normas`` tables.
+
+        Returns:
+            True if any normed score was found
+        """
+        age_value = self._to_number(age)
+        if age_value is None or not self._norms:
+            return False
+
+        applied = False
+        for norm in self._norms_for(source):
+            raw_score = self._to_number(source.get(norm.input_field))
+            if raw_score is None:
                 continue
-            classification = self._classify_value(table_key, percentile)
-            if classification is None:
+            value = norm.lookup(age_value, raw_score)
+            if value is None:
                 continue
-            self._store_if_empty(target, f"{prefix}_out", classification)
+            self._store_if_empty(target, norm.output_field, value)
+            applied = True
+        return applied
+
+    def _classify(self, results: Dict[str, Any], age: Any = None,
+                  memo: Optional[List[Optional[Tuple[Tuple[Any, ...], Tuple[Any, Writes]]]]] = None) -> Dict[str, Any]:
+        """``classify_results``; with ``memo`` (one slot per graph node), a node whose
+        inputs equal the ones memoized for it reuses its previous result."""
+        if not isinstance(results, dict) or not results:
+            return results
 
-    def _apply_cars(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "cars"
-        if table_key not in self._tables:
-            return
+        augmented = dict(results)
 
-        raw_score = self._to_number(source.get("CARS_PONTUACAO"))
-        if raw_score is None:
-            return
+        source = results
+        if age is None:
+            age = results.get("patient_crono_age")
+        if self._apply_norms(augmented, results, age):
+            # normed scores are classified like scores typed in by the user
+            source = dict(augmented)
+
+        derived: Dict[str, Any] = {}
+
+        def value(field: str) -> Any:
+            found = derived.get(field, _MISSING)
+            return source.get(field) if found is _MISSING else found
+
+        # only the nodes reading a field present in the results (and the ones after them) run
+        nodes = self._graph.nodes
+        for position in self._graph.active(source):
+            node = nodes[position]
+            if memo is None:
+                result = self._evaluate_node(node, value)
+            else:
+                inputs = tuple(value(field) for field in node.reads)
+                cached = memo[position]
+                if cached is not None and cached[0] == inputs:
+                    result = cached[1]
+                else:
+                    result = self._evaluate_node(node, value)
+                    memo[position] = (inputs, result)
+
+            derived_value, writes = result
+            if derived_value is not _MISSING:
+                derived[node.output] = derived_value
+            self._apply_writes(augmented, writes)
 
-        classification = self._classify_value(table_key, raw_score, text_key="interpretacao")
+        return augmented
+
+    def _evaluate_node(self, node: FieldNode, value: Callable[[str], Any]) -> Tuple[Any, Writes]:
+        """Evaluate ``node`` for one record.
+
+        Returns:
+            (derived value or ``_MISSING``, writes to apply to the results)
+        """
+        if node.kind == field_graph.MEAN:
+            if self._to_number(value(node.output)) is not None:
+                return _MISSING, []
+            numbers = [number for number in (self._to_number(value(field)) for field in node.inputs)
+                       if number is not None]
+            if not numbers:
+                return _MISSING, []
+            mean = sum(numbers) / len(numbers)
+            return mean, [(_IF_ABSENT, node.output, int(round(mean)))] if node.store else []
+
+        if node.kind == field_graph.FIRST:
+            if value(node.output) is not None:
+                return _MISSING, []
+            for field in node.inputs:
+                found = value(field)
+                if found is not None:
+                    return found, [(_IF_ABSENT, node.output, found)] if node.store else []
+            return _MISSING, []
+
+        score = self._to_number(value(node.inputs[0]))
+        if score is None:
+            return _MISSING, []
+        classification = self._classify_value(
+            node.table,
+            score,
+            classification_key=node.rules,
+            text_key=node.text_key,
+            postprocess=POSTPROCESSORS.get(node.postprocess),
+        )
         if classification is None:
-            return
-        self._store_if_empty(target, "CARS_INTERPRETACAO", classification)
+            return _MISSING, []
 
-    def _apply_neupsilin(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
-        table_key = "neupsilin"
-        if table_key not in self._tables:
+        writes: Writes = [(_IF_EMPTY, field, classification) for field in node.outputs]
+        if node.analysis_output:
+            descriptive = self._analysis_text_for(node, classification)
+            if descriptive:
+                writes.append((_IF_EMPTY, node.analysis_output, descriptive))
+        writes.extend((_IF_ABSENT, field, int(round(score))) for field in node.score_fields)
+        return _MISSING, writes
+
+    def _apply_writes(self, target: Dict[str, Any], writes: Writes) -> None:
+        for mode, field, value in writes:
+            if mode == _IF_EMPTY:
+                self._store_if_empty(target, field, value)
+            elif field not in target:
+                target[field] = value
+
+    # Columnar helpers (same rules as the row helpers above) --------------------
+    def _classify_columns(self, columns: Dict[str, List[Any]], size: int,
+                          ages: Optional[List[Any]] = None) -> _ColumnBatch:
+        batch = _ColumnBatch(columns, size)
+        if not size:
+            return batch
+
+        self._apply_norms_columns(batch, ages)
+        derived: Dict[str, List[Any]] = {}
+
+        def column(field: str) -> List[Any]:
+            return derived[field] if field in derived else batch.raw(field)
+
+        nodes = self._graph.nodes
+        for position in self._graph.active(batch.source):
+            node = nodes[position]
+            derived_column, writes = self._evaluate_node_columns(node, column, size)
+            if derived_column is not None:
+                derived[node.output] = derived_column
+            for mode, field, values in writes:
+                if mode == _IF_EMPTY:
+                    batch.store_if_empty(field, values)
+                else:
+                    batch.set_if_absent(field, values)
+        return batch
+
+    def _evaluate_node_columns(self, node: FieldNode, column: Callable[[str], List[Any]],
+                               size: int) -> Tuple[Optional[List[Any]], Writes]:
+        """Columnar ``_evaluate_node``: None in a written column means "nothing to write"."""
+        if node.kind in (field_graph.MEAN, field_graph.FIRST):
+            values = list(column(node.output))
+            stored: List[Any] = [None] * size
+            if node.kind == field_graph.MEAN:
+                inputs = [[self._to_number(item) for item in column(field)] for field in node.inputs]
+                for row in range(size):
+                    if self._to_number(values[row]) is not None:
+                        continue
+                    numbers = [numbers_column[row] for numbers_column in inputs if numbers_column[row] is not None]
+                    if numbers:
+                        values[row] = sum(numbers) / len(numbers)
+                        stored[row] = int(round(values[row]))
+            else:
+                inputs = [column(field) for field in node.inputs]
+                for row in range(size):
+                    if values[row] is not None:
+                        continue
+                    values[row] = stored[row] = next(
+                        (input_column[row] for input_column in inputs if input_column[row] is not None), None
+                    )
+            return values, [(_IF_ABSENT, node.output, stored)] if node.store else []
+
+        numbers = [self._to_number(item) for item in column(node.inputs[0])]
+        classifications = self._classify_column(
+            node.table,
+            numbers,
+            classification_key=node.rules,
+            text_key=node.text_key,
+            postprocess=POSTPROCESSORS.get(node.postprocess),
+        )
+        writes: Writes = [(_IF_EMPTY, field, classifications) for field in node.outputs]
+        if node.analysis_output:
+            texts = {c: self._analysis_text_for(node, c) for c in set(classifications) if c is not None}
+            writes.append((_IF_EMPTY, node.analysis_output,
+                           [texts.get(c) if c is not None else None for c in classifications]))
+        for field in node.score_fields:
+            writes.append((_IF_ABSENT, field, [
+                int(round(number)) if classification is not None else None
+                for number, classification in zip(numbers, classifications)
+            ]))
+        return None, writes
+
+    def _apply_norms_columns(self, batch: _ColumnBatch, ages: Optional[List[Any]]) -> None:
+        if not self._norms:
             return
 
-        percentile = self._to_number(source.get("TASK_NEUP"))
-        if percentile is None:
-            return
-        classification = self._classify_value(table_key, percentile)
-        if classification is None:
-            return
-        self._store_if_empty(target, "TASK_out", classification)
+        row_ages = batch.raw("patient_crono_age")
+        if ages is not None:
+            row_ages = [row if age is None else age for age, row in zip(ages, row_ages)]
+        age_numbers = [self._to_number(age) for age in row_ages]
+
+        applied = False
+        for norm in self._norms_for(batch.source):
+            values = [
+                norm.lookup(age, raw) if age is not None and raw is not None else None
+                for age, raw in zip(age_numbers, batch.numbers(norm.input_field))
+            ]
+            if any(value is not None for value in values):
+                batch.store_if_empty(norm.output_field, values)
+                applied = True
+        if applied:
+            batch.source = dict(batch.target)
 
     # Low-level utilities --------------------------------------------------------
     def _classify_value(
@@ -255,56 +450,150 @@ class TestResultClassifier:
         text_key: Optional[str] = None,
         postprocess: Optional[Callable[[str], str]] = None,
     ) -> Optional[str]:
-        table = self._tables.get(table_key)
-        if not table:
+        index = self._select_index(table_key, classification_key)
+        if index is None:
             return None
 
-        rules: Iterable[Dict[str, Any]]
-        if classification_key and table.get(classification_key):
-            rules = table[classification_key]  # type: ignore[assignment]
-        elif table.get("classificacoes"):
-            rules = table["classificacoes"]  # type: ignore[assignment]
-        else:
+        rule = index.lookup(value)
+        if rule is None:
             return None
+        return self._rule_text(rule, text_key, postprocess)
 
-        rules_list = list(rules)
-        if not rules_list:
+    def _classify_column(
+        self,
+        table_key: str,
+        values: Sequence[Optional[float]],
+        *,
+        classification_key: Optional[str] = None,
+        text_key: Optional[str] = None,
+        postprocess: Optional[Callable[[str], str]] = None,
+    ) -> List[Optional[str]]:
+        """Columnar ``_classify_value``; None values stay None."""
+        results: List[Optional[str]] = [None] * len(values)
+        index = self._select_index(table_key, classification_key)
+        if index is None:
+            return results
+
+        cache_key = (id(index), text_key, postprocess)
+        labels = self._piece_texts_cache.get(cache_key)
+        if labels is None:
+            labels = [
+                None if rule is None else self._rule_text(rule, text_key, postprocess)
+                for rule in index.piece_rules
+            ]
+            self._piece_texts_cache[cache_key] = labels
+
+        rows = [row for row, value in enumerate(values) if value is not None]
+        for row, text in zip(rows, index.lookup_many([values[row] for row in rows], labels)):
+            results[row] = text
+        return results
+
+    def _select_index(self, table_key: str, classification_key: Optional[str] = None) -> Optional[IntervalIndex]:
+        indexes = self._indexes.get(table_key)
+        if not indexes:
             return None
 
-        bounds: List[tuple[float, float]] = []
-        for rule in rules_list:
-            try:
-                min_value = float(rule.get("faixa_min"))
-                max_value = float(rule.get("faixa_max"))
-            except (TypeError, ValueError):
-                continue
-            bounds.append((min_value, max_value))
+        index = indexes.get(classification_key) if classification_key else None
+        if index is None:
+            index = indexes.get("classificacoes")
+        return index
 
-        if bounds:
-            global_min = min(item[0] for item in bounds)
-            global_max = max(item[1] for item in bounds)
-            value = max(global_min, min(global_max, value))
+    @staticmethod
+    def _rule_text(
+        rule: Dict[str, Any],
+        text_key: Optional[str] = None,
+        postprocess: Optional[Callable[[str], str]] = None,
+    ) -> Optional[str]:
+        key = text_key or "texto"
+        text = rule.get(key)
+        if not text and key != "interpretacao":
+            text = rule.get("interpretacao")
+        if not isinstance(text, str):
+            return None
+        if text and postprocess:
+            text = postprocess(text)
+        return text
 
-        chosen: Optional[str] = None
-        for rule in rules_list:
-            try:
-                min_value = float(rule.get("faixa_min"))
-                max_value = float(rule.get("faixa_max"))
-            except (TypeError, ValueError):
+    @staticmethod
+    def _compile_tables(tables: Dict[str, Any]) -> Dict[str, Dict[str, IntervalIndex]]:
+        """Compile every non-empty rule list into an :class:`IntervalIndex`.
+
+        Malformed rules are reported once here with a warning instead of being
+        skipped on every lookup.
+        """
+        compiled: Dict[str, Dict[str, IntervalIndex]] = {}
+        for table_key, table in tables.items():
+            if not isinstance(table, dict):
+                continue
+            for rules_key in RULE_KEYS:
+                rules = table.get(rules_key)
+                if not rules:
+                    continue
+                label = f"{table_key}.{rules_key}"
+                if not isinstance(rules, list):
+                    warnings.warn(f"{label}: esperada uma lista de regras", stacklevel=3)
+                    continue
+                index = IntervalIndex(rules, label)
+                for issue in index.issues:
+                    warnings.warn(issue, stacklevel=3)
+                compiled.setdefault(table_key, {})[rules_key] = index
+        return compiled
+
+    @staticmethod
+    def _compile_graph(tables: Dict[str, Any]) -> FieldGraph:
+        """Compile the ``campos`` of every table into one :class:`FieldGraph`.
+
+        Malformed entries and cycles are reported with a warning and left out.
+        """
+        nodes: List[FieldNode] = []
+        for table_key, table in tables.items():
+            specs = table.get("campos") if isinstance(table, dict) else None
+            if not specs:
                 continue
-            if min_value <= value <= max_value:
-                key = text_key or "texto"
-                text = rule.get(key)
-                if not text and key != "interpretacao":
-                    text = rule.get("interpretacao")
-                if isinstance(text, str):
-                    chosen = text
-                break
+            if not isinstance(specs, list):
+                warnings.warn(f"{table_key}.campos: esperada uma lista", stacklevel=3)
+                continue
+            for position, spec in enumerate(specs):
+                label = f"{table_key}.campos[{position}]"
+                try:
+                    node = FieldNode(table_key, spec, label)
+                except ValueError as exc:
+                    warnings.warn(str(exc), stacklevel=3)
+                    continue
+                if node.postprocess is not None and node.postprocess not in POSTPROCESSORS:
+                    warnings.warn(f"{label}: pos_processamento desconhecido {node.postprocess!r}", stacklevel=3)
+                    continue
+                nodes.append(node)
+
+        graph = FieldGraph(nodes)
+        for issue in graph.issues:
+            warnings.warn(issue, stacklevel=3)
+        return graph
 
-        if chosen and postprocess:
-            chosen = postprocess(chosen)
+    @staticmethod
+    def _compile_norm_dispatch(norms: List[NormTable]) -> Dict[str, Tuple[int, ...]]:
+        dispatch: Dict[str, Tuple[int, ...]] = {}
+        for position, norm in enumerate(norms):
+            dispatch[norm.input_field] = dispatch.get(norm.input_field, ()) + (position,)
+        return dispatch
 
-        return chosen
+    @staticmethod
+    def _compile_norms(tables: Dict[str, Any]) -> List[NormTable]:
+        """Compile every ``normas`` entry; malformed ones are reported and skipped."""
+        norms: List[NormTable] = []
+        for table_key, table in tables.items():
+            specs = table.get("normas") if isinstance(table, dict) else None
+            if not specs:
+                continue
+            if not isinstance(specs, dict):
+                warnings.warn(f"{table_key}.normas: esperado um objeto por subteste", stacklevel=3)
+                continue
+            for name, spec in specs.items():
+                try:
+                    norms.append(NormTable(name, spec, f"{table_key}.normas.{name}"))
+                except ValueError as exc:
+                    warnings.warn(str(exc), stacklevel=3)
+        return norms
 
     @staticmethod
     def _strip_pontuacao_prefix(text: str) -> str:
@@ -314,52 +603,9 @@ class TestResultClassifier:
             text = text[len(prefix):]
         return text[:1].upper() + text[1:] if text else text
 
-    def _build_wisc_text(self, prefix: str, classification: str) -> Optional[str]:
-        table = self._tables.get("wisc")
-        if not isinstance(table, dict):
-            return None
-
-        options = table.get("opcoes_texto_analise")
-        if not isinstance(options, dict):
-            return None
-
-        option_key = {
-            "QIT": "QIT_conclusao",
-            "ICV": "ICV_text_out",
-            "IOP": "IOP_text_out",
-            "IMO": "IMO_text_out",
-            "IVP": "IVP_text_out",
-        }.get(prefix)
-        if not option_key:
-            return None
-
-        texts = options.get(option_key)
-        if not isinstance(texts, list) or not texts:
-            return None
-
-        template = texts[0]
-        if not isinstance(template, str):
-            return None
-
-        default_complements = {
-            "ICV": "resultados coerentes com as habilidades verbais observadas",
-            "IOP": "resultados alinhados ao desempenho em tarefas visuoespaciais",
-            "IMO": "desempenho compatível com a capacidade de atenção e memória operacional",
-            "IVP": "resultado condizente com a velocidade de processamento apresentada",
-        }
-
-        prepared = template.replace("[CLASSIFICAÇÃO AQUI]", classification)
-        if "[COMPLEMENTO AQUI]" in prepared:
-            complement = default_complements.get(prefix, "resultados compatíveis com a pontuação obtida")
-            prepared = prepared.replace("[COMPLEMENTO AQUI]", complement)
-
-        prepared = prepared.replace(" ,", ",").replace(" .", ".").strip()
-        prepared = " ".join(prepared.split())
-
-        if prefix == "QIT" and prefix not in default_complements:
-            prepared = f"{classification}. {prepared}" if prepared else classification
-
-        return prepared or None
+    def _analysis_text_for(self, node: FieldNode, classification: str) -> Optional[str]:
+        return self.analysis_text(node.table, node.analysis_option, classification,
+                                  complement=node.analysis_complement, lead=node.analysis_lead)
 
     @staticmethod
     def _store_if_empty(payload: Dict[str, Any], key: str, value: str) -> None:
@@ -382,4 +628,28 @@ class TestResultClassifier:
                 return float(stripped)
             except ValueError:
                 return None
-        return None
\ No newline at end of file
+        return None
+
+
+class ClassificationSession:
+    """Classify the results of one evaluation again and again, cheaply.
+
+    Each graph node remembers the input values of its last evaluation; on the
+    next :meth:`classify_results` call it is evaluated again only if one of
+    them changed, so editing one subtest re-classifies that subtest (and what
+    derives from it). Results are the same as
+    :meth:`TestResultClassifier.classify_results`.
+    """
+
+    def __init__(self, classifier: TestResultClassifier):
+        self.classifier = classifier
+        self._memo: List[Optional[Tuple[Tuple[Any, ...], Tuple[Any, Writes]]]] = [None] * len(classifier._graph)
+
+    def classify_results(self, results: Dict[str, Any], age: Any = None) -> Dict[str, Any]:
+        return self.classifier._classify(results, age, self._memo)
+
+
+# Text post-processors that ``campos`` entries can name in ``pos_processamento``
+POSTPROCESSORS: Dict[str, Callable[[str], str]] = {
+    "sem_prefixo_pontuacao": TestResultClassifier._strip_pontuacao_prefix,
+}
@@ -1,50 +1,179 @@
-import json
+import hashlib
+import marshal
+import os
+import sys
+import threading
+import warnings
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from . import jsonc, startup_profile
+from .frozen import freeze
+
+# Bump whenever parsing changes, so snapshots written by older code are ignored
+SNAPSHOT_VERSION = 2
+CACHE_DIR_ENV = "PSYR_CACHE_DIR"
+
+# Process-wide parsed tables: data_dir -> (file stats, tables, errors)
+_memory_cache: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], Dict[str, Any], List[str]]] = {}
+_memory_lock = threading.Lock()
+
+
+def clear_shared_cache(data_dir: Path | str | None = None) -> None:
+    """Forget the tables shared in this process (for one directory or all of them)."""
+    with _memory_lock:
+        if data_dir is None:
+            _memory_cache.clear()
+        else:
+            _memory_cache.pop(str(Path(data_dir).resolve()), None)
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory (``$PSYR_CACHE_DIR`` overrides it)."""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "psy-r"
 
 
 class TestTablesLoader:
     """Load test configuration tables from src/app/data/*.jsonc.
 
-    Files are JSON with // comments (jsonc). This loader strips simple // comments
-    and parses the JSON.
+    Files are JSON with ``//`` and ``/* */`` comments and trailing commas
+    (jsonc), read with :func:`app.services.jsonc.loads`. A file that cannot be
+    parsed is skipped with a warning giving its line and column; the messages
+    are kept in :attr:`errors`.
+
+    Parsed tables are shared, read-only (:func:`app.services.frozen.freeze`),
+    by every loader of the same directory in the process, and a marshal
+    snapshot keyed by the SHA-256 of each file is kept in the user cache dir,
+    so the files are only parsed again after they change.
     """
 
-    def __init__(self, data_dir: Path | str | None = None):
+    def __init__(self, data_dir: Path | str | None = None, cache_dir: Path | str | None = None,
+                 disk_cache: bool = True):
         base = Path(data_dir) if data_dir else Path(__file__).resolve().parents[1] / "data"
         self.data_dir = base
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.disk_cache = disk_cache
         self._cache: Dict[str, Any] = {}
+        self.errors: List[str] = []
 
     def _load_jsonc(self, path: Path) -> Any:
-        text = path.read_text(encoding="utf-8")
-        # strip //... comments
-        lines = []
-        for line in text.splitlines():
-            stripped = line
-            if "//" in line:
-                # remove inline comments
-                stripped = line.split("//", 1)[0]
-            lines.append(stripped)
-        cleaned = "\n".join(lines)
-        return json.loads(cleaned)
+        return self._parse_jsonc(path.read_text(encoding="utf-8-sig"), str(path))
+
+    @staticmethod
+    def _parse_jsonc(text: str, source: Optional[str] = None) -> Any:
+        return jsonc.loads(text, source)
 
     def load_all(self) -> Dict[str, Any]:
         if self._cache:
             return self._cache
+        with startup_profile.span("loader", "TestTablesLoader") as details:
+            details["source"] = self._load_all()
+        return self._cache
 
-        files = list(self.data_dir.glob("*_table.jsonc"))
-        for p in files:
-            try:
-                data = self._load_jsonc(p)
-                key = p.stem.replace("_table", "")
-                self._cache[key] = data
-            except Exception:
-                # skip files that fail to parse
-                continue
+    def _load_all(self) -> str:
+        """Fill ``_cache`` and ``errors``; returns where the tables came from."""
+        files = sorted(self.data_dir.glob("*_table.jsonc"))
+        stats = tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+        memory_key = str(self.data_dir.resolve())
 
-        return self._cache
+        with _memory_lock:
+            cached = _memory_cache.get(memory_key)
+        if cached is not None and cached[0] == stats:
+            self._cache, self.errors = cached[1], list(cached[2])
+            return "memory"
+
+        contents = {p.name: p.read_bytes() for p in files}
+        digests = tuple((name, hashlib.sha256(data).hexdigest()) for name, data in contents.items())
+
+        errors: List[str] = []
+        tables = self._read_snapshot(digests)
+        source = "snapshot"
+        if tables is None:
+            source = "parsed"
+            tables = {}
+            for p in files:
+                try:
+                    data = self._parse_jsonc(contents[p.name].decode("utf-8-sig"), str(p))
+                except UnicodeDecodeError as exc:
+                    errors.append(f"{p}: arquivo não está em UTF-8 ({exc.reason})")
+                    continue
+                except jsonc.JSONCError as exc:
+                    errors.append(str(exc))
+                    continue
+                tables[p.stem.replace("_table", "")] = data
+            # keep reporting broken files until they are fixed
+            if not errors:
+                self._write_snapshot(digests, tables)
+
+        for message in errors:
+            warnings.warn(f"Tabela ignorada: {message}", stacklevel=3)
+
+        # shared with every loader of this directory, so nobody can change it for the others
+        tables = freeze(tables)
+        with _memory_lock:
+            _memory_cache[memory_key] = (stats, tables, errors)
+        self._cache = tables
+        self.errors = errors
+        return source
 
     def get(self, key: str) -> Dict[str, Any] | None:
         if not self._cache:
             self.load_all()
         return self._cache.get(key)
+
+    # Snapshot cache ------------------------------------------------------------
+    def snapshot_path(self) -> Path:
+        """Path of the snapshot file.
+
+        The name does not depend on the data directory, which is a new
+        temporary directory on every start of a ``--onefile`` build; the file
+        names and digests stored in it decide whether it can be used.
+        """
+        # marshal's format is specific to the interpreter version
+        tag = sys.implementation.cache_tag or "python"
+        return (self.cache_dir or default_cache_dir()) / f"tables.{tag}.marshal"
+
+    def _read_snapshot(self, digests: tuple) -> Optional[Dict[str, Any]]:
+        if not self.disk_cache:
+            return None
+        try:
+            with open(self.snapshot_path(), "rb") as fp:
+                version, stored_digests, tables = marshal.load(fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != SNAPSHOT_VERSION or stored_digests != digests:
+            return None
+        return tables
+
+    def _write_snapshot(self, digests: tuple, tables: Dict[str, Any]) -> None:
+        if not self.disk_cache:
+            return
+        path = self.snapshot_path()
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as fp:
+                marshal.dump((SNAPSHOT_VERSION, digests, tables), fp)
+            os.replace(temp_path, path)
+        except (OSError, ValueError):
+            # the cache is an optimization only
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return
+        # snapshots of older versions were named after the data directory
+        for stale in path.parent.glob("tables-*.marshal"):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
@@ -1,15 +1,42 @@
-from .template import TemplateScreen
-from .patient import PatientScreen
-from .tests import TestsScreen
-from .template_fields import TemplateFieldsScreen
-from .conclusion import ConclusionScreen
-from .review import ReviewScreen
-
-__all__ = [
-    'TemplateScreen',
-    'PatientScreen',
-    'TemplateFieldsScreen',
-    'TestsScreen',
-    'ConclusionScreen',
-    'ReviewScreen'
-]
\ No newline at end of file
+"""Screens of the main window.
+
+Each screen is imported from its module on first access (PEP 562): the
+generated forms are large, and ``MainWindow`` builds most screens after the
+first one is shown.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    # for type checkers, and so PyInstaller's import scan still bundles every module
+    from .template import TemplateScreen
+    from .patient import PatientScreen
+    from .tests import TestsScreen
+    from .template_fields import TemplateFieldsScreen
+    from .conclusion import ConclusionScreen
+    from .review import ReviewScreen
+
+# exported name -> module defining it
+_EXPORTS = {
+    'TemplateScreen': 'template',
+    'PatientScreen': 'patient',
+    'TemplateFieldsScreen': 'template_fields',
+    'TestsScreen': 'tests',
+    'ConclusionScreen': 'conclusion',
+    'ReviewScreen': 'review',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
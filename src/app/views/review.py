@@ -1,23 +1,67 @@
-from PySide6.QtWidgets import QWidget
+from PySide6.QtWidgets import QCheckBox, QHBoxLayout, QLabel, QProgressBar, QPushButton, QWidget
 from PySide6.QtCore import Signal
 from typing import Optional
 
 from .ui_review import Ui_TelaRevisao
-from app.services import TemplateFieldsLoader
+from app.services import get_registry
 
 class ReviewScreen(QWidget):
     voltar_clicado = Signal()
     gerar_laudo_clicado = Signal()
+    cancelar_geracao_clicado = Signal()
 
     def __init__(self, parent=None, data_model=None):
         super().__init__(parent)
         self.ui = Ui_TelaRevisao()
         self.ui.setupUi(self)
         self.data_model = data_model
-        self.template_fields_loader = TemplateFieldsLoader()
+        self.template_fields_loader = get_registry().template_fields_loader()
+        self._criar_controles_geracao()
 
         self.ui.btn_voltar.clicked.connect(self.voltar_clicado.emit)
         self.ui.btn_gerar_laudo.clicked.connect(self.gerar_laudo_clicado.emit)
+        self.btn_cancelar_geracao.clicked.connect(self.cancelar_geracao_clicado.emit)
+
+    def _criar_controles_geracao(self):
+        """Add the PDF option and the progress row used while a laudo is generated."""
+        self.check_gerar_pdf = QCheckBox("Gerar também PDF", self)
+        self.ui.horizontalLayout.insertWidget(2, self.check_gerar_pdf)
+
+        self.label_progresso = QLabel(self)
+        self.barra_progresso = QProgressBar(self)
+        self.btn_cancelar_geracao = QPushButton("Cancelar", self)
+        linha_progresso = QHBoxLayout()
+        linha_progresso.addWidget(self.label_progresso)
+        linha_progresso.addWidget(self.barra_progresso, 1)
+        linha_progresso.addWidget(self.btn_cancelar_geracao)
+        self.ui.verticalLayout_2.insertLayout(self.ui.verticalLayout_2.count() - 1, linha_progresso)
+        self.set_generation_running(False)
+
+    def gerar_pdf(self) -> bool:
+        """Whether the user asked for a PDF copy of the laudo."""
+        return self.check_gerar_pdf.isChecked()
+
+    def set_generation_running(self, running: bool):
+        """Show the progress row and lock the buttons while a laudo is generated."""
+        for widget in (self.label_progresso, self.barra_progresso, self.btn_cancelar_geracao):
+            widget.setVisible(running)
+        self.btn_cancelar_geracao.setEnabled(running)
+        self.ui.btn_gerar_laudo.setEnabled(not running)
+        self.ui.btn_voltar.setEnabled(not running)
+        self.check_gerar_pdf.setEnabled(not running)
+        if running:
+            self.barra_progresso.setValue(0)
+            self.label_progresso.setText("Iniciando...")
+
+    def show_generation_stage(self, label: str, number: int, total: int):
+        """Show the stage being run (``number`` of ``total``, starting at 1)."""
+        self.label_progresso.setText(f"{label}...")
+        self.barra_progresso.setRange(0, total)
+        self.barra_progresso.setValue(number - 1)
+
+    def set_generation_cancelling(self):
+        self.label_progresso.setText("Cancelando...")
+        self.btn_cancelar_geracao.setEnabled(False)
     
     def set_data_model(self, data_model):
         """Set the data model for this screen."""
@@ -1,10 +1,13 @@
-from docx import Document
-from docx.opc.exceptions import OpcError
+from typing import TYPE_CHECKING
+
 from PySide6.QtWidgets import QWidget, QFileDialog, QMessageBox
 from PySide6.QtCore import Signal
 
 from .ui_template import Ui_TelaTemplate
 
+if TYPE_CHECKING:
+    from docx.document import Document
+
 class TemplateScreen(QWidget):
     avancar_clicado = Signal()
     carregar_template_clicado = Signal()
@@ -27,8 +30,13 @@ class TemplateScreen(QWidget):
     def carregar_template(self):
         file_path, _ = QFileDialog.getOpenFileName(self)
         if file_path:
+            # python-docx is only loaded once a template is chosen (first screen of the app)
+            from docx.opc.exceptions import OpcError
+            from app.services import get_compiled_template
+
             try:
-                self.file_template = Document(file_path)
+                # Compile once here so report generation reuses the parsed template
+                self.file_template = get_compiled_template(file_path).new_document()
                 self.ui.lineEdit_caminho_template.setText(file_path)
                 
                 # Só permite avançar após carregar o template
@@ -59,6 +67,6 @@ class TemplateScreen(QWidget):
         """Get the template file path."""
         return self.ui.lineEdit_caminho_template.text() if self._template_carregado else ""
     
-    def get_template_document(self) -> Document:
+    def get_template_document(self) -> "Document":
         """Get the loaded template document."""
         return self.file_template
\ No newline at end of file
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 
 from .ui_template_fields import Ui_TelaCamposTemplate
+from app.services.data_registry import get_registry
 from app.services.template_fields_loader import TemplateFieldsLoader
 
 
@@ -18,17 +19,19 @@ class TemplateFieldsScreen(QWidget):
     avancar_clicado = Signal()
     voltar_clicado = Signal()
 
-    def __init__(self, parent=None, loader: TemplateFieldsLoader | None = None):
+    def __init__(self, parent=None, loader: TemplateFieldsLoader | None = None,
+                 sections: list[str] | None = None):
         super().__init__(parent)
         self.ui = Ui_TelaCamposTemplate()
         self.ui.setupUi(self)
 
-        # Optional: pass loader or use default
-        self.loader = loader or TemplateFieldsLoader()
+        # Optional: pass loader or use the shared one
+        self.loader = loader or get_registry().template_fields_loader()
         self.field_widgets: Dict[str, QWidget] = {}
 
-        # If provided, this will limit which sections to render (list of section ids)
-        self.sections_to_show: list[str] | None = None
+        # If provided, this will limit which sections to render (list of section ids);
+        # passing it here avoids building the widgets twice (see ``set_sections``)
+        self.sections_to_show: list[str] | None = sections
 
         self._build_dynamic_fields()
 
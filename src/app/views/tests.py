@@ -5,7 +5,7 @@ from PySide6.QtWidgets import QWidget, QPushButton, QStackedWidget, QSpinBox
 from PySide6.QtCore import Signal
 
 from .ui_tests import Ui_TelaTestes
-from app.services.test_tables_loader import TestTablesLoader
+from app.services.data_registry import get_registry
 
 
 # Mapping from UI widget names to canonical template field names expected
@@ -98,7 +98,7 @@ class TestsScreen(QWidget):
 
         # Load test configuration tables
         try:
-            self.tables_loader = TestTablesLoader()
+            self.tables_loader = get_registry().tables_loader()
             self.test_tables = self.tables_loader.load_all()
         except Exception:
             self.test_tables = {}
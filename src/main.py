@@ -1,20 +1,113 @@
 import sys
+
+from app.services import startup_profile
+
+# ``--profile-startup`` has to hook the import system before anything else is imported
+if __name__ == "__main__" and startup_profile.split_argv(sys.argv[1:])[0] is not None:
+    startup_profile.start()
+
+import importlib
 import os
-from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QFileDialog, QMessageBox
-from docx import Document
-
-from app.views import (
-    TemplateScreen,
-    PatientScreen,
-    TemplateFieldsScreen,
-    TestsScreen,
-    ConclusionScreen,
-    ReviewScreen,
-)
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from PySide6.QtCore import QEvent, QObject, QThreadPool, QTimer
+from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QFileDialog, QMessageBox, QWidget
+
 from app.models import LaudoDataModel
-from app.services import TemplateProcessor
+
+if TYPE_CHECKING:
+    # for type checkers, and so PyInstaller's import scan still bundles these modules
+    from app.report_worker import STAGE_LABELS, ReportWorker
+    from app.services.compiled_template import get_compiled_template
+    from app.services.report_renderer import report_basename
+    from app.services.template_processor import TemplateProcessor
+
+# Imported on first use: generating a laudo needs python-docx and lxml, which
+# the first screen does not (module ``__getattr__``, PEP 562)
+_LAZY_IMPORTS = {
+    "TemplateProcessor": "app.services.template_processor",
+    "get_compiled_template": "app.services.compiled_template",
+    "report_basename": "app.services.report_renderer",
+    "ReportWorker": "app.report_worker",
+    "STAGE_LABELS": "app.report_worker",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """``name`` from ``_LAZY_IMPORTS``, importing it on first use (a patched name wins)."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+class _Tela:
+    """``MainWindow`` attribute whose screen is built on first access."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, window, owner=None):
+        if window is None:
+            return self
+        return window._tela(self.name)
+
+
+class _PrimeiraPintura(QObject):
+    """Event filter calling ``callback`` once, when ``widget`` is first painted."""
+
+    def __init__(self, widget: QWidget, callback):
+        super().__init__(widget)
+        self._widget = widget
+        self._callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self._widget.removeEventFilter(self)
+            self._callback()
+        return False
+
 
 class MainWindow(QMainWindow):
+    # Screens in stacked-widget order: template -> patient -> admin fields -> clinical ->
+    # behavior -> tests -> conclusions -> legacy conclusion -> review.
+    # Each one is built by ``_criar_<nome>`` the first time it is needed.
+    ORDEM_TELAS = (
+        "tela_template",
+        "tela_paciente",
+        "tela_campos_administrativo",
+        "tela_campos_contexto",
+        "tela_campos_comportamento",
+        "tela_testes",
+        "tela_conclusoes_section",
+        "tela_conclusao",
+        "tela_revisao",
+    )
+    # TemplateFieldsScreen instances, keyed to their section of template_fields.json
+    TELAS_CAMPOS = {
+        "tela_campos_administrativo": "administrativo",
+        "tela_campos_contexto": "contexto_clinico",
+        "tela_campos_comportamento": "comportamento_observado",
+        "tela_conclusoes_section": "conclusoes",
+    }
+
+    tela_template = _Tela()
+    tela_paciente = _Tela()
+    tela_campos_administrativo = _Tela()
+    tela_campos_contexto = _Tela()
+    tela_campos_comportamento = _Tela()
+    tela_testes = _Tela()
+    tela_conclusoes_section = _Tela()
+    tela_conclusao = _Tela()
+    tela_revisao = _Tela()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("PsiqueLaudo")
@@ -22,6 +115,13 @@ class MainWindow(QMainWindow):
 
         # Initialize data model
         self.data_model = LaudoDataModel()
+        
+        # Laudos are generated one at a time, off the GUI thread
+        self.report_pool = QThreadPool(self)
+        self.report_pool.setMaxThreadCount(1)
+        self._report_worker = None
+        # set when the window is closed during a generation (see ``closeEvent``)
+        self._fechar_ao_terminar = False
 
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
@@ -30,63 +130,139 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentIndex(0)
 
     def criar_e_conectar_telas(self):
+        """Build the template screen and leave a placeholder for every other screen.
 
-        self.tela_template = TemplateScreen()
-        self.tela_paciente = PatientScreen()
-        # Split template fields into focused screens (administrative, clinical, behavior, conclusions)
-        self.tela_campos_administrativo = TemplateFieldsScreen()
-        self.tela_campos_administrativo.set_sections(["administrativo"])
+        The placeholders are replaced on first navigation (or attribute
+        access), and one per idle pass of the event loop once the template
+        screen has been painted, so building them never delays the first paint.
+        """
+        self._telas: Dict[str, QWidget] = {}
+        self._trocando_tela = False
+        for _ in self.ORDEM_TELAS:
+            self.stacked_widget.addWidget(QWidget())
+        self.stacked_widget.currentChanged.connect(self._ao_mudar_tela)
 
-        self.tela_campos_contexto = TemplateFieldsScreen()
-        self.tela_campos_contexto.set_sections(["contexto_clinico"])
+        self._construcao_ociosa = QTimer(self)
+        self._construcao_ociosa.setInterval(0)
+        self._construcao_ociosa.timeout.connect(self._construir_proxima_tela)
 
-        self.tela_campos_comportamento = TemplateFieldsScreen()
-        self.tela_campos_comportamento.set_sections(["comportamento_observado"])
-        # Conclusions use the same dynamic screen but restricted to the conclusions section
-        self.tela_conclusoes_section = TemplateFieldsScreen()
-        self.tela_conclusoes_section.set_sections(["conclusoes"])
+        _PrimeiraPintura(self._tela("tela_template"), self._ao_pintar_tela_inicial)
 
-        # Keep a backward-compatible separate ConclusionScreen instance (some tests / callers expect it)
-        self.tela_conclusao = ConclusionScreen(data_model=self.data_model)
+    def _ao_pintar_tela_inicial(self):
+        startup_profile.mark("first_paint")
+        self._construcao_ociosa.start()
+
+    # Screen factories ------------------------------------------------------------
+    def _tela(self, nome: str) -> QWidget:
+        """Return screen ``nome``, building it in its stacked-widget slot if needed."""
+        tela = self._telas.get(nome)
+        if tela is None:
+            with startup_profile.span("screen", nome):
+                tela = getattr(self, f"_criar_{nome}")()
+            self._telas[nome] = tela
+            self._instalar_tela(self.ORDEM_TELAS.index(nome), tela)
+        return tela
+
+    def _instalar_tela(self, index: int, tela: QWidget):
+        placeholder = self.stacked_widget.widget(index)
+        atual = self.stacked_widget.currentIndex() == index
+        self._trocando_tela = True
+        try:
+            self.stacked_widget.removeWidget(placeholder)
+            self.stacked_widget.insertWidget(index, tela)
+            if atual:
+                self.stacked_widget.setCurrentIndex(index)
+        finally:
+            self._trocando_tela = False
+        placeholder.deleteLater()
+
+    def _ao_mudar_tela(self, index: int):
+        # any way of showing a slot (including setCurrentIndex) builds its screen
+        if not self._trocando_tela and 0 <= index < len(self.ORDEM_TELAS):
+            self._tela(self.ORDEM_TELAS[index])
+
+    def _construir_proxima_tela(self):
+        """Build the next pending screen; runs when the event loop is idle."""
+        pendentes = [nome for nome in self.ORDEM_TELAS if nome not in self._telas]
+        if pendentes:
+            self._tela(pendentes[0])
+        if len(pendentes) <= 1:
+            self._construcao_ociosa.stop()
+            startup_profile.mark("screens_built")
 
-        self.tela_testes = TestsScreen()
-        self.tela_revisao = ReviewScreen(data_model=self.data_model)
+    def _nome_da_tela(self, widget: Optional[QWidget]) -> Optional[str]:
+        """Name of a built screen, or None (e.g. for a placeholder)."""
+        return next((nome for nome, tela in self._telas.items() if tela is widget), None)
 
-        # Order: template -> patient -> admin fields -> clinical -> behavior -> tests -> conclusions -> review
-        self.stacked_widget.addWidget(self.tela_template)
-        self.stacked_widget.addWidget(self.tela_paciente)
-        self.stacked_widget.addWidget(self.tela_campos_administrativo)
-        self.stacked_widget.addWidget(self.tela_campos_contexto)
-        self.stacked_widget.addWidget(self.tela_campos_comportamento)
-        self.stacked_widget.addWidget(self.tela_testes)
-        # add both conclusions widgets (conclusions section and legacy conclusion screen) to preserve API/indices
-        self.stacked_widget.addWidget(self.tela_conclusoes_section)
-        self.stacked_widget.addWidget(self.tela_conclusao)
-        self.stacked_widget.addWidget(self.tela_revisao)
+    def _criar_tela_template(self):
+        from app.views.template import TemplateScreen
 
-        self.tela_template.avancar_clicado.connect(self.ir_para_proxima_tela)
+        tela = TemplateScreen()
+        tela.avancar_clicado.connect(self.ir_para_proxima_tela)
+        return tela
 
-        self.tela_paciente.avancar_clicado.connect(self.ir_para_proxima_tela)
-        self.tela_paciente.voltar_clicado.connect(self.ir_para_tela_anterior)
+    def _criar_tela_paciente(self):
+        from app.views.patient import PatientScreen
 
-        for tela in (self.tela_campos_administrativo, self.tela_campos_contexto, self.tela_campos_comportamento, self.tela_conclusoes_section):
+        tela = PatientScreen()
+        tela.avancar_clicado.connect(self.ir_para_proxima_tela)
+        tela.voltar_clicado.connect(self.ir_para_tela_anterior)
+        return tela
+
+    def _criar_tela_campos(self, nome: str):
+        """Template fields screen restricted to one section (see ``TELAS_CAMPOS``)."""
+        from app.views.template_fields import TemplateFieldsScreen
+
+        tela = TemplateFieldsScreen(sections=[self.TELAS_CAMPOS[nome]])
+        tela.voltar_clicado.connect(self.ir_para_tela_anterior)
+        if nome == "tela_conclusoes_section":
+            # conclusions section leads straight to review. It used to step
+            # through the legacy ConclusionScreen as well, whose empty text box
+            # then overwrote the CONCLUSAO_ANALISE_LIVRE conclusion.
+            tela.avancar_clicado.connect(self._ir_para_revisao)
+        else:
             tela.avancar_clicado.connect(self.ir_para_proxima_tela)
-            tela.voltar_clicado.connect(self.ir_para_tela_anterior)
+        return tela
+
+    def _criar_tela_campos_administrativo(self):
+        return self._criar_tela_campos("tela_campos_administrativo")
+
+    def _criar_tela_campos_contexto(self):
+        return self._criar_tela_campos("tela_campos_contexto")
+
+    def _criar_tela_campos_comportamento(self):
+        return self._criar_tela_campos("tela_campos_comportamento")
 
-        self.tela_testes.avancar_clicado.connect(self.ir_para_proxima_tela)
-        self.tela_testes.voltar_clicado.connect(self.ir_para_tela_anterior)
+    def _criar_tela_conclusoes_section(self):
+        return self._criar_tela_campos("tela_conclusoes_section")
+
+    def _criar_tela_testes(self):
+        from app.views.tests import TestsScreen
+
+        tela = TestsScreen()
+        tela.avancar_clicado.connect(self.ir_para_proxima_tela)
+        tela.voltar_clicado.connect(self.ir_para_tela_anterior)
+        return tela
+
+    def _criar_tela_conclusao(self):
+        # Keep a backward-compatible separate ConclusionScreen instance (some tests / callers expect it)
+        from app.views.conclusion import ConclusionScreen
 
-        # conclusions section leads to review
-        self.tela_conclusoes_section.avancar_clicado.connect(self._ir_para_revisao)
-        self.tela_conclusoes_section.voltar_clicado.connect(self.ir_para_tela_anterior)
+        tela = ConclusionScreen(data_model=self.data_model)
+        tela.avancar_clicado.connect(self._ir_para_revisao)
+        tela.voltar_clicado.connect(self.ir_para_tela_anterior)
+        return tela
 
-        # wire legacy conclusion screen as before (backward compatibility)
-        self.tela_conclusao.avancar_clicado.connect(self._ir_para_revisao)
-        self.tela_conclusao.voltar_clicado.connect(self.ir_para_tela_anterior)
+    def _criar_tela_revisao(self):
+        from app.views.review import ReviewScreen
 
-        self.tela_revisao.voltar_clicado.connect(self.ir_para_tela_anterior)
-        self.tela_revisao.gerar_laudo_clicado.connect(self.gerar_laudo)
+        tela = ReviewScreen(data_model=self.data_model)
+        tela.voltar_clicado.connect(self.ir_para_tela_anterior)
+        tela.gerar_laudo_clicado.connect(self.gerar_laudo)
+        tela.cancelar_geracao_clicado.connect(self.cancelar_laudo)
+        return tela
 
+    # Navigation ------------------------------------------------------------------
     def ir_para_proxima_tela(self):
         # Collect data from current screen before navigating
         self._coletar_dados_tela_atual()
@@ -108,28 +284,31 @@ class MainWindow(QMainWindow):
             self.stacked_widget.setCurrentIndex(anterior)
 
     def _preparar_tela(self, index: int):
-        widget = self.stacked_widget.widget(index)
-        # If the target widget is any TemplateFieldsScreen, populate it with stored values
-        if isinstance(widget, TemplateFieldsScreen):
-            widget.set_data(self.data_model.get_template_field_values())
-        elif isinstance(widget, ConclusionScreen):
-            widget.refresh_calculated_data()
+        nome = self.ORDEM_TELAS[index]
+        tela = self._tela(nome)
+        # Template fields screens are populated with stored values
+        if nome in self.TELAS_CAMPOS:
+            tela.set_data(self.data_model.get_template_field_values())
+        elif nome == "tela_conclusao":
+            tela.refresh_calculated_data()
     
     def _coletar_dados_tela_atual(self):
         """Collect data from the currently visible screen."""
-        index_atual = self.stacked_widget.currentIndex()
-        widget = self.stacked_widget.currentWidget()
+        nome = self._nome_da_tela(self.stacked_widget.currentWidget())
+        if nome is None:
+            return  # not built yet, so nothing was typed into it
+        tela = self._telas[nome]
         
         # Screen 0: Template
-        if widget is self.tela_template:
-            template_path = self.tela_template.get_template_path()
-            template_doc = self.tela_template.get_template_document()
+        if nome == "tela_template":
+            template_path = tela.get_template_path()
+            template_doc = tela.get_template_document()
             if template_path and template_doc:
                 self.data_model.set_template(template_path, template_doc)
         
         # Screen 1: Patient
-        elif widget is self.tela_paciente:
-            patient_data = self.tela_paciente.get_data()
+        elif nome == "tela_paciente":
+            patient_data = tela.get_data()
             if "patient" in patient_data:
                 self.data_model.set_patient_data(patient_data["patient"])
             if "resp1" in patient_data:
@@ -140,14 +319,14 @@ class MainWindow(QMainWindow):
                 self.data_model.set_template_field_values(patient_data["template_fields"])
         
         # Legacy Conclusion screen (backwards compatibility)
-        elif hasattr(self, "tela_conclusao") and widget is self.tela_conclusao:
-            conclusion_data = self.tela_conclusao.get_data()
+        elif nome == "tela_conclusao":
+            conclusion_data = tela.get_data()
             if "conclusao_text" in conclusion_data:
                 self.data_model.set_conclusion_text(conclusion_data["conclusao_text"])
 
         # Template fields screens (administrative, clinical, behavior, conclusions)
-        elif isinstance(widget, TemplateFieldsScreen):
-            template_fields = widget.get_data()
+        elif nome in self.TELAS_CAMPOS:
+            template_fields = tela.get_data()
             if template_fields:
                 self.data_model.set_template_field_values(template_fields)
 
@@ -157,12 +336,12 @@ class MainWindow(QMainWindow):
                 self.data_model.set_conclusion_text(template_fields.get("CONCLUSAO_ANALISE_LIVRE", ""))
         
         # Screen 3: Tests
-        elif widget is self.tela_testes:
-            test_data = self.tela_testes.get_data()
+        elif nome == "tela_testes":
+            test_data = tela.get_data()
             if test_data:
                 self.data_model.set_test_results(test_data)
-                if hasattr(self, "tela_conclusao"):
-                    self.tela_conclusao.refresh_calculated_data()
+                if "tela_conclusao" in self._telas:
+                    self._telas["tela_conclusao"].refresh_calculated_data()
         
         # Note: explicit ConclusionScreen removed; conclusion data now comes from conclusions section above.
     
@@ -177,7 +356,14 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentIndex(index_revisao)
     
     def gerar_laudo(self):
-        """Generate the final document (DOCX and PDF) with all collected data."""
+        """Generate the final document (DOCX and, optionally, PDF) with all collected data.
+        
+        Fields are checked here; filling, saving and PDF conversion run in a
+        :class:`ReportWorker` on ``self.report_pool`` so the window stays responsive.
+        """
+        if self._report_worker is not None:
+            return  # a laudo is already being generated
+        
         # Ensure current screen data (including conclusions section) is collected before generating
         self._coletar_dados_tela_atual()
         
@@ -190,12 +376,15 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Initialize template processor
-        processor = TemplateProcessor(self.data_model.template_document)
+        # Initialize template processor; the compiled template is parsed once per file version
+        processor = _lazy("TemplateProcessor")(self.data_model.template_document)
+        compiled = _lazy("get_compiled_template")(self.data_model.template_path)
         
-        # Extract and validate fields
-        template_fields = processor.extract_fields()
-        valid_fields, invalid_fields = processor.validate_fields()
+        # only the template's placeholders are formatted
+        field_mapping = self.data_model.get_field_mapping(fields=sorted(compiled.fields))
+        # One plan, on a fresh copy, drives both warnings and is applied by the worker
+        plan = processor.render_plan(compiled.new_document(), field_mapping, compiled=compiled)
+        invalid_fields = plan.invalid_fields
         
         # Show warning if invalid fields found
         if invalid_fields:
@@ -211,11 +400,8 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.StandardButton.No:
                 return
         
-        # Get field mapping from data model
-        field_mapping = self.data_model.get_field_mapping()
-        
         # Check for missing or empty fields
-        missing_fields, empty_fields = processor.check_required_fields(template_fields, field_mapping)
+        missing_fields, empty_fields = plan.missing_fields, plan.empty_fields
         
         # Show warning for missing/empty fields
         if missing_fields or empty_fields:
@@ -247,45 +433,117 @@ class MainWindow(QMainWindow):
         if not output_dir:
             return  # User cancelled
         
+        # Generate output filename (use patient name if available, otherwise generic)
+        base_filename = _lazy("report_basename")(self.data_model.patient_data.get("patient_name", ""))
+        docx_path = os.path.join(output_dir, f"{base_filename}.docx")
+        
+        # The worker gets a read-only snapshot of the mapping
+        worker = _lazy("ReportWorker")(
+            self.data_model.template_path,
+            field_mapping,
+            docx_path,
+            pdf=self.tela_revisao.gerar_pdf(),
+            processor=processor,
+            plan=plan,
+        )
+        worker.signals.stage_started.connect(self._on_laudo_etapa)
+        worker.signals.finished.connect(self._on_laudo_gerado)
+        worker.signals.failed.connect(self._on_laudo_erro)
+        worker.signals.cancelled.connect(self._on_laudo_cancelado)
+        self._report_worker = worker
+        self.tela_revisao.set_generation_running(True)
+        self.report_pool.start(worker)
+    
+    def cancelar_laudo(self):
+        """Ask the running worker to stop before its next stage."""
+        if self._report_worker is not None:
+            self._report_worker.cancel()
+            self.tela_revisao.set_generation_cancelling()
+    
+    def _on_laudo_etapa(self, stage: str, number: int, total: int):
+        self.tela_revisao.show_generation_stage(_lazy("STAGE_LABELS").get(stage, stage), number, total)
+    
+    def _finalizar_laudo(self) -> bool:
+        """Leave the generating state; True if the window is closing instead (no message is shown)."""
+        self._report_worker = None
+        self.tela_revisao.set_generation_running(False)
+        if self._fechar_ao_terminar:
+            QTimer.singleShot(0, self.close)
+            return True
+        return False
+    
+    def _on_laudo_gerado(self, result: dict):
+        if self._finalizar_laudo():
+            return
+        message = f'Laudo gerado com sucesso!\n\nDOCX: {result["docx"]}\n'
+        if result.get("pdf"):
+            message += f'PDF: {result["pdf"]}\n'
+        QMessageBox.information(self, 'Sucesso', message)
+    
+    def _on_laudo_erro(self, error: str):
+        if self._finalizar_laudo():
+            return
+        QMessageBox.critical(
+            self,
+            'Erro ao Gerar Laudo',
+            f'Ocorreu um erro ao gerar o laudo:\n\n{error}'
+        )
+    
+    def _on_laudo_cancelado(self):
+        if self._finalizar_laudo():
+            return
+        QMessageBox.information(self, 'Cancelado', 'A geração do laudo foi cancelada.')
+    
+    def closeEvent(self, event):
+        self._construcao_ociosa.stop()
+        if self._report_worker is not None:
+            # The current stage (e.g. the PDF conversion) runs to completion, so
+            # keep the window open, showing "Cancelando...", and close it once
+            # the worker reports back instead of blocking the GUI thread
+            self._fechar_ao_terminar = True
+            self.cancelar_laudo()
+            event.ignore()
+            return
+        # the worker has already reported; at most its thread is still returning
+        self.report_pool.waitForDone(1000)
+        super().closeEvent(event)
+
+
+def _perfilar_inicializacao(destino: str):
+    """Write the startup profile once the template screen is painted and every screen is built.
+
+    Args:
+        destino: JSON report path ("" for ``startup_profile.default_report_path()``)
+    """
+
+    def concluir():
+        profile = startup_profile.active()
+        if profile is None:
+            return
+        if "first_paint" not in profile.marks or "screens_built" not in profile.marks:
+            QTimer.singleShot(20, concluir)
+            return
+        report = startup_profile.finish()
         try:
-            # Load a fresh copy of the template document for modification
-            template_copy = Document(self.data_model.template_path)
-            
-            # Replace fields in the copy
-            processor.set_document(template_copy)
-            processor.replace_fields(field_mapping, template_copy)
-            
-            # Generate output filename (use patient name if available, otherwise generic)
-            patient_name = self.data_model.patient_data.get("patient_name", "").strip()
-            if patient_name:
-                # Sanitize filename
-                safe_name = "".join(c for c in patient_name if c.isalnum() or c in (' ', '-', '_')).strip()
-                safe_name = safe_name.replace(' ', '_')
-                base_filename = f"laudo_{safe_name}"
-            else:
-                base_filename = "laudo"
-            
-            # Save DOCX
-            docx_path = os.path.join(output_dir, f"{base_filename}.docx")
-            processor.save_document(template_copy, docx_path)
-            
-            # Show success message
-            QMessageBox.information(
-                self,
-                'Sucesso',
-                f'Laudo gerado com sucesso!\n\n'
-                f'DOCX: {docx_path}\n'
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                'Erro ao Gerar Laudo',
-                f'Ocorreu um erro ao gerar o laudo:\n\n{str(e)}'
-            )
+            path = startup_profile.write_report(report, destino or None)
+        except OSError as exc:
+            # windowed (frozen) builds have no console
+            if sys.stderr is not None:
+                print(f"Erro ao salvar o perfil de inicialização: {exc}", file=sys.stderr)
+            return
+        if sys.stdout is not None:
+            print(startup_profile.format_report(report))
+            print(f"\nRelatório salvo em {path}")
+
+    QTimer.singleShot(0, concluir)
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    profile_path, argv = startup_profile.split_argv(sys.argv)
+    app = QApplication(argv)
     window = MainWindow()
+    startup_profile.mark("window_created")
+    if profile_path is not None:
+        _perfilar_inicializacao(profile_path)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Pytest configuration and shared fixtures."""
 import sys
 import os
+import tempfile
 from pathlib import Path
 import pytest
 from unittest.mock import Mock, MagicMock
@@ -9,6 +10,9 @@ from docx import Document
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+# Keep cache snapshots written during the tests out of the user's cache dir
+os.environ.setdefault("PSYR_CACHE_DIR", tempfile.mkdtemp(prefix="psyr-test-cache-"))
+
 @pytest.fixture
 def sample_template_path(tmp_path):
     """Create a sample DOCX template file for testing."""
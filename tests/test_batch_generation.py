@@ -0,0 +1,98 @@
+"""Tests for headless batch report generation (python -m app.batch)."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+
+@pytest.fixture
+def batch_template(tmp_path):
+    """Template with patient, respondent, test and template-field placeholders."""
+    template_path = tmp_path / "template.docx"
+    doc = Document()
+    doc.add_paragraph("Paciente: {nome_paciente}")
+    doc.add_paragraph("Responsável: {resp1_nome}")
+    doc.add_paragraph("QIT: {QIT_WISC} - {QIT_out}")
+    doc.add_paragraph("Cidade: {cidade}")
+    doc.save(str(template_path))
+    return str(template_path)
+
+
+@pytest.mark.integration
+@pytest.mark.document_generation
+class TestBatchGeneration:
+    """Test suite for app.batch."""
+
+    def test_generates_one_docx_per_csv_row(self, tmp_path, batch_template):
+        """Each CSV row is classified and rendered into its own file."""
+        from app.batch import generate_reports
+
+        records = tmp_path / "registros.csv"
+        records.write_text(
+            "patient_name,resp1_name,QIT_WISC,cidade\n"
+            "João Silva,Maria,116,Poá\n"
+            "Ana Souza,Carlos,,\n",
+            encoding="utf-8",
+        )
+
+        written, errors = generate_reports(batch_template, str(records), str(tmp_path / "out"))
+
+        assert errors == []
+        assert [Path(path).name for path in written] == ["laudo_João_Silva.docx", "laudo_Ana_Souza.docx"]
+
+        text = "\n".join(p.text for p in Document(written[0]).paragraphs)
+        assert "Paciente: João Silva" in text
+        assert "Responsável: Maria" in text
+        assert "QIT: 116 - Média superior" in text
+        assert "Cidade: Poá" in text
+
+    def test_jsonl_nested_records_and_duplicate_names(self, tmp_path, batch_template):
+        """Nested JSONL records are accepted and duplicate names do not overwrite each other."""
+        from app.batch import generate_reports
+
+        records = tmp_path / "registros.jsonl"
+        lines = [
+            {"patient": {"patient_name": "Bia"}, "tests": {"ICV_WISC": 100, "IOP_WISC": 90}},
+            {"patient_name": "Bia"},
+        ]
+        records.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+
+        written, errors = generate_reports(batch_template, str(records), str(tmp_path / "out"))
+
+        assert errors == []
+        assert [Path(path).name for path in written] == ["laudo_Bia.docx", "laudo_Bia_2.docx"]
+        text = "\n".join(p.text for p in Document(written[0]).paragraphs)
+        assert "QIT: 95 - Média" in text
+
+    def test_unusable_output_name_falls_back_to_patient_name(self, tmp_path, batch_template):
+        """An output_name that sanitizes to nothing does not produce a hidden ``.docx``."""
+        from app.batch import generate_reports
+
+        records = tmp_path / "registros.csv"
+        records.write_text("patient_name,output_name\nLeo,@@@\n,@@@\nRui,relatorio rui\n", encoding="utf-8")
+
+        written, errors = generate_reports(batch_template, str(records), str(tmp_path / "out"))
+
+        assert errors == []
+        assert [Path(path).name for path in written] == ["laudo_Leo.docx", "laudo.docx", "relatorio_rui.docx"]
+
+    def test_cli_does_not_import_pyside(self, tmp_path, batch_template):
+        """The batch entry point runs headless, without loading Qt."""
+        records = tmp_path / "registros.csv"
+        records.write_text("patient_name\nLeo\n", encoding="utf-8")
+        src_dir = Path(__file__).parent.parent / "src"
+
+        code = (
+            "import sys\n"
+            "from app.batch import main\n"
+            f"status = main([{batch_template!r}, {str(records)!r}, '-o', {str(tmp_path / 'out')!r}])\n"
+            "assert not any(name.startswith('PySide6') for name in sys.modules)\n"
+            "sys.exit(status)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=str(src_dir), capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / "out" / "laudo_Leo.docx").exists()
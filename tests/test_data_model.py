@@ -193,3 +193,441 @@ class TestLaudoDataModel:
 
         assert model.test_results["DIGS_out"] == "Acima da média"
 
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestFieldMappingCache:
+    """Test the memoized, per-slice field mapping."""
+    
+    def test_unchanged_model_returns_cached_mapping(self, populated_data_model):
+        mapping = populated_data_model.get_field_mapping()
+        assert populated_data_model.get_field_mapping() is mapping
+    
+    def test_mapping_is_read_only(self, populated_data_model):
+        mapping = populated_data_model.get_field_mapping()
+        with pytest.raises(TypeError):
+            mapping["patient_name"] = "Outro"
+        copy = dict(mapping)
+        copy["patient_name"] = "Outro"
+        assert populated_data_model.get_field_mapping()["patient_name"] == "João Silva"
+    
+    def test_setter_rebuilds_only_its_slice(self, populated_data_model):
+        """Test that only the changed slice is rebuilt."""
+        first = populated_data_model.get_field_mapping()
+        slices = {slot: entry[2] for slot, entry in populated_data_model._slices.items()}
+        
+        populated_data_model.set_resp1_data({"resp1_career": "Engenheira"})
+        second = populated_data_model.get_field_mapping()
+        
+        assert second is not first
+        assert second["resp1_profissao"] == "Engenheira"
+        assert first["resp1_profissao"] != "Engenheira"
+        for slot, entry in populated_data_model._slices.items():
+            assert (entry[2] is slices[slot]) == (slot != "resp1")
+    
+    def test_conclusion_and_reassigned_attributes_invalidate(self, populated_data_model):
+        populated_data_model.get_field_mapping()
+        populated_data_model.set_conclusion_text("Nova conclusão")
+        assert populated_data_model.get_field_mapping()["conclusao_text"] == "Nova conclusão"
+        
+        populated_data_model.psychologist_data = {"nome_psicologo": "Dr. Paulo", "crp_psicologo": ""}
+        assert populated_data_model.get_field_mapping()["psico_nome"] == "Dr. Paulo"
+    
+    def test_slice_order_is_preserved(self):
+        """Test that later slices still override earlier ones."""
+        model = LaudoDataModel()
+        model.set_conclusion_text("Conclusão")
+        model.set_template_field_values({"conclusao_text": "Do template"})
+        assert model.get_field_mapping()["conclusao_text"] == "Do template"
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestRestrictedFieldMapping:
+    """Test ``get_field_mapping(fields=...)``."""
+    
+    FIELDS = [
+        "nome_paciente", "primeiro_nome_paciente", "resp1_profissao", "resp2_idade", "psico_crp",
+        "QIT_WISC", "QIT_out", "AG_pontuacao", "conclusao_text", "cidade", "campo_inexistente",
+    ]
+    
+    def _model(self, populated_data_model):
+        populated_data_model.set_test_results({"AG_BPA": 85})
+        populated_data_model.set_template_field_values({"cidade": "Poá", "resp1_profissao": "Do template"})
+        return populated_data_model
+    
+    def test_matches_full_mapping(self, populated_data_model):
+        """Test that the restricted mapping equals the full one on the requested names."""
+        model = self._model(populated_data_model)
+        restricted = model.get_field_mapping(fields=self.FIELDS)
+        full = model.get_field_mapping()
+        
+        assert restricted == {name: full[name] for name in self.FIELDS if name in full}
+        assert "campo_inexistente" not in restricted
+        assert restricted["resp1_profissao"] == "Do template"
+        assert restricted["AG_pontuacao"] == "85"
+    
+    def test_resolved_without_building_slices(self, populated_data_model):
+        model = self._model(populated_data_model)
+        restricted = model.get_field_mapping(fields=self.FIELDS)
+        
+        assert model._slices == {}
+        assert set(restricted) < set(model.get_field_mapping())
+    
+    def test_read_only(self, populated_data_model):
+        restricted = populated_data_model.get_field_mapping(fields=["patient_name"])
+        with pytest.raises(TypeError):
+            restricted["patient_name"] = "Outro"
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestIntervalIndex:
+    """Test suite for the precompiled classification interval index."""
+
+    RULES = [
+        {"faixa_min": 0, "faixa_max": 9, "texto": "Baixo"},
+        {"faixa_min": 10, "faixa_max": 19, "texto": "Médio"},
+        {"faixa_min": 15, "faixa_max": 30, "texto": "Alto"},
+    ]
+
+    def test_lookup_matches_closed_intervals_and_clamps(self):
+        from app.services.interval_index import IntervalIndex
+
+        index = IntervalIndex(self.RULES)
+
+        assert index.lookup(0)["texto"] == "Baixo"
+        assert index.lookup(9)["texto"] == "Baixo"
+        assert index.lookup(9.5) is None
+        assert index.lookup(-4)["texto"] == "Baixo"
+        assert index.lookup(99)["texto"] == "Alto"
+        # overlapping rules: the first one in the table wins
+        assert index.lookup(17)["texto"] == "Médio"
+        assert index.lookup(19.5)["texto"] == "Alto"
+
+    def test_malformed_rules_reported_at_compile_time(self):
+        from app.services.interval_index import IntervalIndex
+
+        index = IntervalIndex(self.RULES + [{"faixa_min": "x", "faixa_max": 3}, {"faixa_min": 50, "faixa_max": 40}],
+                              "teste.classificacoes")
+
+        assert len(index.issues) == 2
+        assert all(issue.startswith("teste.classificacoes regra") for issue in index.issues)
+        assert index.lookup(25)["texto"] == "Alto"
+
+    def test_classifier_warns_once_for_malformed_table(self):
+        from app.services.test_result_classifier import TestResultClassifier
+
+        class StubLoader:
+            def load_all(self):
+                return {"neupsilin": {"classificacoes": [{"faixa_min": None, "faixa_max": 5, "texto": "?"},
+                                                         {"faixa_min": 0, "faixa_max": 100, "texto": "Ok"}],
+                                      "campos": [{"entrada": "TASK_NEUP", "saidas": ["TASK_out"]}]}}
+
+        with pytest.warns(UserWarning, match="neupsilin.classificacoes regra 0"):
+            classifier = TestResultClassifier(StubLoader())
+
+        assert classifier.classify_results({"TASK_NEUP": "42"})["TASK_out"] == "Ok"
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestColumnarClassification:
+    """Test suite for TestResultClassifier.classify_many / classify_frame."""
+
+    RECORDS = [
+        {"QIT_WISC": 118, "AG_BPA": "85"},
+        {"ICV_WISC": 100, "IOP_WISC": 90, "AC_BPA": 45, "AD_BPA": 65, "AA_BPA": 90},
+        {"QIT_WISC": "", "QIT_out": "Manual", "DIGS_WISC": 123, "TOTAL_ETADH": "50%"},
+        {"CARS_PONTUACAO": 31, "SRS_ESCORE_TOTAL": 70, "TASK_NEUP": "12,5"},
+        {},
+    ]
+
+    @pytest.fixture
+    def classifier(self):
+        from app.services.test_result_classifier import TestResultClassifier
+        return TestResultClassifier()
+
+    def test_classify_many_matches_classify_results(self, classifier):
+        expected = [classifier.classify_results(record) for record in self.RECORDS]
+
+        assert classifier.classify_many(self.RECORDS) == expected
+        assert expected[1]["QIT_WISC"] == 95
+        assert expected[1]["AG_BPA"] == 67
+
+    def test_classify_many_without_numpy(self, classifier, monkeypatch):
+        import sys
+        monkeypatch.setitem(sys.modules, "numpy", None)
+
+        expected = [classifier.classify_results(record) for record in self.RECORDS]
+        assert classifier.classify_many(self.RECORDS) == expected
+
+    def test_classify_frame_returns_columns(self, classifier):
+        columns = {"QIT_WISC": [118, None, "abc"], "IP_RAVLT": [10, 50, 99]}
+
+        result = classifier.classify_frame(columns)
+
+        assert result["QIT_WISC"] == [118, None, "abc"]
+        assert result["QIT_out"] == ["Média superior", None, None]
+        for row in range(3):
+            expected = classifier.classify_results({key: values[row] for key, values in columns.items()})
+            assert {key: values[row] for key, values in result.items() if values[row] is not None} == \
+                {key: value for key, value in expected.items() if value is not None}
+
+    def test_classify_frame_rejects_ragged_columns(self, classifier):
+        with pytest.raises(ValueError):
+            classifier.classify_frame({"QIT_WISC": [100, 110], "IP_RAVLT": [10]})
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestFieldGraph:
+    """Test the derived/classified fields declared in the tables' ``campos``."""
+
+    RULES = [{"faixa_min": 0, "faixa_max": 49, "texto": "Baixo"},
+             {"faixa_min": 50, "faixa_max": 100, "texto": "Alto"}]
+
+    @pytest.fixture
+    def classifier(self):
+        from app.services.test_result_classifier import TestResultClassifier
+        return TestResultClassifier()
+
+    def _stub(self, tables):
+        from app.services.test_result_classifier import TestResultClassifier
+
+        class StubLoader:
+            def load_all(self):
+                return tables
+
+        return TestResultClassifier(StubLoader())
+
+    def _spy(self, classifier, monkeypatch):
+        calls = []
+        original = classifier._evaluate_node
+        monkeypatch.setattr(classifier, "_evaluate_node",
+                            lambda node, value: (calls.append(node.label), original(node, value))[1])
+        return calls
+
+    def test_only_nodes_reading_present_fields_run(self, classifier, monkeypatch):
+        calls = self._spy(classifier, monkeypatch)
+
+        result = classifier.classify_results({"CI_FDT": 50, "TASK_NEUP": 40, "patient_name": "Ana"})
+
+        assert calls == ["fdt.campos[0]", "neupsilin.campos[0]"]
+        assert "CI_out" in result and "TASK_out" in result
+
+    def test_derived_field_runs_before_its_readers(self):
+        from app.services.field_graph import FieldGraph, FieldNode
+
+        reader = FieldNode("x", {"entrada": "TOTAL", "saidas": ["TOTAL_out"]}, "reader")
+        total = FieldNode("x", {"tipo": "media", "entradas": ["A", "B"], "saida": "TOTAL"}, "total")
+        graph = FieldGraph([reader, total])
+
+        assert [node.label for node in graph.nodes] == ["total", "reader"]
+        assert graph.active(["A"]) == [0, 1]
+        assert graph.active(["TOTAL"]) == [0, 1]
+
+    def test_instrument_declared_only_in_table(self):
+        classifier = self._stub({"novo": {
+            "classificacoes": self.RULES,
+            "campos": [
+                {"entrada": "TOTAL_NOVO", "saidas": ["TOTAL_out"], "pontuacao": ["TOTAL_pontuacao"]},
+                {"tipo": "media", "entradas": ["A_NOVO", "B_NOVO"], "saida": "TOTAL_NOVO", "gravar": True},
+            ],
+        }})
+
+        result = classifier.classify_results({"A_NOVO": 40, "B_NOVO": "70"})
+
+        assert result["TOTAL_NOVO"] == 55
+        assert result["TOTAL_out"] == "Alto"
+        assert result["TOTAL_pontuacao"] == 55
+        assert classifier.classify_many([{"A_NOVO": 40, "B_NOVO": "70"}]) == [result]
+
+    def test_malformed_and_cyclic_fields_reported(self):
+        with pytest.warns(UserWarning) as record:
+            classifier = self._stub({"novo": {
+                "classificacoes": self.RULES,
+                "campos": [
+                    {"entrada": "X", "saidas": "X_out"},
+                    {"tipo": "media", "entradas": ["B"], "saida": "A"},
+                    {"tipo": "media", "entradas": ["A"], "saida": "B"},
+                    {"entrada": "C", "saidas": ["C_out"]},
+                ],
+            }})
+
+        messages = [str(warning.message) for warning in record]
+        assert any(message.startswith("novo.campos[0]: 'saidas'") for message in messages)
+        assert any("ciclo" in message and "novo.campos[1]" in message for message in messages)
+        assert classifier.classify_results({"C": 10}) == {"C": 10, "C_out": "Baixo"}
+
+    def test_session_reevaluates_only_changed_inputs(self, classifier, monkeypatch):
+        calls = self._spy(classifier, monkeypatch)
+        session = classifier.session()
+        record = {"ICV_WISC": 100, "IOP_WISC": 90, "CI_FDT": 50}
+
+        first = session.classify_results(dict(record))
+        calls.clear()
+        record["IOP_WISC"] = 120
+        second = session.classify_results(dict(record))
+
+        # IOP itself, then the QIT mean and QIT classification that read it
+        assert calls == ["wisc.campos[0]", "wisc.campos[1]", "wisc.campos[3]"]
+        assert second == classifier.classify_results(record)
+        assert first != second
+
+    def test_session_matches_classify_results(self, classifier):
+        session = classifier.session()
+        for record in TestColumnarClassification.RECORDS + [{"AG_BPA": "abc", "AC_BPA": 40}]:
+            assert session.classify_results(record) == classifier.classify_results(record)
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestNarrativeTemplates:
+    """Test the compiled ``opcoes_texto_analise`` texts."""
+
+    @pytest.fixture
+    def classifier(self):
+        from app.services.test_result_classifier import TestResultClassifier
+        return TestResultClassifier()
+
+    @staticmethod
+    def _fill_and_tidy(text, classification, complement):
+        """Reference: the chained replacements the templates are compiled from."""
+        text = text.replace("[CLASSIFICAÇÃO AQUI]", classification).replace("[COMPLEMENTO AQUI]", complement)
+        return " ".join(text.replace(" ,", ",").replace(" .", ".").split())
+
+    @pytest.mark.parametrize("text", [
+        "O ICV foi [CLASSIFICAÇÃO AQUI], indicando [COMPLEMENTO AQUI] .",
+        "  [CLASSIFICAÇÃO AQUI]  , e\t[COMPLEMENTO AQUI]",
+        "[CLASSIFICAÇÃO AQUI][COMPLEMENTO AQUI] .fim ,",
+        "Sem campos , só texto .",
+        "",
+    ])
+    @pytest.mark.parametrize("classification,complement", [
+        ("Média", "bom resultado"),
+        (" Média  alta ", ", com ressalvas"),
+        ("", "[CLASSIFICAÇÃO AQUI]"),
+    ])
+    def test_render_matches_fill_and_tidy(self, text, classification, complement):
+        from app.services.narrative_template import CLASSIFICATION, COMPLEMENT, NarrativeTemplate
+
+        template = NarrativeTemplate(text)
+        rendered = template.render({CLASSIFICATION: classification, COMPLEMENT: complement})
+
+        assert rendered == self._fill_and_tidy(text, classification, complement)
+
+    def test_literal_segments_tidied_at_compile_time(self):
+        from app.services.narrative_template import NarrativeTemplate
+
+        template = NarrativeTemplate("  Foi [CLASSIFICAÇÃO AQUI] , indicando   [COMPLEMENTO AQUI] . ")
+
+        assert template.pieces == ("Foi ", None, ", indicando ", None, ".")
+
+    def test_wisc_texts(self, classifier):
+        result = classifier.classify_results({"QIT_WISC": 100, "ICV_WISC": 100})
+
+        assert result["QIT_conclusao"].startswith(f"{result['QIT_out']}. ")
+        assert result["ICV_text_out"] == (
+            "O Índice de Compreensão Verbal (ICV) avalia a formação de conceitos verbais, raciocínio verbal e "
+            f"conhecimento adquirido. Seu desempenho foi classificado como {result['ICV_out']}, indicando "
+            "resultados coerentes com as habilidades verbais observadas."
+        )
+
+    def test_htp_options(self, classifier):
+        assert classifier.analysis_text("htp", "HTP_CONECTOR", option=1) == "Além disso,"
+        assert classifier.analysis_text("htp", "HTP_CONECTOR", option=3) is None
+        assert classifier.analysis_text("htp", "HTP_INEXISTENTE") is None
+
+    def test_analysis_text_memoized(self, classifier, monkeypatch):
+        from app.services.narrative_template import NarrativeTemplate
+
+        renders = []
+        original = NarrativeTemplate.render
+        monkeypatch.setattr(NarrativeTemplate, "render",
+                            lambda self, values: (renders.append(self.source), original(self, values))[1])
+
+        texts = {classifier.analysis_text("wisc", "ICV_text_out", "Média") for _ in range(3)}
+
+        assert len(texts) == 1 and len(renders) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.data_model
+class TestAgeNorms:
+    """Test suite for age-banded norm tables (``normas``)."""
+
+    NORMS = {
+        "DIGS": {
+            "entrada": "DIGS_WISC_bruto",
+            "saida": "DIGS_WISC",
+            "faixas_idade": [6, 8],
+            "idade_max": 10,
+            "pontos_brutos": [[0, 5, 10], [0, 8, 14]],
+            "valores": [[70, 100, 125], [70, 100, 125]],
+        }
+    }
+
+    @pytest.fixture
+    def classifier(self):
+        from app.services.test_result_classifier import TestResultClassifier
+        from app.services.test_tables_loader import TestTablesLoader as TablesLoader
+
+        tables = dict(TablesLoader().load_all())
+        tables["wisc"] = dict(tables["wisc"], normas=self.NORMS)
+
+        class StubLoader:
+            def load_all(self):
+                return tables
+
+        return TestResultClassifier(StubLoader())
+
+    def test_norm_table_lookup_by_age_band_and_raw_score(self):
+        from app.services.norm_table import NormTable
+
+        norm = NormTable("DIGS", self.NORMS["DIGS"])
+
+        assert norm.lookup(6, 0) == 70
+        assert norm.lookup(7.5, 9) == 100
+        assert norm.lookup(8, 9) == 100
+        assert norm.lookup(9, 14) == 125
+        assert norm.lookup(5, 9) is None
+        assert norm.lookup(10, 9) is None
+        assert norm.lookup(6, -1) is None
+
+    def test_raw_score_converted_then_classified(self, classifier):
+        result = classifier.classify_results({"DIGS_WISC_bruto": "12"}, age="7")
+
+        assert result["DIGS_WISC"] == 125
+        assert result["DIGS_out"] == "Acima da média"
+        # a scaled score typed by the user wins over the norm lookup
+        assert classifier.classify_results({"DIGS_WISC_bruto": 12, "DIGS_WISC": 100}, age=7)["DIGS_WISC"] == 100
+        assert "DIGS_WISC" not in classifier.classify_results({"DIGS_WISC_bruto": 12})
+
+    def test_columnar_classification_uses_ages(self, classifier):
+        records = [{"DIGS_WISC_bruto": 12}, {"DIGS_WISC_bruto": 12, "patient_crono_age": "8"}, {"DIGS_WISC_bruto": 3}]
+        ages = [7, None, 20]
+
+        assert classifier.classify_many(records, ages) == [
+            classifier.classify_results(record, age) for record, age in zip(records, ages)
+        ]
+
+    def test_malformed_norms_reported(self):
+        from app.services.test_result_classifier import TestResultClassifier
+
+        class StubLoader:
+            def load_all(self):
+                return {"wisc": {"normas": {"DIGS": {"entrada": "A", "saida": "B", "faixas_idade": [8, 6],
+                                                     "pontos_brutos": [[0], [0]], "valores": [[1], [1]]}}}}
+
+        with pytest.warns(UserWarning, match="wisc.normas.DIGS: 'faixas_idade' deve estar em ordem crescente"):
+            TestResultClassifier(StubLoader())
+
+    def test_data_model_passes_patient_age(self, classifier):
+        model = LaudoDataModel()
+        model._test_classifier = classifier
+        model.set_patient_data({"patient_crono_age": "9"})
+        model.set_test_results({"DIGS_WISC_bruto": 10})
+
+        assert model.test_results["DIGS_WISC"] == 100
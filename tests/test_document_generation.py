@@ -118,6 +118,654 @@ class TestTemplateProcessorFieldReplacement:
         assert doc.sections[0].footer.paragraphs[0].text == "CRP 06/123456"
 
 
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestSinglePassReplacementEngine:
+    """Test suite for the single-pass replacement engine."""
+
+    @staticmethod
+    def _build_template(path):
+        doc = Document()
+        para = doc.add_paragraph()
+        para.add_run("Paciente: {pati")
+        bold = para.add_run("ent_na")
+        bold.bold = True
+        para.add_run("me}, idade {patient_crono_age} e {campo_ausente}.")
+        doc.add_paragraph("Sem campos aqui")
+        split = doc.add_paragraph()
+        for piece in ("{", "resp1", "_", "nome", "}", " e {resp2_nome}"):
+            split.add_run(piece)
+
+        table = doc.add_table(rows=2, cols=3)
+        table.cell(0, 0).merge(table.cell(0, 1))
+        table.cell(0, 2).merge(table.cell(1, 2))
+        table.cell(0, 0).paragraphs[0].add_run("{patient_name}")
+        table.cell(0, 2).paragraphs[0].add_run("{psico_crp} / {psico_nome}")
+        table.cell(1, 0).paragraphs[0].add_run("{zero}")
+
+        doc.sections[0].header.paragraphs[0].text = "{psico_nome}"
+        doc.sections[0].footer.paragraphs[0].text = "{psico_crp}"
+        doc.add_section()
+        doc.save(str(path))
+        return str(path)
+
+    @staticmethod
+    def _xml_parts(doc):
+        return {
+            str(part.partname): part.blob
+            for part in doc.part.package.iter_parts()
+            if str(part.partname).endswith(".xml")
+        }
+
+    def test_single_pass_matches_legacy_xml(self, tmp_path):
+        """Both engines must produce byte-identical XML for every part."""
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = self._build_template(tmp_path / "template.docx")
+        field_mapping = {
+            "patient_name": "João Silva",
+            "patient_crono_age": "14",
+            "resp1_nome": "Maria",
+            "resp2_nome": "",
+            "psico_nome": "Dr. Ana Paula",
+            "psico_crp": "CRP 06/123456",
+            "zero": 0,
+        }
+
+        blobs = []
+        for engine in (TemplateProcessor.ENGINE_LEGACY, TemplateProcessor.ENGINE_SINGLE_PASS):
+            doc = Document(template_path)
+            TemplateProcessor(doc, engine=engine).replace_fields(field_mapping)
+            blobs.append(self._xml_parts(doc))
+
+        assert blobs[0] == blobs[1]
+
+    def test_single_pass_selected_per_call(self):
+        """The engine can be overridden for a single replace_fields call."""
+        from app.services.template_processor import TemplateProcessor
+
+        doc = Document()
+        para = doc.add_paragraph()
+        para.add_run("{patient")
+        para.add_run("_name} fim")
+
+        processor = TemplateProcessor(doc)
+        processor.replace_fields({"patient_name": "João"}, engine=TemplateProcessor.ENGINE_SINGLE_PASS)
+
+        assert [run.text for run in para.runs] == ["João", " fim"]
+
+    def test_unknown_engine_rejected(self):
+        """Unknown engine names raise ValueError."""
+        from app.services.template_processor import TemplateProcessor
+
+        with pytest.raises(ValueError):
+            TemplateProcessor(engine="turbo")
+
+
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestDocumentTraversal:
+    """Test suite for visiting each paragraph of a template exactly once."""
+
+    @staticmethod
+    def _build_document():
+        doc = Document()
+        doc.add_paragraph("{patient_name}")
+        table = doc.add_table(rows=2, cols=4)
+        table.cell(0, 0).merge(table.cell(0, 3))
+        table.cell(0, 0).paragraphs[0].add_run("{score_total}")
+        table.cell(1, 0).merge(table.cell(1, 1)).paragraphs[0].add_run("{score_a}")
+        nested = table.cell(1, 3).add_table(rows=1, cols=2)
+        nested.cell(0, 1).paragraphs[0].add_run("{score_nested}")
+
+        doc.sections[0].header.paragraphs[0].text = "{psico_nome}"
+        doc.sections[0].footer.paragraphs[0].text = "{psico_crp}"
+        for _ in range(4):
+            doc.add_section()
+        return doc
+
+    def test_each_paragraph_visited_once(self):
+        """Linked headers/footers and merged cells are traversed a single time."""
+        from app.services import placeholder_engine
+
+        doc = self._build_document()
+        paragraphs = list(placeholder_engine.iter_document_paragraphs(doc))
+
+        assert len(paragraphs) == len(set(paragraphs))
+        headers = [p for p in paragraphs if "{psico_nome}" in placeholder_engine.read_paragraph(p)[2]]
+        cells = [p for p in paragraphs if "{score_total}" in placeholder_engine.read_paragraph(p)[2]]
+        assert len(headers) == 1
+        assert len(cells) == 1
+
+    def test_nested_tables_extracted_and_replaced(self):
+        """Placeholders inside nested tables are found and replaced by both engines."""
+        from app.services.template_processor import TemplateProcessor
+
+        for engine in TemplateProcessor.ENGINES:
+            doc = self._build_document()
+            processor = TemplateProcessor(doc, engine=engine)
+            assert processor.extract_fields() == {
+                "patient_name", "score_total", "score_a", "score_nested", "psico_nome", "psico_crp",
+            }
+
+            processor.replace_fields({"score_nested": "12"})
+            nested = doc.tables[0].cell(1, 3).tables[0]
+            assert nested.cell(0, 1).text == "12"
+
+    def test_legacy_replacement_visits_paragraphs_once(self, mocker):
+        """The legacy engine patches shared headers and merged cells once."""
+        from app.services.template_processor import TemplateProcessor
+
+        doc = self._build_document()
+        processor = TemplateProcessor(doc)
+        spy = mocker.spy(processor, "_replace_in_paragraph")
+        processor.replace_fields({"psico_nome": "Dr. Ana"})
+
+        visited = [call.args[0]._p for call in spy.call_args_list]
+        assert len(visited) == len(set(visited))
+        assert doc.sections[3].header.paragraphs[0].text == "Dr. Ana"
+
+    def test_extraction_does_not_add_headers(self):
+        """Reading a document without headers or footers leaves its parts unchanged."""
+        from app.services.template_processor import TemplateProcessor
+
+        doc = Document()
+        doc.add_paragraph("{patient_name}")
+        partnames = {str(part.partname) for part in doc.part.package.iter_parts()}
+
+        assert TemplateProcessor(doc).extract_fields() == {"patient_name"}
+        assert {str(part.partname) for part in doc.part.package.iter_parts()} == partnames
+
+
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestStoryPartScanning:
+    """Test suite for placeholders outside the body/default header scope."""
+
+    W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ALL_FIELDS = {
+        "patient_name", "textbox_field", "inline_sdt", "block_sdt", "first_header",
+        "even_header", "comment_field", "footnote_field", "endnote_field",
+    }
+
+    @classmethod
+    def _notes_xml(cls, kind, field):
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:{kind}s {cls.W_NS}><w:{kind} w:id="1"><w:p>'
+            f'<w:r><w:t>Nota {{{field[:4]}</w:t></w:r><w:r><w:t>{field[4:]}}}</w:t></w:r>'
+            f'</w:p></w:{kind}></w:{kind}s>'
+        )
+
+    @classmethod
+    def _build_template(cls, path):
+        import zipfile
+        from docx.oxml import parse_xml
+
+        doc = Document()
+        body = doc.add_paragraph("{patient_name}")
+        body._p.append(parse_xml(
+            f'<w:r {cls.W_NS} xmlns:v="urn:schemas-microsoft-com:vml"><w:pict><v:shape><v:textbox>'
+            f'<w:txbxContent><w:p><w:r><w:t>{{textbox_field}}</w:t></w:r></w:p></w:txbxContent>'
+            f'</v:textbox></v:shape></w:pict></w:r>'
+        ))
+        body._p.append(parse_xml(
+            f'<w:sdt {cls.W_NS}><w:sdtContent><w:r><w:t>{{inline_</w:t></w:r>'
+            f'<w:r><w:t>sdt}}</w:t></w:r></w:sdtContent></w:sdt>'
+        ))
+        doc.element.body.insert(0, parse_xml(
+            f'<w:sdt {cls.W_NS}><w:sdtContent><w:p><w:r><w:t>{{block_sdt}}</w:t></w:r></w:p>'
+            f'</w:sdtContent></w:sdt>'
+        ))
+
+        section = doc.sections[0]
+        section.different_first_page_header_footer = True
+        section.first_page_header.paragraphs[0].text = "{first_header}"
+        doc.settings.odd_and_even_pages_header_footer = True
+        section.even_page_header.paragraphs[0].text = "{even_header}"
+        doc.add_comment(body.runs[0], text="{comment_field}")
+        doc.save(str(path))
+
+        # python-docx cannot create notes: add them to the package directly
+        with zipfile.ZipFile(path) as source:
+            entries = {name: source.read(name) for name in source.namelist()}
+        entries["word/footnotes.xml"] = cls._notes_xml("footnote", "footnote_field").encode()
+        entries["word/endnotes.xml"] = cls._notes_xml("endnote", "endnote_field").encode()
+        entries["[Content_Types].xml"] = entries["[Content_Types].xml"].replace(
+            b"</Types>",
+            b'<Override PartName="/word/footnotes.xml" ContentType="application/vnd.openxmlformats-'
+            b'officedocument.wordprocessingml.footnotes+xml"/>'
+            b'<Override PartName="/word/endnotes.xml" ContentType="application/vnd.openxmlformats-'
+            b'officedocument.wordprocessingml.endnotes+xml"/></Types>',
+        )
+        entries["word/_rels/document.xml.rels"] = entries["word/_rels/document.xml.rels"].replace(
+            b"</Relationships>",
+            b'<Relationship Id="rIdFn" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            b'relationships/footnotes" Target="footnotes.xml"/>'
+            b'<Relationship Id="rIdEn" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            b'relationships/endnotes" Target="endnotes.xml"/></Relationships>',
+        )
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+            for name, data in entries.items():
+                target.writestr(name, data)
+        return str(path)
+
+    @staticmethod
+    def _saved_text(doc, tmp_path):
+        import zipfile
+
+        output = tmp_path / "output.docx"
+        doc.save(str(output))
+        with zipfile.ZipFile(output) as package:
+            return {name: package.read(name).decode("utf-8") for name in package.namelist() if name.endswith(".xml")}
+
+    def test_extract_fields_covers_every_story_part(self, tmp_path):
+        """Text boxes, content controls, first/even headers, comments and notes are scanned."""
+        from app.services.compiled_template import CompiledTemplate
+
+        template_path = self._build_template(tmp_path / "template.docx")
+
+        assert TemplateProcessor().extract_fields(Document(template_path)) == self.ALL_FIELDS
+        assert CompiledTemplate(template_path).fields == self.ALL_FIELDS
+
+    @pytest.mark.parametrize("mode", ["legacy", "single_pass", "compiled", "plan"])
+    def test_replace_fields_covers_every_story_part(self, tmp_path, mode):
+        """Every placeholder is replaced and the patched notes are saved."""
+        from app.services.compiled_template import CompiledTemplate
+
+        template_path = self._build_template(tmp_path / "template.docx")
+        mapping = {name: f"[{name.upper()}]" for name in self.ALL_FIELDS}
+
+        if mode in ("legacy", "single_pass"):
+            doc = Document(template_path)
+            TemplateProcessor(doc, engine=mode).replace_fields(mapping)
+        else:
+            compiled = CompiledTemplate(template_path)
+            doc = compiled.new_document()
+            processor = TemplateProcessor(doc)
+            if mode == "compiled":
+                processor.replace_fields(mapping, doc, compiled=compiled)
+            else:
+                processor.replace_fields(mapping, doc, plan=processor.render_plan(doc, mapping, compiled=compiled))
+
+        parts = self._saved_text(doc, tmp_path)
+        combined = "".join(parts.values())
+        for name, value in mapping.items():
+            assert "{" + name not in combined
+            assert value in combined
+        assert "[FOOTNOTE_FIELD]" in parts["word/footnotes.xml"]
+        assert "[ENDNOTE_FIELD]" in parts["word/endnotes.xml"]
+
+    def test_legacy_matches_single_pass_in_content_controls(self, tmp_path):
+        """Both engines see the runs of inline content controls and produce the same XML."""
+        from docx.oxml import parse_xml
+        from app.services import placeholder_engine
+
+        doc = Document()
+        para = doc.add_paragraph("A {x} ")
+        para._p.append(parse_xml(f'<w:sdt {self.W_NS}><w:sdtContent><w:r><w:t>{{y}}</w:t></w:r>'
+                                 f'</w:sdtContent></w:sdt>'))
+        para._p.append(parse_xml(f'<w:r {self.W_NS}><w:t xml:space="preserve"> B {{z}}</w:t></w:r>'))
+        doc.save(str(tmp_path / "inline.docx"))
+        self._build_template(tmp_path / "stories.docx")
+        mapping = {"x": "1", "y": "2", "z": "3", **{name: name.upper() for name in self.ALL_FIELDS}}
+
+        for name in ("inline.docx", "stories.docx"):
+            blobs = []
+            for engine in (TemplateProcessor.ENGINE_LEGACY, TemplateProcessor.ENGINE_SINGLE_PASS):
+                filled = Document(str(tmp_path / name))
+                TemplateProcessor(filled, engine=engine).replace_fields(mapping)
+                blobs.append(TestSinglePassReplacementEngine._xml_parts(filled))
+                if name == "inline.docx":
+                    assert placeholder_engine.read_paragraph(filled.paragraphs[0]._p)[1] == ["A 1 ", "2", " B 3"]
+            assert blobs[0] == blobs[1], name
+
+    @pytest.mark.parametrize("mode", ["legacy", "single_pass", "compiled"])
+    def test_placeholders_after_hyperlink(self, tmp_path, mode):
+        """Hyperlink runs are indexed too, so later placeholders keep their offsets."""
+        from docx.oxml import parse_xml
+        from app.services.compiled_template import CompiledTemplate
+
+        doc = Document()
+        para = doc.add_paragraph("Veja ")
+        para._p.append(parse_xml(
+            f'<w:hyperlink {self.W_NS} xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+            f' r:id="rId99"><w:r><w:t>www.site.com.br</w:t></w:r></w:hyperlink>'
+        ))
+        para._p.append(parse_xml(f'<w:r {self.W_NS}><w:t xml:space="preserve"> e {{nome}} fim {{idade}} ok</w:t></w:r>'))
+        template_path = str(tmp_path / "template.docx")
+        doc.save(template_path)
+        mapping = {"nome": "ANA", "idade": "9"}
+
+        if mode == "compiled":
+            compiled = CompiledTemplate(template_path)
+            filled = compiled.new_document()
+            TemplateProcessor(filled).replace_fields(mapping, filled, compiled=compiled)
+        else:
+            filled = Document(template_path)
+            TemplateProcessor(filled, engine=mode).replace_fields(mapping)
+
+        assert filled.paragraphs[0].text == "Veja www.site.com.br e ANA fim 9 ok"
+
+    def test_parts_without_placeholders_stay_unparsed(self, tmp_path):
+        """Raw parts are only parsed when their bytes contain a brace."""
+        from docx.opc.part import XmlPart
+
+        template_path = self._build_template(tmp_path / "template.docx")
+        doc = Document(template_path)
+        notes = {str(part.partname): part for part in doc.part.package.iter_parts()
+                 if str(part.partname).endswith("notes.xml")}
+        notes["/word/endnotes.xml"]._blob = notes["/word/endnotes.xml"].blob.replace(b"{", b"(")
+
+        TemplateProcessor(doc, engine=TemplateProcessor.ENGINE_SINGLE_PASS).replace_fields({})
+
+        assert isinstance(notes["/word/footnotes.xml"], XmlPart)
+        assert not isinstance(notes["/word/endnotes.xml"], XmlPart)
+
+    def test_stream_fields_reads_in_chunks(self, tmp_path):
+        """Streaming a raw part in small chunks finds the same fields as parsing it."""
+        from app.services import placeholder_engine
+
+        blob = self._notes_xml("footnote", "footnote_field").encode()
+        blob = blob.replace(b"</w:footnote></w:footnotes>",
+                            b"".join(b'<w:p %s><w:r><w:t>{note_%d}</w:t></w:r></w:p>' % (self.W_NS.encode(), index)
+                                     for index in range(50)) + b"</w:footnote></w:footnotes>")
+        expected = {"footnote_field"} | {f"note_{index}" for index in range(50)}
+
+        assert placeholder_engine.stream_fields(blob) == expected
+        for chunk_size in (1, 7, 64):
+            assert placeholder_engine.stream_fields(blob, chunk_size=chunk_size) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestCompiledTemplate:
+    """Test suite for compiled templates and their cache."""
+
+    def test_fill_matches_legacy_replacement(self, tmp_path):
+        """Filling a compiled template gives the same XML as open + replace."""
+        from app.services.compiled_template import CompiledTemplate
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = TestSinglePassReplacementEngine._build_template(tmp_path / "template.docx")
+        field_mapping = {"patient_name": "João Silva", "resp1_nome": "Maria", "psico_nome": "Dr. Ana"}
+
+        compiled = CompiledTemplate(template_path)
+        filled = compiled.fill(field_mapping)
+
+        expected = Document(template_path)
+        TemplateProcessor(expected).replace_fields(field_mapping)
+
+        assert compiled.fields == TemplateProcessor().extract_fields(Document(template_path))
+        assert TestSinglePassReplacementEngine._xml_parts(filled) == TestSinglePassReplacementEngine._xml_parts(expected)
+
+    def test_fills_are_independent(self, tmp_path):
+        """Each fill starts from the pristine template."""
+        from app.services.compiled_template import CompiledTemplate
+
+        template_path = tmp_path / "template.docx"
+        doc = Document()
+        doc.add_paragraph("Paciente: {patient_name}")
+        doc.save(str(template_path))
+
+        compiled = CompiledTemplate(str(template_path))
+        first = compiled.fill({"patient_name": "Ana"})
+        second = compiled.fill({"patient_name": "Bruno"})
+
+        assert first.paragraphs[0].text == "Paciente: Ana"
+        assert second.paragraphs[0].text == "Paciente: Bruno"
+        assert compiled.new_document().paragraphs[0].text == "Paciente: {patient_name}"
+
+    def test_cache_detects_template_changes(self, tmp_path):
+        """The cache returns the same object until the file changes on disk."""
+        from app.services.compiled_template import CompiledTemplateCache
+
+        template_path = tmp_path / "template.docx"
+        doc = Document()
+        doc.add_paragraph("{patient_name}")
+        doc.save(str(template_path))
+
+        cache = CompiledTemplateCache()
+        compiled = cache.get(str(template_path))
+        assert cache.get(str(template_path)) is compiled
+
+        doc.add_paragraph("{patient_birth}")
+        doc.save(str(template_path))
+        stat = os.stat(template_path)
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        recompiled = cache.get(str(template_path))
+        assert recompiled is not compiled
+        assert recompiled.fields == {"patient_name", "patient_birth"}
+
+    def test_replace_fields_uses_compiled_patches(self, tmp_path):
+        """replace_fields applies the precomputed patches of a compiled template."""
+        from app.services.compiled_template import CompiledTemplate
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = tmp_path / "template.docx"
+        doc = Document()
+        para = doc.add_paragraph()
+        para.add_run("{patient")
+        para.add_run("_name}!")
+        doc.save(str(template_path))
+
+        compiled = CompiledTemplate(str(template_path))
+        copy = compiled.new_document()
+        TemplateProcessor(copy).replace_fields({"patient_name": "João"}, copy, compiled=compiled)
+
+        assert copy.paragraphs[0].text == "João!"
+
+
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestRenderPlan:
+    """Test suite for single-traversal render plans."""
+
+    FIELD_MAPPING = {
+        "patient_name": "João Silva",
+        "patient_crono_age": "14",
+        "resp1_nome": "Maria",
+        "resp2_nome": "",
+        "psico_nome": "Dr. Ana Paula",
+        "psico_crp": "CRP 06/123456",
+        "zero": 0,
+    }
+
+    @pytest.mark.parametrize("use_compiled", [False, True])
+    def test_plan_matches_replace_fields(self, tmp_path, use_compiled):
+        """Applying a plan gives the same XML as replace_fields."""
+        from app.services.compiled_template import CompiledTemplate
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = TestSinglePassReplacementEngine._build_template(tmp_path / "template.docx")
+        compiled = CompiledTemplate(template_path) if use_compiled else None
+
+        doc = compiled.new_document() if compiled else Document(template_path)
+        processor = TemplateProcessor(doc)
+        plan = processor.render_plan(doc, self.FIELD_MAPPING, compiled=compiled)
+        processor.replace_fields(self.FIELD_MAPPING, doc, plan=plan)
+
+        expected = Document(template_path)
+        TemplateProcessor(expected, engine=TemplateProcessor.ENGINE_SINGLE_PASS).replace_fields(self.FIELD_MAPPING)
+
+        assert TestSinglePassReplacementEngine._xml_parts(doc) == TestSinglePassReplacementEngine._xml_parts(expected)
+
+    def test_plan_reports_fields(self, tmp_path):
+        """The plan carries the fields, their validation and missing/empty ones."""
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = TestSinglePassReplacementEngine._build_template(tmp_path / "template.docx")
+        doc = Document(template_path)
+        processor = TemplateProcessor(doc)
+        plan = processor.render_plan(doc, self.FIELD_MAPPING)
+
+        assert plan.fields == processor.extract_fields(Document(template_path))
+        assert plan.missing_fields == ["campo_ausente"]
+        assert (plan.missing_fields, plan.empty_fields) == processor.check_required_fields(sorted(plan.fields), self.FIELD_MAPPING)
+        assert "resp2_nome" in plan.empty_fields
+        assert (plan.valid_fields, plan.invalid_fields) == processor.validate_fields(fields=sorted(plan.fields))
+        # planning alone leaves the document untouched
+        assert "{patient_crono_age}" in doc.paragraphs[0].text
+
+    def test_plan_for_other_document_rejected(self, tmp_path):
+        """A plan can only be applied to the document it was built for."""
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = TestSinglePassReplacementEngine._build_template(tmp_path / "template.docx")
+        planned = Document(template_path)
+        processor = TemplateProcessor(planned)
+        plan = processor.render_plan(planned, self.FIELD_MAPPING)
+
+        with pytest.raises(ValueError):
+            processor.replace_fields(self.FIELD_MAPPING, Document(template_path), plan=plan)
+
+
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestTemplateNormalization:
+    """Test suite for merging the runs Word splits placeholders into."""
+
+    @staticmethod
+    def _split_template(path):
+        from docx.oxml import parse_xml
+
+        w_ns = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        doc = Document()
+        para = doc.add_paragraph()
+        for piece in ("Paciente: {", "patient", "_name", "} ", "{resp1_nome}"):
+            para.add_run(piece)
+        para._p.insert(3, parse_xml(f'<w:proofErr {w_ns} w:type="spellStart"/>'))
+        para.runs[2]._r.append(parse_xml(f'<w:lastRenderedPageBreak {w_ns}/>'))
+        bold = para.add_run(" negrito")
+        bold.bold = True
+        para.add_run(" {psico_")
+        para.add_run("nome}")
+        doc.save(str(path))
+        return str(path)
+
+    def test_normalize_template_merges_identical_runs(self, tmp_path):
+        """Runs with the same formatting are merged and the copy is saved alongside."""
+        from app.services.template_normalizer import normalize_template
+
+        template_path = self._split_template(tmp_path / "template.docx")
+        report = normalize_template(template_path)
+
+        assert report.output_path == str(tmp_path / "template.normalized.docx")
+        assert report.runs_removed == 5
+        assert report.markers_removed == 2
+        assert report.bytes_before == os.path.getsize(template_path)
+        assert report.bytes_removed == report.bytes_before - os.path.getsize(report.output_path)
+
+        original = Document(template_path).paragraphs[0]
+        normalized = Document(report.output_path).paragraphs[0]
+        assert normalized.text == original.text
+        assert [run.text for run in normalized.runs] == [
+            "Paciente: {patient_name} {resp1_nome}", " negrito", " {psico_nome}",
+        ]
+        assert normalized.runs[1].bold
+
+    def test_normalized_compile_uses_single_runs(self, tmp_path):
+        """A template compiled with normalize=True fills each placeholder in one run."""
+        from app.services.compiled_template import CompiledTemplate
+
+        template_path = self._split_template(tmp_path / "template.docx")
+        mapping = {"patient_name": "Ana", "resp1_nome": "Maria", "psico_nome": "Dr. João"}
+
+        compiled = CompiledTemplate(template_path, normalize=True)
+        plain = CompiledTemplate(template_path)
+
+        assert compiled.normalization.runs_removed == 5
+        assert compiled.fields == plain.fields
+        assert all(len(site.run_texts) == 3 for site in compiled.sites)
+        assert compiled.fill(mapping).paragraphs[0].text == plain.fill(mapping).paragraphs[0].text
+
+        output_path = tmp_path / "laudo.docx"
+        compiled.save(compiled.fill(mapping), str(output_path))
+        assert Document(str(output_path)).paragraphs[0].text == "Paciente: Ana Maria negrito Dr. João"
+
+    def test_cli_does_not_import_pyside(self, tmp_path):
+        """The normalize entry point runs headless, without loading Qt."""
+        import subprocess
+        import sys
+
+        template_path = self._split_template(tmp_path / "template.docx")
+        output_path = tmp_path / "saida.docx"
+        code = (
+            "import sys\n"
+            "from app.normalize import main\n"
+            f"status = main([{template_path!r}, '-o', {str(output_path)!r}])\n"
+            "assert not any(name.startswith('PySide6') for name in sys.modules)\n"
+            "sys.exit(status)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=str(Path(__file__).parent.parent / "src"),
+                                capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert output_path.exists()
+
+
+@pytest.mark.integration
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestRenderMany:
+    """Test suite for rendering many records against one template."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_render_many_writes_one_file_per_record(self, tmp_path, sample_template_path, workers):
+        """Results come back in input order with unique output paths."""
+        from app.services.report_renderer import render_many
+
+        records = [{"patient_name": "Ana"}, {"patient_name": "Bruno"}, {"patient_name": "Ana"}]
+        calls = []
+
+        results = render_many(
+            sample_template_path, records, str(tmp_path / "out"),
+            workers=workers, progress=lambda done, total, result: calls.append((done, total)),
+        )
+
+        assert [result.index for result in results] == [0, 1, 2]
+        assert [os.path.basename(result.output_path) for result in results] == [
+            "laudo_Ana.docx", "laudo_Bruno.docx", "laudo_Ana_2.docx",
+        ]
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+        assert Document(results[1].output_path).paragraphs[0].text.startswith("Template with Bruno and ")
+
+    def test_render_many_suffix_never_reuses_a_name(self, tmp_path, sample_template_path):
+        """A duplicate's suffixed name does not overwrite another record's file."""
+        from app.services.report_renderer import render_many
+
+        records = [{"patient_name": "Ana"}, {"patient_name": "Ana"}, {"patient_name": "Ana 2"},
+                   {"patient_name": "ana"}]
+
+        results = render_many(sample_template_path, records, str(tmp_path / "out"), workers=1)
+
+        assert [os.path.basename(result.output_path) for result in results] == [
+            "laudo_Ana.docx", "laudo_Ana_2.docx", "laudo_Ana_2_2.docx", "laudo_ana_3.docx",
+        ]
+        assert len(os.listdir(tmp_path / "out")) == 4
+
+    def test_render_many_reports_errors_per_record(self, tmp_path, sample_template_path):
+        """A failing record does not stop the others."""
+        from app.services.report_renderer import render_many
+
+        out_dir = tmp_path / "out"
+        (out_dir / "bloqueado.docx").mkdir(parents=True)
+        records = iter([("bloqueado", {"patient_name": "X"}), ("livre", {"patient_name": "Y"})])
+
+        results = render_many(sample_template_path, records, str(out_dir), workers=2, ordered=False)
+
+        by_index = {result.index: result for result in results}
+        assert not by_index[0].ok and by_index[0].output_path is None
+        assert by_index[1].ok and os.path.exists(by_index[1].output_path)
+
+
 @pytest.mark.unit
 @pytest.mark.document_generation
 @pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
@@ -156,6 +804,90 @@ class TestDocumentSaving:
         assert os.path.exists(output_path)
         assert os.path.isdir(os.path.dirname(output_path))
 
+    @staticmethod
+    def _template_with_image(path):
+        import struct
+        import zlib
+
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        pixels = b"".join(b"\x00" + bytes(range(48)) * 4 for _ in range(64))
+        png = (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 64, 64, 8, 2, 0, 0, 0))
+               + chunk(b"IDAT", zlib.compress(pixels)) + chunk(b"IEND", b""))
+
+        from io import BytesIO
+        doc = Document()
+        doc.add_paragraph("Paciente: {patient_name}")
+        doc.add_picture(BytesIO(png))
+        doc.sections[0].header.paragraphs[0].text = "{psico_nome}"
+        doc.save(str(path))
+        return str(path)
+
+    @staticmethod
+    def _raw_entries(source):
+        """Compressed bytes of every zip entry, as stored."""
+        import struct
+        import zipfile
+
+        with zipfile.ZipFile(source) as package:
+            entries = {}
+            for info in package.infolist():
+                package.fp.seek(info.header_offset + 26)
+                name_length, extra_length = struct.unpack("<2H", package.fp.read(4))
+                package.fp.seek(info.header_offset + 30 + name_length + extra_length)
+                entries[info.filename] = package.fp.read(info.compress_size)
+            return entries
+
+    def test_save_with_compiled_template_copies_untouched_entries(self, tmp_path):
+        """Only changed parts are rewritten; media is copied still compressed."""
+        import zipfile
+        from app.services.compiled_template import CompiledTemplate
+        from app.services.template_processor import TemplateProcessor
+
+        template_path = self._template_with_image(tmp_path / "template.docx")
+        compiled = CompiledTemplate(template_path)
+        document = compiled.fill({"patient_name": "Ana"})
+
+        output_path = str(tmp_path / "out" / "laudo.docx")
+        assert TemplateProcessor().save_document(document, output_path, compiled=compiled) == output_path
+
+        with zipfile.ZipFile(output_path) as package:
+            assert package.testzip() is None
+        template_entries = self._raw_entries(template_path)
+        output_entries = self._raw_entries(output_path)
+        assert set(output_entries) == set(template_entries)
+        changed = {name for name in template_entries if template_entries[name] != output_entries[name]}
+        assert changed == {"word/document.xml", "word/header1.xml"}
+
+        expected = compiled.fill({"patient_name": "Ana"})
+        saved = Document(output_path)
+        assert saved.paragraphs[0].text == expected.paragraphs[0].text == "Paciente: Ana"
+        assert saved.part.blob == expected.part.blob
+        assert len(saved.inline_shapes) == 1
+
+    def test_save_to_file_object_and_descriptor(self, tmp_path):
+        """Documents can be written to a BytesIO or an open file descriptor."""
+        from io import BytesIO
+        from app.services.compiled_template import CompiledTemplate
+        from app.services.template_processor import TemplateProcessor
+
+        compiled = CompiledTemplate(self._template_with_image(tmp_path / "template.docx"))
+        processor = TemplateProcessor()
+
+        for use_compiled in (compiled, None):
+            buffer = BytesIO()
+            processor.save_document(compiled.fill({"patient_name": "Ana"}), buffer, compiled=use_compiled)
+            assert Document(BytesIO(buffer.getvalue())).paragraphs[0].text == "Paciente: Ana"
+
+            output_path = tmp_path / "descriptor.docx"
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+            try:
+                processor.save_document(compiled.fill({"patient_name": "Bia"}), fd, compiled=use_compiled)
+            finally:
+                os.close(fd)
+            assert Document(str(output_path)).paragraphs[0].text == "Paciente: Bia"
+
 
 @pytest.mark.unit
 @pytest.mark.document_generation
@@ -190,6 +922,187 @@ class TestPDFConversion:
             pytest.skip(f"PDF conversion failed: {e}")
 
 
+@pytest.mark.unit
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestConverterPool:
+    """Test the LibreOffice converter pool with an in-process stand-in for ``soffice``."""
+    
+    def _pool_class(self, behaviour):
+        """Return a ConverterPool whose offices write a fake PDF or misbehave per ``behaviour``."""
+        from app.services.pdf_converter import ConverterPool, OfficeProcess
+        import threading
+        
+        started = []
+        
+        class FakeOffice(OfficeProcess):
+            def __init__(self, soffice=None, start_timeout=None):
+                self.running = False
+                self.killed = threading.Event()
+            
+            @property
+            def alive(self):
+                return self.running
+            
+            def start(self):
+                self.running = True
+                started.append(self)
+            
+            def convert(self, docx_path, pdf_path):
+                action = behaviour(docx_path)
+                if action == "crash":
+                    self.running = False
+                    raise RuntimeError("bridge disposed")
+                if action == "hang":
+                    self.killed.wait(5)
+                    raise RuntimeError("bridge disposed")
+                with open(pdf_path, "wb") as fp:
+                    fp.write(b"%PDF-1.4")
+            
+            def kill(self):
+                self.running = False
+                self.killed.set()
+            
+            def stop(self):
+                self.running = False
+        
+        class FakePool(ConverterPool):
+            office_class = FakeOffice
+        
+        return FakePool, started
+    
+    def test_jobs_are_queued_across_warm_offices(self, tmp_path):
+        """Test that every queued job is converted by the offices started with the pool."""
+        FakePool, started = self._pool_class(lambda path: "ok")
+        
+        with FakePool(size=2) as pool:
+            futures = [pool.submit(str(tmp_path / f"doc{i}.docx")) for i in range(6)]
+            results = [future.result(5) for future in futures]
+        
+        assert results == [str(tmp_path / f"doc{i}.pdf") for i in range(6)]
+        assert all(os.path.exists(path) for path in results)
+        assert len(started) == 2
+        assert pool.restarts == 0
+    
+    def test_crashed_office_is_restarted_and_job_retried(self, tmp_path):
+        """Test that a job whose office dies is retried once on a new office."""
+        from app.services.pdf_converter import PdfConversionError
+        
+        crashes = {"flaky.docx": 1, "broken.docx": 2}
+        
+        def behaviour(path):
+            name = os.path.basename(path)
+            if crashes.get(name, 0) > 0:
+                crashes[name] -= 1
+                return "crash"
+            return "ok"
+        
+        FakePool, started = self._pool_class(behaviour)
+        with FakePool(size=1) as pool:
+            assert pool.convert(str(tmp_path / "flaky.docx")) == str(tmp_path / "flaky.pdf")
+            with pytest.raises(PdfConversionError):
+                pool.convert(str(tmp_path / "broken.docx"))
+            assert pool.convert(str(tmp_path / "after.docx")) == str(tmp_path / "after.pdf")
+        
+        assert pool.restarts == 3
+    
+    def test_timeout_kills_office(self, tmp_path):
+        """Test that a hung conversion times out and the next job gets a new office."""
+        from app.services.pdf_converter import PdfConversionTimeout
+        
+        FakePool, started = self._pool_class(lambda path: "hang" if "hang" in path else "ok")
+        with FakePool(size=1, timeout=0.2) as pool:
+            with pytest.raises(PdfConversionTimeout):
+                pool.convert(str(tmp_path / "hang.docx"))
+            assert pool.convert(str(tmp_path / "next.docx")) == str(tmp_path / "next.pdf")
+        
+        assert len(started) == 2
+        assert started[0].killed.is_set()
+    
+    def test_closed_pool_rejects_jobs(self, tmp_path):
+        FakePool, _ = self._pool_class(lambda path: "ok")
+        pool = FakePool(size=1)
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.submit(str(tmp_path / "doc.docx"))
+    
+    def test_convert_to_pdf_selects_backend(self, tmp_path):
+        """Test that convert_to_pdf dispatches to the requested backend."""
+        from app.services import pdf_converter
+        from app.services.template_processor import TemplateProcessor
+        
+        docx_path = str(tmp_path / "laudo.docx")
+        processor = TemplateProcessor()
+        with patch.object(pdf_converter, 'convert_cold', return_value="cold.pdf") as cold:
+            assert processor.convert_to_pdf(docx_path, backend="libreoffice") == "cold.pdf"
+        cold.assert_called_once_with(docx_path, str(tmp_path / "laudo.pdf"))
+        
+        pool = MagicMock()
+        pool.convert.return_value = "pool.pdf"
+        with patch.object(pdf_converter, 'get_converter_pool', return_value=pool):
+            assert processor.convert_to_pdf(docx_path, "out.pdf", backend="libreoffice-pool") == "pool.pdf"
+        pool.convert.assert_called_once_with(docx_path, "out.pdf")
+        
+        with pytest.raises(ValueError):
+            processor.convert_to_pdf(docx_path, backend="word")
+    
+    def test_default_backend_without_uno(self, monkeypatch):
+        """On Linux the pool is only the default when LibreOffice's ``uno`` is importable."""
+        import sys
+        import types
+        from app.services import pdf_converter
+        
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setitem(sys.modules, "uno", None)
+        assert pdf_converter.default_backend() == pdf_converter.BACKEND_LIBREOFFICE
+        
+        monkeypatch.setitem(sys.modules, "uno", types.ModuleType("uno"))
+        assert pdf_converter.default_backend() == pdf_converter.BACKEND_LIBREOFFICE_POOL
+        
+        monkeypatch.setattr(sys, "platform", "win32")
+        assert pdf_converter.default_backend() == pdf_converter.BACKEND_DOCX2PDF
+    
+    def test_convert_to_pdf_falls_back_to_cold_without_uno(self, tmp_path, monkeypatch):
+        """Without ``uno`` the default conversion runs ``soffice`` per document instead of failing."""
+        import sys
+        
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setitem(sys.modules, "uno", None)
+        docx_path = str(tmp_path / "laudo.docx")
+        
+        with patch('app.services.pdf_converter.convert_cold', return_value=str(tmp_path / "laudo.pdf")) as cold:
+            assert TemplateProcessor().convert_to_pdf(docx_path) == str(tmp_path / "laudo.pdf")
+        
+        assert cold.call_args.args[0] == docx_path
+    
+    def test_missing_soffice(self, tmp_path):
+        from app.services.pdf_converter import PdfConversionError, convert_cold
+        
+        with patch('app.services.pdf_converter.shutil.which', return_value=None):
+            with pytest.raises(PdfConversionError):
+                convert_cold(str(tmp_path / "laudo.docx"))
+    
+    def test_benchmark_cli_does_not_import_pyside(self, tmp_path):
+        """The PDF benchmark entry point runs headless, without loading Qt."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys\n"
+            "from app.pdf_benchmark import main\n"
+            f"status = main([{str(tmp_path / 'laudo.docx')!r}, '-n', '1', '-j', '1', "
+            f"'--soffice', {str(tmp_path / 'soffice')!r}])\n"
+            "assert not any(name.startswith('PySide6') for name in sys.modules)\n"
+            "sys.exit(status)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=str(Path(__file__).parent.parent / "src"),
+                                capture_output=True, text=True)
+        
+        # no LibreOffice at that path: the error is reported, not raised
+        assert result.returncode == 1, result.stderr
+        assert result.stderr.startswith("Erro:")
+
+
 @pytest.mark.integration
 @pytest.mark.document_generation
 @pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
@@ -232,6 +1145,89 @@ class TestDocumentGenerationIntegration:
         assert "{patient_name}" not in text
 
 
+@pytest.mark.integration
+@pytest.mark.document_generation
+@pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
+class TestReportWorker:
+    """Test the worker that generates a laudo off the GUI thread."""
+    
+    def _record(self, worker):
+        events = []
+        worker.signals.stage_started.connect(lambda stage, number, total: events.append((stage, number, total)))
+        worker.signals.finished.connect(lambda result: events.append(("finished", result)))
+        worker.signals.failed.connect(lambda error: events.append(("failed", error)))
+        worker.signals.cancelled.connect(lambda: events.append(("cancelled",)))
+        return events
+    
+    def test_stages_are_reported_in_order(self, tmp_path, qapp, sample_template_path):
+        """Test that load, replace and save are reported before the result."""
+        from app.report_worker import ReportWorker
+        
+        docx_path = str(tmp_path / "laudo.docx")
+        worker = ReportWorker(sample_template_path, {"patient_name": "João"}, docx_path)
+        events = self._record(worker)
+        worker.run()
+        
+        assert events == [
+            ("load", 1, 3),
+            ("replace", 2, 3),
+            ("save", 3, 3),
+            ("finished", {"docx": docx_path, "pdf": None}),
+        ]
+        assert worker.wait(0)
+        assert Document(docx_path).paragraphs[0].text.startswith("Template with João and ")
+    
+    def test_pdf_stage(self, tmp_path, qapp, sample_template_path):
+        """Test that the PDF stage runs only when requested."""
+        from app.report_worker import ReportWorker
+        
+        docx_path = str(tmp_path / "laudo.docx")
+        worker = ReportWorker(sample_template_path, {"patient_name": "João"}, docx_path, pdf=True)
+        events = self._record(worker)
+        with patch.object(TemplateProcessor, 'convert_to_pdf', return_value=str(tmp_path / "laudo.pdf")):
+            worker.run()
+        
+        assert [event[0] for event in events] == ["load", "replace", "save", "pdf", "finished"]
+        assert events[-1][1]["pdf"] == str(tmp_path / "laudo.pdf")
+    
+    def test_cancel_between_stages(self, tmp_path, qapp, sample_template_path):
+        """Test that cancelling during a stage stops before the next one."""
+        from app.report_worker import ReportWorker
+        
+        docx_path = str(tmp_path / "laudo.docx")
+        worker = ReportWorker(sample_template_path, {"patient_name": "João"}, docx_path)
+        events = self._record(worker)
+        worker.signals.stage_started.connect(lambda stage, number, total: stage == "replace" and worker.cancel())
+        worker.run()
+        
+        assert events[-1] == ("cancelled",)
+        assert "save" not in [event[0] for event in events]
+        assert not os.path.exists(docx_path)
+    
+    def test_failure_is_reported(self, tmp_path, qapp):
+        """Test that an error in a stage is emitted as ``failed``."""
+        from app.report_worker import ReportWorker
+        
+        worker = ReportWorker(str(tmp_path / "missing.docx"), {}, str(tmp_path / "laudo.docx"))
+        events = self._record(worker)
+        worker.run()
+        
+        assert events[-1][0] == "failed"
+        assert worker.wait(0)
+    
+    def test_mapping_is_snapshotted(self, tmp_path, qapp, sample_template_path):
+        """Test that later edits to the mapping do not reach the worker."""
+        from app.report_worker import ReportWorker
+        
+        mapping = {"patient_name": "João"}
+        worker = ReportWorker(sample_template_path, mapping, str(tmp_path / "laudo.docx"))
+        mapping["patient_name"] = "Maria"
+        
+        assert worker.field_mapping["patient_name"] == "João"
+        with pytest.raises(TypeError):
+            worker.field_mapping["patient_name"] = "Maria"
+
+
 @pytest.mark.e2e
 @pytest.mark.document_generation
 @pytest.mark.skipif(not SERVICES_AVAILABLE, reason="Services module not available")
@@ -241,7 +1237,7 @@ class TestEndToEndDocumentGeneration:
     @patch('main.QFileDialog.getExistingDirectory')
     @patch('main.QMessageBox')
     def test_gerar_laudo_complete_flow(self, mock_messagebox, mock_filedialog, 
-                                        tmp_path, qapp):
+                                        tmp_path, qapp, qtbot):
         """Test the complete gerar_laudo flow."""
         from main import MainWindow
         from docx import Document
@@ -268,14 +1264,84 @@ class TestEndToEndDocumentGeneration:
             mock_processor = MagicMock()
             mock_processor_class.return_value = mock_processor
             mock_processor.extract_fields.return_value = {"patient_name"}
-            mock_processor.validate_fields.return_value = (["patient_name"], [])
-            mock_processor.check_required_fields.return_value = ([], [])
+            mock_processor.render_plan.return_value = MagicMock(invalid_fields=[], missing_fields=[], empty_fields=[])
             mock_processor.save_document.return_value = str(tmp_path / "output.docx")
             
-            # Call gerar_laudo
+            # Call gerar_laudo; the document is built on the report thread pool
             window.gerar_laudo()
+            qtbot.waitUntil(lambda: window._report_worker is None, timeout=5000)
             
             # Verify it was called
             assert mock_processor.replace_fields.called
             assert mock_processor.save_document.called
 
+    
+    @patch('main.QFileDialog.getExistingDirectory')
+    @patch('main.QMessageBox')
+    def test_gerar_laudo_uses_one_render_plan(self, mock_messagebox, mock_filedialog, tmp_path, qapp, qtbot):
+        """The plan behind the warnings is the one the worker applies."""
+        from PySide6.QtWidgets import QMessageBox
+        from main import MainWindow
+        
+        mock_filedialog.return_value = str(tmp_path)
+        mock_messagebox.StandardButton = QMessageBox.StandardButton
+        mock_messagebox.warning.return_value = QMessageBox.StandardButton.Yes
+        window = MainWindow()
+        
+        template_path = str(tmp_path / "template.docx")
+        template_doc = Document()
+        template_doc.add_paragraph("Paciente: {patient_name} / {123campo} / {patient_school}")
+        template_doc.save(template_path)
+        window.data_model.set_template(template_path, Document(template_path))
+        window.data_model.set_patient_data({"patient_name": "Lia"})
+        
+        with patch.object(TemplateProcessor, 'render_plan', autospec=True,
+                          side_effect=TemplateProcessor.render_plan) as render_plan:
+            window.gerar_laudo()
+            qtbot.waitUntil(lambda: window._report_worker is None, timeout=5000)
+        
+        assert render_plan.call_count == 1
+        titles = [call.args[1] for call in mock_messagebox.warning.call_args_list]
+        assert titles == ['Campos Inválidos Encontrados', 'Campos Incompletos']
+        assert "patient_school" in mock_messagebox.warning.call_args_list[1].args[2]
+        assert Document(str(tmp_path / "laudo_Lia.docx")).paragraphs[0].text == "Paciente: Lia /  / "
+    
+    @patch('main.QFileDialog.getExistingDirectory')
+    @patch('main.QMessageBox')
+    def test_close_during_generation_waits_for_worker(self, mock_messagebox, mock_filedialog,
+                                                      tmp_path, qapp, qtbot):
+        """Test that closing the window mid-stage does not block the GUI thread."""
+        import threading
+        from main import MainWindow
+        
+        mock_filedialog.return_value = str(tmp_path)
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.show()
+        
+        template_path = str(tmp_path / "template.docx")
+        template_doc = Document()
+        template_doc.add_paragraph("Patient: {patient_name}")
+        template_doc.save(template_path)
+        window.data_model.set_template(template_path, Document(template_path))
+        window.data_model.set_patient_data({"patient_name": "Test Patient"})
+        
+        saving, release = threading.Event(), threading.Event()
+        with patch('main.TemplateProcessor') as mock_processor_class:
+            mock_processor = mock_processor_class.return_value
+            mock_processor.render_plan.return_value = MagicMock(invalid_fields=[], missing_fields=[], empty_fields=[])
+            mock_processor.save_document.side_effect = lambda *args, **kwargs: (saving.set(), release.wait(10))
+            
+            window.gerar_laudo()
+            assert saving.wait(5)
+            
+            # the stage is still running: the window stays open, cancelling
+            window.close()
+            assert window.isVisible()
+            assert window._report_worker.is_cancelled()
+            
+            release.set()
+            qtbot.waitUntil(lambda: not window.isVisible(), timeout=5000)
+        
+        assert window._report_worker is None
+        assert not mock_messagebox.information.called
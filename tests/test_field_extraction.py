@@ -93,6 +93,46 @@ class TestFieldValidator:
         valid_fields2, invalid_fields2 = FieldValidator.validate_fields(invalid_format_fields)
         assert len(invalid_fields2) > 0
 
+    def test_category_follows_pattern_order(self):
+        """Test that the combined regex picks the first matching category."""
+        from app.services.field_validator import FieldValidator
+
+        for field in ["patient_name", "QIT_out", "AG_BPA", "TOTAL_ETADH", "CARS", "conclusao_x", "x_y", "Ab", "z"]:
+            expected = next((name for name, pattern in FieldValidator.PATTERNS.items() if pattern.match(field)),
+                            "format")
+            assert FieldValidator.get_field_category(field) == expected, field
+
+        # categories never accept characters outside [a-zA-Z0-9_]
+        assert FieldValidator.get_field_category("conclusao final!") is None
+        assert FieldValidator.validate_field_name("conclusao final!")[0] is False
+
+    def test_validate_fields_deduplicates(self):
+        """Test that repeated names are validated and reported once."""
+        from app.services.field_validator import FieldValidator
+
+        valid, invalid = FieldValidator.validate_fields(["QIT_out", "bad-name", "QIT_out", "bad-name", "ICV_out"])
+        assert valid == ["QIT_out", "ICV_out"]
+        assert [name for name, _ in invalid] == ["bad-name"]
+
+        valid, invalid = FieldValidator.validate_fields({"resp1_name", "QIT_out", "bad-name"})
+        assert valid == ["QIT_out", "resp1_name"]
+        assert [name for name, _ in invalid] == ["bad-name"]
+
+    def test_validate_field_name_memoized(self, monkeypatch):
+        """Test that each name is matched once."""
+        from app.services.field_validator import FieldValidator
+
+        monkeypatch.setattr(FieldValidator, "_results", {})
+        calls = []
+        original = FieldValidator.get_field_category.__func__
+        monkeypatch.setattr(FieldValidator, "get_field_category",
+                            classmethod(lambda cls, name: (calls.append(name), original(cls, name))[1]))
+
+        for _ in range(3):
+            FieldValidator.validate_fields(["QIT_out", "ICV_out"])
+
+        assert calls == ["QIT_out", "ICV_out"]
+
 
 @pytest.mark.unit
 @pytest.mark.field_extraction
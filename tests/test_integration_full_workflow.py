@@ -106,7 +106,7 @@ class TestCompleteWorkflow:
     @patch('main.QFileDialog.getExistingDirectory')
     @patch('main.QMessageBox')
     def test_document_generation_with_all_data(self, mock_messagebox, mock_filedialog,
-                                                tmp_path, qapp):
+                                                tmp_path, qapp, qtbot):
         """Test generating document with all data filled."""
         from main import MainWindow
         from app.services.template_processor import TemplateProcessor
@@ -133,8 +133,9 @@ class TestCompleteWorkflow:
         with patch.object(TemplateProcessor, 'convert_to_pdf') as mock_pdf:
             mock_pdf.return_value = str(tmp_path / "output.pdf")
             
-            # Generate document
+            # Generate document (runs on the report thread pool)
             window.gerar_laudo()
+            qtbot.waitUntil(lambda: window._report_worker is None, timeout=5000)
             
             # Verify file was created
             docx_files = list(tmp_path.glob("*.docx"))
@@ -192,3 +193,107 @@ class TestDataFlowBetweenScreens:
         window._coletar_dados_tela_atual()
         assert window.data_model.conclusion_text == "Conclusion"
 
+
+@pytest.mark.integration
+class TestLazyStartup:
+    """Test that MainWindow builds its screens on demand."""
+
+    def test_only_template_screen_built_at_startup(self, qapp):
+        from main import MainWindow
+
+        window = MainWindow()
+
+        assert list(window._telas) == ["tela_template"]
+        assert window.stacked_widget.count() == len(MainWindow.ORDEM_TELAS)
+        assert window.stacked_widget.currentWidget() is window.tela_template
+
+    def test_screen_built_in_its_slot_on_access(self, qapp):
+        from main import MainWindow
+
+        window = MainWindow()
+        window.stacked_widget.setCurrentIndex(1)
+
+        tests_screen = window.tela_testes
+
+        assert window.stacked_widget.indexOf(tests_screen) == MainWindow.ORDEM_TELAS.index("tela_testes")
+        assert window.stacked_widget.currentWidget() is window.tela_paciente
+        assert window.tela_testes is tests_screen
+
+    def test_navigation_builds_next_screen(self, qapp):
+        from main import MainWindow
+
+        window = MainWindow()
+        window.tela_template._template_carregado = True
+
+        window.tela_template.ui.btn_avancar.click()
+
+        assert window.stacked_widget.currentIndex() == 1
+        assert window.stacked_widget.currentWidget() is window._telas["tela_paciente"]
+
+    def test_back_from_conclusions_goes_to_tests(self, qapp):
+        from main import MainWindow
+
+        window = MainWindow()
+        window.stacked_widget.setCurrentIndex(MainWindow.ORDEM_TELAS.index("tela_conclusoes_section"))
+
+        window.tela_conclusoes_section.ui.btn_voltar.click()
+
+        assert window.stacked_widget.currentWidget() is window.tela_testes
+
+    def test_forward_from_conclusions_keeps_free_conclusion(self, qapp):
+        from main import MainWindow
+
+        window = MainWindow()
+        window.stacked_widget.setCurrentIndex(MainWindow.ORDEM_TELAS.index("tela_conclusoes_section"))
+        window.tela_conclusoes_section.set_data({"CONCLUSAO_ANALISE_LIVRE": "Sem alterações significativas."})
+
+        window.tela_conclusoes_section.ui.btn_avancar.click()
+
+        assert window.stacked_widget.currentWidget() is window.tela_revisao
+        assert window.data_model.conclusion_text == "Sem alterações significativas."
+
+    def test_remaining_screens_built_when_idle(self, qapp, qtbot):
+        from main import MainWindow
+
+        window = MainWindow()
+        qtbot.addWidget(window)
+        window.show()
+        qtbot.waitUntil(lambda: len(window._telas) == len(MainWindow.ORDEM_TELAS), timeout=5000)
+
+        assert not window._construcao_ociosa.isActive()
+        assert [window.stacked_widget.indexOf(getattr(window, nome)) for nome in MainWindow.ORDEM_TELAS] == \
+            list(range(len(MainWindow.ORDEM_TELAS)))
+
+    def test_idle_building_waits_for_first_paint(self, qapp, qtbot):
+        from main import MainWindow
+        from app.services import startup_profile
+
+        profile = startup_profile.start()
+        try:
+            window = MainWindow()
+            qtbot.addWidget(window)
+            qtbot.wait(50)
+            assert list(window._telas) == ["tela_template"]
+
+            window.show()
+            qtbot.waitUntil(lambda: "screens_built" in profile.marks, timeout=5000)
+        finally:
+            report = startup_profile.finish()
+
+        first_paint = report["marks"]["first_paint"]
+        assert all(first_paint <= screen["start_s"] for screen in report["screens"] if screen["name"] != "tela_template")
+
+    def test_import_does_not_load_generation_modules(self):
+        import subprocess
+
+        src = Path(__file__).parent.parent / "src"
+        code = (
+            "import sys, main\n"
+            "heavy = [m for m in ('docx', 'lxml', 'app.views.tests', 'app.report_worker') if m in sys.modules]\n"
+            "print(','.join(heavy))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=src, capture_output=True, text=True,
+                                env={**os.environ, "QT_QPA_PLATFORM": "offscreen"}, timeout=60)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == ""
@@ -0,0 +1,154 @@
+"""Tests for the ``--profile-startup`` report (app.services.startup_profile)."""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services import startup_profile, test_tables_loader
+from app.services.test_tables_loader import TestTablesLoader as TablesLoader
+
+
+@pytest.fixture(autouse=True)
+def no_active_profile():
+    startup_profile.finish()
+    yield
+    startup_profile.finish()
+
+
+@pytest.mark.unit
+def test_imports_are_timed_and_grouped_by_package(tmp_path, monkeypatch):
+    package = tmp_path / "perfil_demo"
+    package.mkdir()
+    (package / "__init__.py").write_text("from . import lento\n", encoding="utf-8")
+    (package / "lento.py").write_text("import time\ntime.sleep(0.02)\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    startup_profile.start()
+    import perfil_demo  # noqa: F401
+    report = startup_profile.finish()
+
+    for name in ("perfil_demo", "perfil_demo.lento"):
+        monkeypatch.delitem(sys.modules, name)
+    assert startup_profile.active() is None
+    assert not any(isinstance(finder, startup_profile._ImportTimer) for finder in sys.meta_path)
+
+    modules = {entry["module"]: entry for entry in report["imports"]["slowest_modules"]}
+    assert modules["perfil_demo.lento"]["self_s"] >= 0.015
+    # the package's own time excludes its submodule, its cumulative time does not
+    assert modules["perfil_demo"]["self_s"] < 0.015 <= modules["perfil_demo"]["cumulative_s"]
+    packages = {entry["package"]: entry for entry in report["imports"]["packages"]}
+    assert packages["perfil_demo"]["modules"] == 2
+
+
+@pytest.mark.unit
+def test_package_of():
+    assert startup_profile.package_of("PySide6.QtWidgets") == "PySide6"
+    assert startup_profile.package_of("app.services.jsonc") == "app.services"
+    assert startup_profile.package_of("app.services") == "app"
+    assert startup_profile.package_of("json") == "json"
+
+
+@pytest.mark.unit
+def test_spans_and_marks_only_recorded_while_profiling(tmp_path):
+    with startup_profile.span("screen", "tela_x") as details:
+        details["ignorado"] = True
+    startup_profile.mark("first_paint")
+
+    startup_profile.start()
+    with startup_profile.span("screen", "tela_y"):
+        pass
+    startup_profile.mark("first_paint")
+    startup_profile.mark("first_paint")
+    TablesLoader(Path(__file__).parent.parent / "src" / "data", cache_dir=tmp_path / "cache").load_all()
+    report = startup_profile.finish()
+
+    assert [entry["name"] for entry in report["screens"]] == ["tela_y"]
+    assert list(report["marks"]) == ["first_paint"]
+    loaders = {entry["name"]: entry for entry in report["loaders"]}
+    assert loaders["TestTablesLoader"]["source"] in ("memory", "snapshot", "parsed")
+    json.dumps(report)
+
+
+@pytest.mark.unit
+def test_loader_source_reported(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "demo_table.jsonc").write_text('{"classificacoes": []}', encoding="utf-8")
+    test_tables_loader._memory_cache.clear()
+    try:
+        startup_profile.start()
+        for _ in range(2):
+            TablesLoader(data_dir, cache_dir=tmp_path / "cache").load_all()
+        test_tables_loader._memory_cache.clear()
+        TablesLoader(data_dir, cache_dir=tmp_path / "cache").load_all()
+        report = startup_profile.finish()
+    finally:
+        test_tables_loader._memory_cache.clear()
+
+    assert [entry["source"] for entry in report["loaders"]] == ["parsed", "memory", "snapshot"]
+
+
+@pytest.mark.unit
+def test_split_argv():
+    assert startup_profile.split_argv(["main.py", "-style", "fusion"]) == (None, ["main.py", "-style", "fusion"])
+    assert startup_profile.split_argv(["main.py", "--profile-startup"]) == ("", ["main.py"])
+    assert startup_profile.split_argv(["main.py", "--profile-startup=perfil.json", "-x"]) == \
+        ("perfil.json", ["main.py", "-x"])
+
+
+@pytest.mark.unit
+def test_write_report(tmp_path):
+    startup_profile.start()
+    with startup_profile.span("loader", "Demo") as details:
+        details["source"] = "parsed"
+    report = startup_profile.finish()
+
+    path = startup_profile.write_report(report, str(tmp_path / "perfil" / "startup.json"))
+
+    assert json.loads(path.read_text(encoding="utf-8"))["loaders"][0]["source"] == "parsed"
+    text = path.with_suffix(".txt").read_text(encoding="utf-8")
+    for heading in ("Importações", "Módulos mais lentos", "Telas", "Carregadores", "Primeira pintura"):
+        assert heading in text
+    assert "Demo" in text and "source=parsed" in text
+
+
+@pytest.mark.unit
+def test_does_not_import_pyside(tmp_path):
+    # main.py imports this module, and starts profiling, before PySide6
+    code = (
+        "import sys\n"
+        "from app.services import startup_profile\n"
+        "startup_profile.start()\n"
+        f"startup_profile.write_report(startup_profile.finish(), {str(tmp_path / 'startup.json')!r})\n"
+        "assert not any(name.startswith('PySide6') for name in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent / "src",
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "startup.txt").exists()
+
+
+@pytest.mark.e2e
+def test_main_writes_profile(tmp_path):
+    src = Path(__file__).parent.parent / "src"
+    target = tmp_path / "startup.json"
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen", "PSYR_CACHE_DIR": str(tmp_path / "cache")}
+    process = subprocess.Popen([sys.executable, "main.py", f"--profile-startup={target}"], cwd=src, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 60
+        while not target.with_suffix(".txt").exists() and process.poll() is None and time.monotonic() < deadline:
+            time.sleep(0.1)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    report = json.loads(target.read_text(encoding="utf-8"))
+    assert {"first_paint", "screens_built"} <= set(report["marks"])
+    assert "tela_template" in [entry["name"] for entry in report["screens"]]
+    assert any(entry["package"] == "PySide6" for entry in report["imports"]["packages"])
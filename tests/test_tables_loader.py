@@ -0,0 +1,172 @@
+"""Tests for TestTablesLoader, its on-disk snapshot cache and the shared DataRegistry."""
+import os
+
+import pytest
+
+from app.services import test_tables_loader
+from app.services.test_tables_loader import TestTablesLoader as TablesLoader
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    directory = tmp_path / "data"
+    directory.mkdir()
+    (directory / "demo_table.jsonc").write_text(
+        '{\n  // comentário\n  "classificacoes": [{"faixa_min": 0, "faixa_max": 10, "texto": "Baixo"}]\n}\n',
+        encoding="utf-8",
+    )
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    test_tables_loader._memory_cache.clear()
+    yield
+    test_tables_loader._memory_cache.clear()
+
+
+@pytest.mark.unit
+def test_bundled_tables_load():
+    tables = TablesLoader().load_all()
+    assert {"wisc", "bpa", "ravlt"} <= set(tables)
+
+
+@pytest.mark.unit
+def test_loaders_share_tables_in_process(data_dir, tmp_path):
+    first = TablesLoader(data_dir, cache_dir=tmp_path / "cache").load_all()
+    second = TablesLoader(data_dir, cache_dir=tmp_path / "cache").load_all()
+
+    assert second is first
+    assert first["demo"]["classificacoes"][0]["texto"] == "Baixo"
+
+
+@pytest.mark.unit
+def test_shared_tables_are_read_only(data_dir, tmp_path):
+    tables = TablesLoader(data_dir, cache_dir=tmp_path / "cache").load_all()
+
+    with pytest.raises(TypeError):
+        tables["demo"] = {}
+    with pytest.raises(TypeError):
+        tables["demo"]["classificacoes"].append({})
+
+    fresh = TablesLoader(data_dir, cache_dir=tmp_path / "cache").load_all()
+    assert fresh["demo"]["classificacoes"] == [{"faixa_min": 0, "faixa_max": 10, "texto": "Baixo"}]
+
+
+@pytest.mark.unit
+def test_snapshot_reused_until_a_table_changes(data_dir, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    TablesLoader(data_dir, cache_dir=cache_dir).load_all()
+    assert TablesLoader(data_dir, cache_dir=cache_dir).snapshot_path().exists()
+
+    # a new process: nothing in memory, the snapshot is enough
+    test_tables_loader._memory_cache.clear()
+    def fail(text, source=None):
+        raise AssertionError("tables should come from the snapshot")
+    monkeypatch.setattr(TablesLoader, "_parse_jsonc", staticmethod(fail))
+    assert TablesLoader(data_dir, cache_dir=cache_dir).load_all()["demo"]["classificacoes"]
+    monkeypatch.undo()
+
+    table = data_dir / "demo_table.jsonc"
+    table.write_text(table.read_text(encoding="utf-8").replace("Baixo", "Inferior"), encoding="utf-8")
+    os.utime(table, ns=(table.stat().st_atime_ns, table.stat().st_mtime_ns + 1_000_000))
+    test_tables_loader._memory_cache.clear()
+
+    tables = TablesLoader(data_dir, cache_dir=cache_dir).load_all()
+    assert tables["demo"]["classificacoes"][0]["texto"] == "Inferior"
+
+
+@pytest.mark.unit
+def test_snapshot_shared_across_data_dir_copies(data_dir, tmp_path, monkeypatch):
+    # a --onefile build unpacks the same tables to a new directory on every start
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "tables-0123456789abcdef.cpython-311.marshal").write_bytes(b"old")
+    TablesLoader(data_dir, cache_dir=cache_dir).load_all()
+
+    copy = tmp_path / "_MEI12345" / "data"
+    copy.mkdir(parents=True)
+    (copy / "demo_table.jsonc").write_bytes((data_dir / "demo_table.jsonc").read_bytes())
+    def fail(text, source=None):
+        raise AssertionError("tables should come from the snapshot")
+    monkeypatch.setattr(TablesLoader, "_parse_jsonc", staticmethod(fail))
+    assert TablesLoader(copy, cache_dir=cache_dir).load_all()["demo"]["classificacoes"]
+
+    snapshot = TablesLoader(copy, cache_dir=cache_dir).snapshot_path()
+    assert list(cache_dir.iterdir()) == [snapshot]
+
+
+@pytest.mark.unit
+def test_jsonc_keeps_slashes_in_strings_and_drops_comments():
+    from app.services import jsonc
+
+    text = (
+        '{\n'
+        '  "fonte": "https://exemplo.org//normas", // comentário\n'
+        '  /* bloco\n     com ] e } */\n'
+        '  "faixas": [1, 2, /* fim */],\n'
+        '}\n'
+    )
+
+    assert jsonc.loads(text) == {"fonte": "https://exemplo.org//normas", "faixas": [1, 2]}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text, line, column", [
+    ('{\n  "a": 1\n  "b": 2\n}', 3, 3),
+    ('{\n  /* sem fim\n}', 2, 3),
+])
+def test_jsonc_errors_report_line_and_column(text, line, column):
+    from app.services import jsonc
+
+    with pytest.raises(jsonc.JSONCError) as excinfo:
+        jsonc.loads(text, "demo_table.jsonc")
+
+    assert (excinfo.value.line, excinfo.value.column) == (line, column)
+    assert str(excinfo.value).startswith(f"demo_table.jsonc:{line}:{column}: ")
+
+
+@pytest.mark.unit
+def test_broken_table_is_reported_not_cached(data_dir, tmp_path):
+    (data_dir / "quebrada_table.jsonc").write_text('{"teste": "X",\n "faixas": [1 2]}', encoding="utf-8")
+    loader = TablesLoader(data_dir, cache_dir=tmp_path / "cache")
+
+    with pytest.warns(UserWarning, match=r"quebrada_table.jsonc:2:15"):
+        tables = loader.load_all()
+
+    assert set(tables) == {"demo"}
+    assert len(loader.errors) == 1
+    assert not loader.snapshot_path().exists()
+
+
+@pytest.mark.unit
+def test_registry_shares_read_only_data():
+    from app.models import LaudoDataModel
+    from app.services.data_registry import DataRegistry
+
+    registry = DataRegistry()
+    loader = registry.template_fields_loader()
+
+    assert registry.template_fields_loader() is loader
+    with pytest.raises(TypeError):
+        loader.load_config()["sections"].append({})
+    with pytest.raises(TypeError):
+        registry.tables_loader().load_all()["wisc"]["teste"] = "x"
+    assert LaudoDataModel()._test_classifier is LaudoDataModel()._test_classifier
+
+
+@pytest.mark.unit
+def test_registry_reload_notifies_listeners(data_dir):
+    from app.services.data_registry import DataRegistry
+
+    registry = DataRegistry()
+    events = []
+    registry.add_listener(events.append)
+    first = registry.tables_loader(data_dir)
+
+    registry.reload("test_tables")
+
+    assert registry.tables_loader(data_dir) is not first
+    assert events == ["test_tables"]
+    with pytest.raises(ValueError):
+        registry.invalidate("desconhecido")